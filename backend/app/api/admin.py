@@ -6,6 +6,9 @@ from typing import List
 
 from ..schemas.admin import AdminStatsResponse, AdminUserResponse
 from ..core.config import settings
+from ..services.eta_estimator import eta_estimator
+from ..services.job_scheduler import job_scheduler
+from ..services.result_cache import result_cache
 
 router = APIRouter()
 
@@ -34,6 +37,41 @@ async def get_admin_stats(admin_id: str = Depends(require_admin)):
     )
 
 
+@router.get("/result-cache")
+async def get_result_cache_stats(admin_id: str = Depends(require_admin)):
+    """
+    書き起こし結果キャッシュの統計を取得
+
+    - ヒット数・ミス数・ヒット率
+    - エントリ数・合計サイズ・削除数
+    - キャッシュにより省略した音声長・処理時間
+    """
+    return result_cache.stats()
+
+
+@router.get("/job-scheduler")
+async def get_job_scheduler_stats(admin_id: str = Depends(require_admin)):
+    """
+    書き起こしジョブスケジューラの統計を取得
+
+    - 待ち・実行中のジョブ数、最も長く待っているジョブの待ち時間
+    - プラン別・音声長の区分別の待ち時間（件数・平均・最大）
+    """
+    return job_scheduler.stats()
+
+
+@router.get("/eta")
+async def get_eta_stats(admin_id: str = Depends(require_admin)):
+    """
+    待ち時間・完了時刻の予測の状況を取得
+
+    - ワーカーごとの処理速度（処理時間 / 音声長）と学習に使ったジョブ数
+    - 実行中・待ちジョブの開始・完了の予測時刻
+    - 投入時の予測と実際の時刻の誤差（平均絶対誤差・平均誤差・直近の比較）
+    """
+    return eta_estimator.stats()
+
+
 @router.get("/users", response_model=List[AdminUserResponse])
 async def get_all_users(
     page: int = Query(1, ge=1),
@@ -1,10 +1,16 @@
 """
 書き起こし API エンドポイント
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query
-from fastapi.responses import FileResponse, Response
-from typing import Annotated, Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import Annotated, AsyncIterator, List, Optional
+from datetime import datetime
+import json
 import os
+import shutil
+import tempfile
+import uuid
 
 from ..schemas.transcription import (
     TranscriptionCreateRequest,
@@ -13,6 +19,13 @@ from ..schemas.transcription import (
     DownloadFormat
 )
 from ..core.config import settings
+from ..models.transcription import TranscriptionStatus
+from ..models.user import PlanType
+from ..services.eta_estimator import eta_estimator
+from ..services.output_formatter import output_formatter
+from ..services.progress_stream import progress_stream
+from ..services.result_cache import result_cache
+from ..services.result_store import transcription_result_store
 
 router = APIRouter()
 
@@ -23,17 +36,12 @@ async def get_current_user_id() -> str:
     return "user_123"
 
 
-@router.post("/", response_model=TranscriptionResponse)
-async def create_transcription(
-    audio_file: UploadFile = File(...),
-    session_log: Optional[str] = Form(None),
-    user_id: str = Depends(get_current_user_id)
-):
+def _validate_audio_file(audio_file: UploadFile) -> int:
     """
-    新規書き起こしジョブを作成
+    アップロードされた音声ファイルの形式とサイズを検証
 
-    音声ファイルをアップロードし、書き起こしジョブをキューに追加します。
-    処理は非同期で実行され、ステータスは別途確認できます。
+    Returns:
+        ファイルサイズ（バイト）
     """
     # ファイル形式チェック
     file_ext = audio_file.filename.split('.')[-1].lower()
@@ -54,8 +62,32 @@ async def create_transcription(
             detail=f"File size exceeds maximum allowed size ({settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB)"
         )
 
+    return file_size
+
+
+def _save_upload(audio_file: UploadFile, path: str) -> None:
+    """アップロードされたファイルをメモリに読み込まずにディスクへ書き出す"""
+    audio_file.file.seek(0)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(audio_file.file, f)
+
+
+@router.post("/", response_model=TranscriptionResponse)
+async def create_transcription(
+    audio_file: UploadFile = File(...),
+    session_log: Optional[str] = Form(None),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    新規書き起こしジョブを作成
+
+    音声ファイルをアップロードし、書き起こしジョブをキューに追加します。
+    処理は非同期で実行され、ステータスは別途確認できます。
+    """
+    _validate_audio_file(audio_file)
+
     # TODO: ユーザーのプラン制限チェック
-    # TODO: Celery タスクをキューに追加
+    # TODO: dispatch_transcription で投入（プランと音声長を渡し、ジョブスケジューラの優先順で処理する）
     # TODO: Transcription レコード作成
 
     raise HTTPException(
@@ -64,6 +96,136 @@ async def create_transcription(
     )
 
 
+@router.post("/multitrack", response_model=TranscriptionResponse)
+async def create_multitrack_transcription(
+    audio_files: List[UploadFile] = File(...),
+    speakers: Optional[List[str]] = Form(None),
+    session_log: Optional[str] = Form(None),
+    plan: PlanType = Form(PlanType.FREE),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    話者別トラック（Craig / Discord 録音など）から書き起こしジョブを作成
+
+    1セッション分の N 本のトラックをアップロードします。トラックごとに無音区間を除去して
+    並列に書き起こし、開始時刻順に統合した結果の各セグメントに話者ラベルが付きます。
+    話者ラベルを省略した場合はファイル名（拡張子なし）を使います。
+    ジョブはプランと最長トラックの音声長に応じた優先順で処理されます。
+    進捗は /{transcription_id}/events、結果は /{transcription_id}/download で取得できます。
+    """
+    if len(audio_files) > settings.MULTITRACK_MAX_TRACKS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many tracks. Maximum: {settings.MULTITRACK_MAX_TRACKS}"
+        )
+    if speakers and len(speakers) != len(audio_files):
+        raise HTTPException(
+            status_code=400,
+            detail="Number of speakers must match number of audio files"
+        )
+
+    total_size = sum(_validate_audio_file(audio_file) for audio_file in audio_files)
+    if total_size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Total file size exceeds maximum allowed size ({settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB)"
+        )
+
+    from ..tasks.transcription_tasks import dispatch_multitrack_transcription
+
+    speaker_labels = speakers or [
+        os.path.splitext(os.path.basename(audio_file.filename))[0]
+        for audio_file in audio_files
+    ]
+
+    # TODO: ユーザーのプラン制限チェック（全トラック中で最長の音声長で計上）
+    # TODO: プランはフォームではなくユーザー情報から取得
+
+    # トラックを RAM ディスクへ保存して投入
+    transcription_id = str(uuid.uuid4())
+    os.makedirs(settings.RAMDISK_PATH, exist_ok=True)
+    tracks = []
+    for index, (audio_file, speaker) in enumerate(zip(audio_files, speaker_labels)):
+        path = os.path.join(
+            settings.RAMDISK_PATH,
+            f"{transcription_id}-track{index}{os.path.splitext(audio_file.filename)[1]}"
+        )
+        await run_in_threadpool(_save_upload, audio_file, path)
+        tracks.append({"path": path, "speaker": speaker})
+    # 投入前に各トラックの音声長を ffprobe で調べるため、イベントループを止めないようスレッドで実行
+    await run_in_threadpool(
+        dispatch_multitrack_transcription,
+        transcription_id,
+        tracks,
+        session_log=session_log,
+        plan=plan
+    )
+
+    # TODO: Transcription レコード作成（speakers に speaker_labels を保存）
+    return TranscriptionResponse(
+        id=transcription_id,
+        status=TranscriptionStatus.PENDING,
+        audio_filename=", ".join(audio_file.filename for audio_file in audio_files),
+        audio_size=total_size,
+        speakers=speaker_labels,
+        session_log=session_log,
+        created_at=datetime.utcnow()
+    )
+
+
+@router.post("/estimate")
+async def estimate_transcription(
+    audio_file: Optional[UploadFile] = File(None),
+    audio_duration: Optional[float] = Form(None, gt=0),
+    plan: PlanType = Form(PlanType.FREE),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    投入前に待ち時間と完了時刻を見積もる
+
+    音声ファイルまたは音声長（秒）を指定します。今投入した場合の待ち順位と開始・完了の予測時刻を返します。
+    予測にはワーカーごとに学習した処理速度（処理時間 / 音声長）と現在の待ちジョブを使います。
+    """
+    # TODO: ユーザーのプランを使う
+    if audio_duration is None:
+        if audio_file is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Either audio_file or audio_duration is required"
+            )
+        audio_duration = await run_in_threadpool(_probe_upload_duration, audio_file)
+
+    estimate = eta_estimator.estimate_new(audio_duration, plan.value)
+    return estimate.to_dict()
+
+
+def _probe_upload_duration(audio_file: UploadFile) -> float:
+    """
+    アップロードされた音声ファイルを RAM ディスクへ一時保存し、音声長（秒）を取得
+
+    ファイルの書き出しと ffprobe はブロックするため、スレッドプールで実行する。
+    """
+    from ..services.audio_decoder import ffmpeg_decoder
+
+    _validate_audio_file(audio_file)
+    os.makedirs(settings.RAMDISK_PATH, exist_ok=True)
+    suffix = os.path.splitext(audio_file.filename)[1]
+    with tempfile.NamedTemporaryFile(dir=settings.RAMDISK_PATH, suffix=suffix, delete=False) as f:
+        path = f.name
+    try:
+        _save_upload(audio_file, path)
+        duration = ffmpeg_decoder.probe_duration(path)
+    finally:
+        os.remove(path)
+
+    if not duration:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not determine audio duration"
+        )
+    return duration
+
+
 @router.get("/", response_model=TranscriptionListResponse)
 async def list_transcriptions(
     page: int = Query(1, ge=1),
@@ -96,6 +258,88 @@ async def get_transcription(
     )
 
 
+@router.get("/{transcription_id}/eta")
+async def get_transcription_eta(
+    transcription_id: str,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    書き起こしジョブの待ち順位と開始・完了の予測時刻を取得
+
+    ジョブスケジューラで待っている・実行中のジョブが対象です。完了・失敗したジョブは 404 を返します。
+    """
+    # TODO: ユーザー権限チェック
+    estimate = eta_estimator.estimate_job(transcription_id)
+    if estimate is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Transcription is not queued or running"
+        )
+    return estimate.to_dict()
+
+
+@router.get("/{transcription_id}/events")
+async def stream_transcription_events(
+    transcription_id: str,
+    last_event_id: Optional[str] = Header(None),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    書き起こしの進捗を Server-Sent Events で配信
+
+    ワーカーが進捗ストリームに追記したイベントを順に中継します。
+    完了（completed）・失敗（failed）・期限切れ（expired）・タイムアウト（timeout）イベントを
+    送った時点で接続を閉じます。
+
+    イベント種別：
+    - stage: 処理段階の変化（status, progress）。queued の場合は待ち順位と予測時刻
+      （queue_position, estimated_start_at, estimated_finish_at）も含む
+    - draft: 小さいモデルによる下書きのセグメント（DRAFT_TRANSCRIPT_ENABLED の場合、形式は segments と同じ）
+    - segments: 新たに書き起こされたセグメント（progress, position, duration, segments）。
+      position までの draft セグメントはこの結果で置き換える
+    - refined: 再デコードで差し替えたセグメント（spans: start〜end の表示を segments で置き換える）
+    - completed / failed: 処理の終了
+    - expired: 進捗ストリームが保存期間を過ぎて削除された
+    - timeout: PROGRESS_STREAM_IDLE_TIMEOUT の間新しいイベントがなかった（Last-Event-ID を付けて再接続できる）
+
+    進捗ストリームが削除済みで結果だけが残っている場合は completed だけを送ります。
+    どちらもない場合（未投入・期限切れ）は 404 を返します。
+
+    再接続時は Last-Event-ID ヘッダーで受信済みの位置から再開できます。
+    """
+    # TODO: ユーザー権限チェック
+    if not progress_stream.exists(transcription_id):
+        if not transcription_result_store.exists(transcription_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Transcription progress not found or expired"
+            )
+
+        async def completed_source() -> AsyncIterator[str]:
+            yield f"event: completed\ndata: {json.dumps({'progress': 100})}\n\n"
+
+        return StreamingResponse(
+            completed_source(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def event_source() -> AsyncIterator[str]:
+        async for entry in progress_stream.tail(transcription_id, last_id=last_event_id or "0"):
+            if entry is None:
+                # 接続維持のためのコメント行
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(entry["data"], ensure_ascii=False)
+            yield f"id: {entry['id']}\nevent: {entry['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{transcription_id}/download")
 async def download_transcription(
     transcription_id: str,
@@ -109,11 +353,32 @@ async def download_transcription(
     - txt: プレーンテキスト
     - json: JSON形式（タイムスタンプ付き）
     - html: HTML形式（読みやすい整形済み）
+
+    保存期間（TRANSCRIPTION_RESULT_TTL）を過ぎた結果は 404 を返します。
     """
-    # TODO: ダウンロード機能実装
-    raise HTTPException(
-        status_code=501,
-        detail="Download transcription is not yet implemented"
+    # TODO: ユーザー権限チェック
+    stored = transcription_result_store.get(transcription_id)
+    if stored is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Transcription result not found or expired"
+        )
+
+    created_at = datetime.fromisoformat(stored.created_at) if stored.created_at else None
+    if format == DownloadFormat.JSON:
+        content = output_formatter.generate_json(stored.segments, stored.session_log, created_at=created_at)
+        media_type = "application/json"
+    elif format == DownloadFormat.HTML:
+        content = output_formatter.generate_html(stored.segments, stored.session_log, created_at=created_at)
+        media_type = "text/html; charset=utf-8"
+    else:
+        content = output_formatter.generate_txt(stored.segments, stored.session_log)
+        media_type = "text/plain; charset=utf-8"
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{transcription_id}.{format.value}"'}
     )
 
 
@@ -124,9 +389,11 @@ async def delete_transcription(
 ):
     """
     書き起こしジョブを削除
+
+    保存済みの結果と、結果キャッシュの対応するエントリ（ユーザーをまたいで共有されるため）を削除します。
     """
-    # TODO: 削除機能実装
-    raise HTTPException(
-        status_code=501,
-        detail="Delete transcription is not yet implemented"
-    )
+    # TODO: ユーザー権限チェック
+    # TODO: Transcription レコード削除
+    result_cache.purge(transcription_id)
+    transcription_result_store.delete(transcription_id)
+    return {"transcription_id": transcription_id, "deleted": True}
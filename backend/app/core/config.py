@@ -3,7 +3,7 @@
 環境変数から設定を読み込み、型安全なアクセスを提供
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -37,6 +37,23 @@ class Settings(BaseSettings):
     # Redis設定
     REDIS_URL: str = "redis://redis:6379/0"
 
+    # 書き起こし進捗ストリーム（Redis Stream + Server-Sent Events）
+    PROGRESS_STREAM_MIN_INTERVAL: float = 2.0  # セグメント通知の最短間隔（秒）
+    PROGRESS_STREAM_MAXLEN: int = 10000  # ストリームに残す最大エントリ数（概算）
+    PROGRESS_STREAM_TTL: int = 60 * 60 * 24  # 最後の追記からストリームを削除するまでの秒数
+    PROGRESS_STREAM_BLOCK_MS: int = 15000  # 新着待ちの最大時間（超えたらハートビートを送る）
+    PROGRESS_STREAM_IDLE_TIMEOUT: int = 60 * 60  # 新しいイベントがないまま接続を閉じるまでの秒数
+
+    # 書き起こし結果キャッシュ（同じ音声・同じデコード設定の再アップロードは書き起こし直さない）
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_TTL: int = 60 * 60 * 8  # 保存期間（秒、書き起こしデータの保持期間に合わせる）
+    RESULT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 合計サイズの上限（超えたら古い順に削除）
+    RESULT_CACHE_VERSION: int = 1  # キーに含める版数（設定以外で結果が変わる変更をしたら上げる）
+
+    # 書き起こし結果の保存先（Celery の結果バックエンドには参照だけを返す）
+    TRANSCRIPTION_RESULT_TTL: int = 60 * 60 * 8  # 保存期間（秒、Celery のタスク結果の保存期間も同じにする）
+    TRANSCRIPTION_RESULT_COMPRESSION_LEVEL: int = 3  # zlib の圧縮レベル（1〜9、高いほど小さく遅い）
+
     # RunPod設定
     RUNPOD_API_KEY: str = ""
 
@@ -55,10 +72,130 @@ class Settings(BaseSettings):
     WHISPER_VAD_FILTER: bool = True
     WHISPER_CONDITION_ON_PREVIOUS_TEXT: bool = True
 
+    # 下書き書き起こし（小さいモデルの結果を先に配信し、本番モデルの結果で順に置き換える）
+    DRAFT_TRANSCRIPT_ENABLED: bool = False
+    DRAFT_WHISPER_MODEL: str = "small"
+    DRAFT_WHISPER_DEVICE: str = "cuda"
+    DRAFT_WHISPER_COMPUTE_TYPE: str = "int8_float16"
+    DRAFT_SHARED_DEVICE_SECONDS: float = 120.0  # 本番モデルと同じ GPU の場合に本番の前に下書きする先頭の長さ（秒）
+
+    # 長時間音声のバッチ推論（VAD 区間をチャンクにまとめて同時にデコード）
+    WHISPER_BATCHED_ENABLED: bool = False  # 逐次デコードと結果が変わるため明示的に有効化した場合のみ使う
+    WHISPER_BATCH_SIZE: int = 8
+    WHISPER_BATCH_MIN_DURATION: float = 300.0  # これ以上の長さの音声でバッチ推論を使う（秒）
+    WHISPER_BATCH_CHUNK_SECONDS: float = 30.0  # 1チャンクの上限（秒、モデルの入力長以下）
+    WHISPER_BATCH_WINDOW_SECONDS: float = 600.0  # 特徴量をまとめて計算する範囲（秒）
+    WHISPER_BATCH_MIN_SILENCE_MS: int = 160  # チャンク境界とする最短の無音（ミリ秒）
+
+    # 繰り返しループ検出（逐次デコードで同じフレーズを繰り返し始めたら打ち切って次の発話へ進む）
+    WHISPER_LOOP_DETECTION_ENABLED: bool = True
+    WHISPER_LOOP_MIN_REPEATS: int = 3  # 同じテキストがこの回数続いたらループとみなす
+    WHISPER_LOOP_WINDOW_SEGMENTS: int = 8  # n-gram の重複を調べる直近のセグメント数
+    WHISPER_LOOP_NGRAM_SIZE: int = 4  # 文字 n-gram の長さ（これより短いテキストの連続は無視）
+    WHISPER_LOOP_NGRAM_REPEAT_RATIO: float = 0.6  # 直近の n-gram のうち重複がこの割合を超えたらループ
+    WHISPER_LOOP_COMPRESSION_RATIO: float = 2.4  # 圧縮率がこれを超えるセグメントが2つ続いたらループ
+    WHISPER_LOOP_SEARCH_SECONDS: float = 600.0  # ループ後に次の発話を探す範囲（秒）
+
+    # 2段階デコード（貪欲法で全体をデコードし、信頼度の低い区間だけ高コストの設定で再デコード）
+    WHISPER_TWO_PASS_ENABLED: bool = False
+    WHISPER_REFINE_LOGPROB_THRESHOLD: float = -0.8  # avg_logprob がこれ未満なら再デコード
+    WHISPER_REFINE_COMPRESSION_RATIO_THRESHOLD: float = 2.4  # 圧縮率がこれを超えたら再デコード
+    WHISPER_REFINE_NO_SPEECH_THRESHOLD: float = 0.6  # 無音確率がこれを超えたら再デコード
+    WHISPER_REFINE_MERGE_GAP: float = 1.0  # これ以下の間隔の低信頼度セグメントをまとめる（秒）
+    WHISPER_REFINE_PADDING: float = 0.5  # 再デコード区間の前後に足す長さ（秒）
+
+    # デコード設定の自動選択（音声長・待ちジョブ数・実測速度から TARGET_PROCESSING_RATIO に収まる設定を選ぶ）
+    DECODING_SCHEDULER_ENABLED: bool = True
+    DECODING_INITIAL_SPEED_RATIO: float = 0.05  # 実測前の処理時間 / 音声長（最も精度の高い設定）
+    DECODING_SPEED_SMOOTHING: float = 0.3  # 実測した処理速度の指数移動平均の重み
+    DECODING_QUEUE_PRESSURE: float = 0.1  # 待ちジョブ1件あたりに予算を縮める割合
+
+    # Whisper モデルの常駐管理（ジョブをまたいでモデルを再利用）
+    WHISPER_MODEL_IDLE_TIMEOUT: float = 900.0  # 最後の利用からアンロードまでの秒数（0 以下で無期限）
+    WHISPER_MODEL_MONITOR_INTERVAL: float = 30.0  # アイドル・メモリ逼迫の確認間隔（秒）
+    WHISPER_MODEL_MIN_AVAILABLE_MEMORY_MB: int = 1024  # ホストの空きメモリがこれ未満ならアンロード
+    WHISPER_MODEL_MIN_FREE_GPU_MEMORY_MB: int = 512  # GPU の空きメモリがこれ未満ならアンロード
+
+    # 書き起こしのチェックポイント（クラッシュ・タイムアウト後に続きから再開）
+    TRANSCRIPTION_CHECKPOINT_ENABLED: bool = True
+    TRANSCRIPTION_CHECKPOINT_INTERVAL: float = 60.0  # チェックポイントの保存間隔（秒）
+    TRANSCRIPTION_MAX_ATTEMPTS: int = 3  # 再開を含む最大実行回数
+    TRANSCRIPTION_RETRY_DELAY: int = 30  # 再投入までの待ち時間（秒）
+
+    # Celery ワーカー設定
+    CELERY_WORKER_MAX_TASKS_PER_CHILD: int = 200  # プロセス再生成までのタスク数（再生成でモデルも再ロード）
+    CELERY_WORKER_MAX_MEMORY_PER_CHILD_MB: int = 12288  # 常駐メモリがこれを超えたらプロセスを再生成
+    CELERY_PREPROCESS_QUEUE: str = "preprocess"  # 前処理（CPU）タスクのキュー
+    CELERY_TRANSCRIBE_QUEUE: str = "transcribe"  # 書き起こし（GPU）タスクのキュー
+    TRANSCRIPTION_PIPELINE_ENABLED: bool = True  # 前処理と書き起こしを別タスクに分け、次のジョブの前処理を並行させる
+
+    # 分散書き起こし（長時間の録音をチャンクに分け、複数の書き起こしワーカーで並列に処理する）
+    TRANSCRIPTION_DISTRIBUTED_ENABLED: bool = False
+    TRANSCRIPTION_DISTRIBUTED_MIN_DURATION: float = 1800.0  # 分散する無音除去後の音声長の下限（秒）
+    TRANSCRIPTION_CHUNK_SECONDS: float = 600.0  # 1チャンクの目安の長さ（秒）
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: float = 2.0  # 隣のチャンクと重ねて書き起こす長さ（秒）
+
+    # 書き起こしジョブスケジューラ（プラン・音声長の優先順位でキューへ投入する）
+    JOB_SCHEDULER_ENABLED: bool = True
+    JOB_SCHEDULER_MAX_RUNNING: int = 2  # 同時に投入するジョブ数（書き起こし中 + 前処理中）
+    JOB_SCHEDULER_DURATION_WEIGHT: float = 1.0  # 音声長1秒あたりの優先度の下がり幅
+    JOB_SCHEDULER_PLAN_OFFSETS: Dict[str, float] = {  # プランごとの優先度の下がり幅（音声長の秒数換算）
+        "unlimited": 0.0,
+        "standard": 300.0,
+        "lite": 600.0,
+        "free": 900.0,
+    }
+    JOB_SCHEDULER_AGING_RATE: float = 1.0  # 待ち時間1秒あたりの優先度の上がり幅
+    JOB_SCHEDULER_RUNNING_TIMEOUT: int = 3600 * 4  # 実行中のまま残ったジョブを外すまでの秒数（タスクの時間制限）
+    JOB_SCHEDULER_DURATION_BUCKETS: List[float] = [600.0, 3600.0, 10800.0]  # 待ち時間を集計する音声長の区分（秒）
+
+    # 待ち時間・完了時刻の予測（ワーカーごとの処理速度を完了したジョブから学習する）
+    ETA_INITIAL_RATIO: float = 0.083  # 実績のない間の処理時間 / 音声長（TARGET_PROCESSING_RATIO と同じ）
+    ETA_SMOOTHING: float = 0.2  # 処理速度の指数移動平均の重み
+    ETA_WORKER_TTL: int = 60 * 60 * 24  # この期間ジョブを完了していないワーカーは予測に使わない（秒）
+    ETA_PREDICTION_TTL: int = 60 * 60 * 24  # 投入時の予測を実績と比較するまで残す期間（秒）
+    ETA_RECENT_PREDICTIONS: int = 100  # 予測と実績の比較を残す件数
+
+    # 音声前処理設定
+    AUDIO_STREAMING_ENABLED: bool = True  # ブロック単位のストリーミング前処理
+    AUDIO_STREAMING_BLOCK_SECONDS: float = 30.0  # ストリーミング時のブロック長（秒）
+    AUDIO_DEBUG_SAVE_PREPROCESSED: bool = False  # 前処理結果の WAV を RAM ディスクに残す（デバッグ用）
+    AUDIO_FFMPEG_FORMATS: List[str] = ["mp3", "m4a"]  # ffmpeg パイプでデコードする形式
+    FFMPEG_BINARY: str = "ffmpeg"
+    NOISE_REDUCTION_BACKEND: str = "noisereduce"  # noisereduce / spectral_gate
+    SPECTRAL_GATE_N_FFT: int = 1024
+    SPECTRAL_GATE_N_STD_THRESH: float = 1.5  # ノイズ閾値（平均 + n × 標準偏差）
+
+    # 音量正規化（EBU R128 方式のラウドネス正規化）
+    LOUDNESS_TARGET_LUFS: float = -20.0  # 目標統合ラウドネス
+    LOUDNESS_TRUE_PEAK_DBTP: float = -1.0  # リミッターの上限（トゥルーピーク）
+
+    # チャンク並列前処理（ワーカー数 2 以上で有効、ストリーミングより優先）
+    AUDIO_PREPROCESS_WORKERS: int = 1
+    PARALLEL_CHUNK_SECONDS: float = 60.0  # 1チャンクの長さ（秒）
+    PARALLEL_OVERLAP_SECONDS: float = 1.0  # 前後に余分に読む長さ（秒）
+    PARALLEL_CROSSFADE_SECONDS: float = 0.25  # チャンク境界のクロスフェード長（秒）
+
+    # 適応的前処理（品質分析で不要なステージをスキップ）
+    ADAPTIVE_PREPROCESSING_ENABLED: bool = True
+    QUALITY_SAMPLE_WINDOWS: int = 32  # 分析に使う区間数
+    QUALITY_SAMPLE_WINDOW_SECONDS: float = 1.0  # 1区間の長さ（秒）
+    QUALITY_MIN_SNR_DB: float = 30.0  # これ未満ならノイズ除去を適用
+    QUALITY_LOUDNESS_MIN_DB: float = -32.0  # 発話レベルの許容範囲（dBFS）
+    QUALITY_LOUDNESS_MAX_DB: float = -12.0
+    QUALITY_MAX_CLIPPING_RATIO: float = 0.001  # これを超えてクリップしている場合は音量を上げない
+
+    # 無音区間除去設定（Whisper 実行前）
+    SILENCE_COMPACTION_ENABLED: bool = True
+    SILENCE_THRESHOLD_DB: float = -45.0  # これ未満のフレームを無音とみなす（dBFS）
+    SILENCE_MIN_DURATION: float = 2.0  # 除去対象とする無音の最短長（秒）
+    SILENCE_PADDING: float = 0.3  # 発話の前後に残す無音（秒）
+
     # ファイル設定
     MAX_UPLOAD_SIZE: int = 500 * 1024 * 1024  # 500MB
     RAMDISK_PATH: str = "/tmp/ramdisk"
     ALLOWED_AUDIO_FORMATS: List[str] = ["mp3", "wav", "m4a", "flac"]
+    MULTITRACK_MAX_TRACKS: int = 16  # 話者別トラックの最大本数
 
     # 課金プラン設定（円）
     FREE_PLAN_SESSIONS: int = 3
@@ -22,6 +22,9 @@ class TranscriptSegment(BaseModel):
     end: float  # 終了時刻（秒）
     text: str  # 書き起こしテキスト
     confidence: Optional[float] = None  # 信頼度
+    compression_ratio: Optional[float] = None  # テキストの圧縮率（高いほど繰り返しが多い）
+    no_speech_prob: Optional[float] = None  # 無音である確率
+    speaker: Optional[str] = None  # 話者ラベル（話者別トラックの場合）
 
 
 class Transcription(BaseModel):
@@ -32,6 +35,7 @@ class Transcription(BaseModel):
     audio_filename: str
     audio_duration: Optional[float] = None  # 音声長（秒）
     audio_size: int  # ファイルサイズ（バイト）
+    speakers: List[str] = []  # 話者別トラックの話者ラベル（単一音声の場合は空）
 
     # 処理結果
     segments: List[TranscriptSegment] = []
@@ -27,6 +27,7 @@ class TranscriptionResponse(BaseModel):
     audio_filename: str
     audio_duration: Optional[float] = None
     audio_size: int
+    speakers: List[str] = []
     full_text: Optional[str] = None
     segments: List[TranscriptSegment] = []
     session_log: Optional[str] = None
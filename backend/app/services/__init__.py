@@ -1,11 +1,26 @@
 """
 サービスレイヤーパッケージ
 ビジネスロジックとデータ処理
+
+faster_whisper・noisereduce などの重い依存を API・Beat・クリーンアップ専用の
+プロセスで読み込まないよう、各サービスは初回参照時にインポートする
 """
-from .whisper_service import WhisperService
-from .audio_preprocessing import AudioPreprocessor
+import importlib
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "WhisperService": ".whisper_service",
+    "AudioPreprocessor": ".audio_preprocessing",
+}
 
 __all__ = [
     "WhisperService",
     "AudioPreprocessor",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,177 @@
+"""
+音声デコードサービス
+
+圧縮形式（mp3/m4a）は ffmpeg をサブプロセスとして1回だけ起動し、
+16kHz モノラル float32 PCM をパイプ経由でブロック単位に受け取る
+wav/flac は soundfile で読み込む
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Iterator, Optional
+
+import numpy as np
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# エラーメッセージに含める ffmpeg の標準エラー出力（末尾のバイト数）
+STDERR_TAIL_BYTES = 500
+
+
+class AudioDecodeError(RuntimeError):
+    """音声デコード失敗"""
+
+
+class FFmpegDecoder:
+    """
+    ffmpeg パイプデコーダー
+
+    ffmpeg 側でデコード・ダウンミックス・リサンプリングまで行い、
+    標準出力の f32le ストリームを固定長ブロックで読み出す。
+    読み出しが止まるとパイプが詰まり ffmpeg も停止するため、
+    メモリ使用量はブロック長とパイプバッファで頭打ちになる。
+    標準エラー出力は一時ファイルへ逃がし、警告が大量に出る入力でも
+    stderr パイプが詰まって ffmpeg が止まらないようにする。
+    """
+
+    def __init__(self, binary: Optional[str] = None):
+        self.binary = binary or settings.FFMPEG_BINARY
+
+    def is_available(self) -> bool:
+        """ffmpeg が実行可能か"""
+        return shutil.which(self.binary) is not None
+
+    def should_decode(self, path: str) -> bool:
+        """ffmpeg でデコードすべき形式か（soundfile が扱えない/不得意な形式）"""
+        ext = os.path.splitext(path)[1].lstrip(".").lower()
+        return ext in settings.AUDIO_FFMPEG_FORMATS and self.is_available()
+
+    def iter_blocks(
+        self,
+        path: str,
+        sample_rate: int = 16000,
+        block_samples: Optional[int] = None,
+        start: Optional[float] = None,
+        duration: Optional[float] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        音声をデコードし、モノラル float32 のブロックを順に返す
+
+        Args:
+            path: 入力音声ファイルパス
+            sample_rate: 出力サンプリングレート
+            block_samples: 1ブロックのサンプル数（省略時は設定値の秒数）
+            start: デコード開始位置（秒、省略時は先頭から）
+            duration: デコードする長さ（秒、省略時は末尾まで）
+
+        Yields:
+            float32 のモノラル音声ブロック
+        """
+        if block_samples is None:
+            block_samples = int(settings.AUDIO_STREAMING_BLOCK_SECONDS * sample_rate)
+        block_bytes = block_samples * 4
+
+        command = [self.binary, "-nostdin", "-hide_banner", "-loglevel", "error"]
+        if start is not None:
+            # 入力側シークでデコード量を抑える
+            command += ["-ss", f"{start:.3f}"]
+        if duration is not None:
+            command += ["-t", f"{duration:.3f}"]
+        command += [
+            "-i", path,
+            "-vn",
+            "-ac", "1",
+            "-ar", str(sample_rate),
+            "-f", "f32le",
+            "-acodec", "pcm_f32le",
+            "pipe:1",
+        ]
+        if start is None:
+            logger.info(f"Decoding with ffmpeg: {path}")
+
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                bufsize=block_bytes
+            )
+            try:
+                remainder = b""
+                while True:
+                    chunk = bytearray(block_bytes)
+                    view = memoryview(chunk)
+                    filled = len(remainder)
+                    view[:filled] = remainder
+                    while filled < block_bytes:
+                        n = process.stdout.readinto(view[filled:])
+                        if not n:
+                            break
+                        filled += n
+
+                    # float32 の境界に揃わない端数は次のブロックへ持ち越す
+                    usable = filled - filled % 4
+                    remainder = bytes(view[usable:filled])
+                    view.release()
+                    if usable:
+                        yield np.frombuffer(chunk, dtype=np.float32, count=usable // 4)
+                    if filled < block_bytes:
+                        break
+
+                process.stdout.close()
+                if process.wait() != 0:
+                    raise AudioDecodeError(f"ffmpeg failed to decode {path}: {self._stderr_tail(stderr)}")
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+    def _stderr_tail(self, stderr) -> str:
+        """一時ファイルに書き出された標準エラー出力の末尾を返す"""
+        size = stderr.seek(0, os.SEEK_END)
+        stderr.seek(max(0, size - STDERR_TAIL_BYTES))
+        return stderr.read().decode("utf-8", errors="replace").strip()
+
+    def decode(
+        self,
+        path: str,
+        sample_rate: int = 16000,
+        start: Optional[float] = None,
+        duration: Optional[float] = None
+    ) -> np.ndarray:
+        """音声全体（または指定区間）をデコードして1つの配列で返す"""
+        blocks = list(self.iter_blocks(path, sample_rate=sample_rate, start=start, duration=duration))
+        if not blocks:
+            return np.empty(0, dtype=np.float32)
+        if len(blocks) == 1:
+            return blocks[0]
+        return np.concatenate(blocks)
+
+    def probe_duration(self, path: str) -> Optional[float]:
+        """ffprobe で音声長（秒）を取得（取得できない場合は None）"""
+        ffprobe = os.path.join(os.path.dirname(self.binary), "ffprobe") if os.path.dirname(self.binary) else "ffprobe"
+        if shutil.which(ffprobe) is None:
+            return None
+        try:
+            result = subprocess.run(
+                [
+                    ffprobe, "-v", "error",
+                    "-show_entries", "format=duration",
+                    "-of", "default=noprint_wrappers=1:nokey=1",
+                    path,
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=30
+            )
+            return float(result.stdout.decode().strip())
+        except (ValueError, subprocess.TimeoutExpired):
+            return None
+
+
+# シングルトンインスタンス
+ffmpeg_decoder = FFmpegDecoder()
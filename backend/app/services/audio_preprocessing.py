@@ -5,49 +5,294 @@
 """
 import logging
 import os
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import soundfile as sf
 import numpy as np
-try:
-    import noisereduce as nr
-except ImportError:
-    nr = None
 
 from ..core.config import settings
+from .audio_decoder import ffmpeg_decoder
+from .audio_quality import signal_quality_analyzer
+from .loudness import LoudnessNormalizer, LoudnessStats
+from .parallel_preprocessing import parallel_preprocessor
+from .resampler import PolyphaseResampler, resample
+from .spectral_gate import SpectralGateDenoiser
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _noisereduce():
+    """noisereduce を初回のノイズ除去時に読み込む（scipy.signal などの読み込みに約1秒かかる）"""
+    try:
+        import noisereduce
+    except ImportError:
+        return None
+    return noisereduce
+
+# 無音検出のフレーム長（秒）
+SILENCE_FRAME_SECONDS = 0.03
+
+# 前処理ステージの処理コスト初期値（音声1秒あたりの CPU 秒）
+DEFAULT_STAGE_COST_PER_SECOND = {
+    "noise_reduction": 0.02,
+    "normalization": 0.0005,
+}
+
+
+class TimelineMap:
+    """
+    無音除去後の時刻 → 元音声の時刻への対応表
+
+    残した区間ごとに「除去後の開始時刻」と「元音声の開始時刻」だけを保持する。
+    区間内では時刻差がそのまま保たれるため、区間の特定と加算だけで逆変換できる。
+    """
+
+    def __init__(
+        self,
+        compact_starts: List[float],
+        original_starts: List[float],
+        compact_duration: float,
+        original_duration: float
+    ):
+        self.compact_starts = np.asarray(compact_starts, dtype=np.float64)
+        self.original_starts = np.asarray(original_starts, dtype=np.float64)
+        self.compact_duration = compact_duration
+        self.original_duration = original_duration
+
+    @classmethod
+    def identity(cls, duration: float) -> "TimelineMap":
+        """何も除去していない場合の対応表"""
+        return cls([0.0], [0.0], duration, duration)
+
+    @property
+    def removed_seconds(self) -> float:
+        """除去した音声長（秒）"""
+        return self.original_duration - self.compact_duration
+
+    @property
+    def removed_ratio(self) -> float:
+        """除去した割合（0〜1）"""
+        if self.original_duration <= 0:
+            return 0.0
+        return self.removed_seconds / self.original_duration
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """
+        除去後の時刻を元音声の時刻に変換
+
+        Args:
+            t: 除去後の時刻（秒）
+            is_end: 区間の終了時刻か（区間の継ぎ目ちょうどの場合は前の区間に属させる）
+        """
+        side = "left" if is_end else "right"
+        i = max(int(np.searchsorted(self.compact_starts, t, side=side)) - 1, 0)
+        return float(self.original_starts[i] + (t - self.compact_starts[i]))
+
+    def to_compact(self, t: float) -> float:
+        """
+        元音声の時刻を除去後の時刻に変換（除去された区間内の時刻は次の区間の先頭に寄せる）
+
+        Args:
+            t: 元音声の時刻（秒）
+        """
+        i = max(int(np.searchsorted(self.original_starts, t, side="right")) - 1, 0)
+        if i + 1 < len(self.compact_starts):
+            kept = self.compact_starts[i + 1] - self.compact_starts[i]
+        else:
+            kept = self.compact_duration - self.compact_starts[i]
+        return float(self.compact_starts[i] + min(max(t - self.original_starts[i], 0.0), kept))
+
+    def to_dict(self) -> dict:
+        """シリアライズ用の辞書に変換"""
+        return {
+            "compact_starts": self.compact_starts.tolist(),
+            "original_starts": self.original_starts.tolist(),
+            "compact_duration": self.compact_duration,
+            "original_duration": self.original_duration,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TimelineMap":
+        """辞書から復元"""
+        return cls(
+            data["compact_starts"],
+            data["original_starts"],
+            data["compact_duration"],
+            data["original_duration"],
+        )
+
+
+@dataclass
+class PreprocessedAudio:
+    """
+    前処理済み音声バッファ
+
+    Whisper にそのまま渡せる 16kHz モノラル float32 配列とメタデータ
+    """
+    audio: np.ndarray  # 16kHz モノラル float32
+    sample_rate: int
+    source_path: str  # 元の音声ファイルパス
+    debug_path: Optional[str] = None  # デバッグ用に書き出した WAV（任意）
+    stage_times: Dict[str, float] = field(default_factory=dict)  # ステージごとの処理時間（秒）
+
+    @property
+    def duration(self) -> float:
+        """音声長（秒）"""
+        return len(self.audio) / self.sample_rate
+
+
 class AudioPreprocessor:
     """音声前処理クラス"""
 
     def __init__(self):
         """初期化"""
         self.target_sample_rate = 16000  # Whisper の推奨サンプリングレート
+        # ステージごとの処理コスト（実測値の指数移動平均）
+        self.stage_cost_per_second = dict(DEFAULT_STAGE_COST_PER_SECOND)
+        self.loudness_normalizer = LoudnessNormalizer(
+            sample_rate=self.target_sample_rate,
+            target_lufs=settings.LOUDNESS_TARGET_LUFS,
+            true_peak_db=settings.LOUDNESS_TRUE_PEAK_DBTP
+        )
+
+    def preprocess_to_buffer(
+        self,
+        input_path: str,
+        apply_noise_reduction: bool = True,
+        normalize_audio: bool = True,
+        streaming: bool = False,
+        debug_output_path: Optional[str] = None,
+        workers: int = 1
+    ) -> PreprocessedAudio:
+        """
+        音声ファイルを前処理し、メモリ上のバッファとして返す
+
+        中間 WAV の書き出しと再デコードを行わないため、
+        結果はそのまま WhisperService.transcribe に渡せる。
+
+        Args:
+            input_path: 入力音声ファイルパス
+            apply_noise_reduction: ノイズ除去を適用するか
+            normalize_audio: 音量正規化を適用するか
+            streaming: ブロック単位のストリーミング処理を使うか
+            debug_output_path: 指定時は前処理結果を WAV としても書き出す（デバッグ用）
+            workers: 2 以上でチャンク並列処理を使う（streaming より優先）
+
+        Returns:
+            前処理済み音声バッファ
+        """
+        logger.info(f"Preprocessing audio: {input_path}")
+
+        stage_times: Dict[str, float] = {}
+        audio_data = None
+        if workers > 1:
+            audio_data = self._process_parallel(
+                input_path,
+                workers,
+                apply_noise_reduction=apply_noise_reduction,
+                normalize_audio=normalize_audio,
+                stage_times=stage_times
+            )
+        if audio_data is None and streaming:
+            audio_data = self._process_streaming_to_buffer(
+                input_path,
+                apply_noise_reduction=apply_noise_reduction,
+                normalize_audio=normalize_audio,
+                stage_times=stage_times
+            )
+        elif audio_data is None:
+            audio_data = self._process_in_memory(
+                input_path,
+                apply_noise_reduction=apply_noise_reduction,
+                normalize_audio=normalize_audio,
+                stage_times=stage_times
+            )
+        self._record_stage_costs(stage_times, len(audio_data) / self.target_sample_rate)
+
+        debug_path = None
+        if debug_output_path is not None:
+            debug_path = self._resolve_output_path(input_path, debug_output_path)
+            sf.write(debug_path, audio_data, self.target_sample_rate, subtype="FLOAT")
+            logger.info(f"Preprocessed audio written for debugging: {debug_path}")
+
+        result = PreprocessedAudio(
+            audio=audio_data,
+            sample_rate=self.target_sample_rate,
+            source_path=input_path,
+            debug_path=debug_path,
+            stage_times=stage_times
+        )
+        logger.info(f"Preprocessing completed: {result.duration:.2f} seconds")
+        return result
 
     def preprocess(
         self,
         input_path: str,
         output_path: Optional[str] = None,
         apply_noise_reduction: bool = True,
-        normalize_audio: bool = True
+        normalize_audio: bool = True,
+        streaming: bool = False
     ) -> str:
         """
-        音声ファイルを前処理
+        音声ファイルを前処理し、WAV ファイルとして保存
 
         Args:
             input_path: 入力音声ファイルパス
             output_path: 出力音声ファイルパス（省略時は一時ファイル）
             apply_noise_reduction: ノイズ除去を適用するか
             normalize_audio: 音量正規化を適用するか
+            streaming: ブロック単位のストリーミング処理を使うか
+                （長時間セッションでもメモリ使用量が一定）
 
         Returns:
             処理後の音声ファイルパス
         """
         logger.info(f"Preprocessing audio: {input_path}")
 
-        # 音声ファイル読み込み
-        audio_data, sample_rate = sf.read(input_path)
+        output_path = self._resolve_output_path(input_path, output_path)
+
+        if streaming:
+            self._preprocess_streaming(
+                input_path,
+                output_path,
+                apply_noise_reduction=apply_noise_reduction,
+                normalize_audio=normalize_audio
+            )
+            logger.info(f"Preprocessing completed (streaming): {output_path}")
+            return output_path
+
+        audio_data = self._process_in_memory(
+            input_path,
+            apply_noise_reduction=apply_noise_reduction,
+            normalize_audio=normalize_audio
+        )
+
+        # WAV形式で保存（Whisperに最適）
+        sf.write(output_path, audio_data, self.target_sample_rate)
+
+        logger.info(f"Preprocessing completed: {output_path}")
+        return output_path
+
+    def _process_in_memory(
+        self,
+        input_path: str,
+        apply_noise_reduction: bool,
+        normalize_audio: bool,
+        stage_times: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """全体を一括で読み込んで前処理（16kHz モノラル float32 を返す）"""
+        if stage_times is None:
+            stage_times = {}
+
+        # 音声ファイル読み込み（圧縮形式は ffmpeg で 16kHz モノラルに直接デコード）
+        if ffmpeg_decoder.should_decode(input_path):
+            audio_data = ffmpeg_decoder.decode(input_path, sample_rate=self.target_sample_rate)
+            sample_rate = self.target_sample_rate
+        else:
+            audio_data, sample_rate = sf.read(input_path, dtype="float32")
 
         # モノラル変換（ステレオの場合）
         if len(audio_data.shape) > 1:
@@ -61,35 +306,388 @@ class AudioPreprocessor:
             sample_rate = self.target_sample_rate
 
         # ノイズ除去
-        if apply_noise_reduction and nr is not None:
+        if apply_noise_reduction and settings.NOISE_REDUCTION_BACKEND == "spectral_gate":
+            logger.info("Applying noise reduction (spectral gate)")
+            stage_start = time.perf_counter()
+            audio_data = np.asarray(audio_data, dtype=np.float32)
+            denoiser = self._create_spectral_gate()
+            denoiser.estimate_profile(audio_data)
+            # 出力は入力より遅れるため、その場で書き換えられる
+            audio_data = denoiser.denoise(
+                audio_data,
+                block_size=int(settings.AUDIO_STREAMING_BLOCK_SECONDS * sample_rate),
+                out=audio_data if audio_data.flags.writeable else None
+            )
+            stage_times["noise_reduction"] = time.perf_counter() - stage_start
+        elif apply_noise_reduction and _noisereduce() is not None:
             logger.info("Applying noise reduction")
-            audio_data = nr.reduce_noise(
+            stage_start = time.perf_counter()
+            audio_data = _noisereduce().reduce_noise(
                 y=audio_data,
                 sr=sample_rate,
                 stationary=True,
                 prop_decrease=0.5
             )
-        elif apply_noise_reduction and nr is None:
+            stage_times["noise_reduction"] = time.perf_counter() - stage_start
+        elif apply_noise_reduction:
             logger.warning("noisereduce not available, skipping noise reduction")
 
-        # 音量正規化（LUFS -23 ~ -16 目標）
+        # 音量正規化（LOUDNESS_TARGET_LUFS 目標）
         if normalize_audio:
             logger.info("Normalizing audio volume")
+            stage_start = time.perf_counter()
             audio_data = self._normalize_volume(audio_data)
+            stage_times["normalization"] = time.perf_counter() - stage_start
 
-        # 出力パス決定
+        return np.asarray(audio_data, dtype=np.float32)
+
+    def _process_parallel(
+        self,
+        input_path: str,
+        workers: int,
+        apply_noise_reduction: bool,
+        normalize_audio: bool,
+        stage_times: Dict[str, float]
+    ) -> Optional[np.ndarray]:
+        """
+        チャンク並列で前処理（parallel_preprocessing.py）
+
+        プロセスプールを起動できない環境（デーモンプロセス内など）では None を返し、
+        呼び出し側は逐次処理にフォールバックする。
+        """
+        noise_profile = None
+        use_noisereduce = False
+        if apply_noise_reduction and settings.NOISE_REDUCTION_BACKEND == "spectral_gate":
+            # ノイズプロファイルは親プロセスで一度だけ推定し、全チャンクで共有する
+            denoiser = self._create_spectral_gate()
+            samples, _ = signal_quality_analyzer.read_samples(input_path, self.target_sample_rate)
+            noise_profile = denoiser.estimate_profile(samples).threshold_db
+            del samples
+        elif apply_noise_reduction and _noisereduce() is not None:
+            use_noisereduce = True
+        elif apply_noise_reduction:
+            logger.warning("noisereduce not available, skipping noise reduction")
+
+        stage_start = time.perf_counter()
+        try:
+            audio_data, loudness = parallel_preprocessor.process(
+                input_path,
+                workers,
+                noise_profile=noise_profile,
+                use_noisereduce=use_noisereduce,
+                measure_loudness=normalize_audio
+            )
+        except (AssertionError, OSError) as e:
+            logger.warning(f"Parallel preprocessing unavailable, falling back to serial: {e}")
+            return None
+        if apply_noise_reduction:
+            stage_times["noise_reduction"] = time.perf_counter() - stage_start
+
+        # 音量正規化（チャンクごとの測定結果を合算した全体共通のゲイン）
+        if normalize_audio:
+            logger.info("Normalizing audio volume (parallel)")
+            stage_start = time.perf_counter()
+            audio_data = self._normalize_volume(audio_data, loudness)
+            stage_times["normalization"] = time.perf_counter() - stage_start
+
+        return audio_data
+
+    def _resolve_output_path(self, input_path: str, output_path: Optional[str]) -> str:
+        """出力パスを決定（拡張子は常に .wav）"""
         if output_path is None:
             output_path = os.path.join(
                 settings.RAMDISK_PATH,
                 f"preprocessed_{os.path.basename(input_path)}"
             )
+        return os.path.splitext(output_path)[0] + ".wav"
 
-        # WAV形式で保存（Whisperに最適）
-        output_path = os.path.splitext(output_path)[0] + ".wav"
-        sf.write(output_path, audio_data, sample_rate)
+    def _preprocess_streaming(
+        self,
+        input_path: str,
+        output_path: str,
+        apply_noise_reduction: bool,
+        normalize_audio: bool
+    ) -> None:
+        """
+        ブロック単位のストリーミング前処理
 
-        logger.info(f"Preprocessing completed: {output_path}")
-        return output_path
+        入力を固定長ブロックで読み込み、モノラル化 → リサンプリング → ノイズ除去
+        の順に処理して出力ファイルへ逐次書き込む。音量正規化はゲインが全体の
+        統計量に依存するため、1パス目でラウドネスとトゥルーピークを測定し、
+        2パス目で出力ファイルをその場で書き換える。
+
+        ピークメモリはブロック長にのみ依存し、音声長には依存しない。
+        """
+        meter = self.loudness_normalizer.create_meter() if normalize_audio else None
+        total_samples = 0
+
+        # 正規化で書き戻すため、量子化誤差の出ない 32bit float で保存
+        with sf.SoundFile(
+            output_path,
+            mode="w",
+            samplerate=self.target_sample_rate,
+            channels=1,
+            subtype="FLOAT"
+        ) as out:
+            for block in self._iter_processed_blocks(input_path, apply_noise_reduction):
+                if meter is not None:
+                    meter.process(block)
+                total_samples += len(block)
+                out.write(block)
+
+        # 音量正規化（2パス目: ゲインとリミッターを出力ファイルへその場で適用）
+        if meter is not None and total_samples > 0:
+            logger.info("Normalizing audio volume (streaming)")
+            self._normalize_file_in_place(output_path, meter.result())
+
+    def _process_streaming_to_buffer(
+        self,
+        input_path: str,
+        apply_noise_reduction: bool,
+        normalize_audio: bool,
+        stage_times: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        ブロック単位のストリーミング前処理（メモリ上のバッファへ出力）
+
+        出力バッファはヘッダのフレーム数から事前確保し、各ブロックを直接書き込む。
+        ラウドネスは書き込みと同時に測定し、正規化は出力バッファへその場で適用する。
+        """
+        duration = self._estimate_duration(input_path)
+        capacity = int(np.ceil(duration * self.target_sample_rate)) + 1
+        buffer = np.empty(capacity, dtype=np.float32)
+
+        meter = self.loudness_normalizer.create_meter() if normalize_audio else None
+        total_samples = 0
+
+        for block in self._iter_processed_blocks(input_path, apply_noise_reduction, stage_times):
+            end = total_samples + len(block)
+            if end > len(buffer):
+                # 圧縮形式では推定した音声長が実際より短いことがある
+                buffer = np.resize(buffer, max(end, int(len(buffer) * 1.5)))
+            buffer[total_samples:end] = block
+            if meter is not None:
+                meter.process(block)
+            total_samples = end
+
+        audio_data = buffer[:total_samples]
+
+        if meter is not None and total_samples > 0:
+            logger.info("Normalizing audio volume (streaming)")
+            stage_start = time.perf_counter()
+            audio_data = self._normalize_volume(audio_data, meter.result())
+            if stage_times is not None:
+                stage_times["normalization"] = time.perf_counter() - stage_start
+
+        return audio_data
+
+    def _iter_processed_blocks(
+        self,
+        input_path: str,
+        apply_noise_reduction: bool,
+        stage_times: Optional[Dict[str, float]] = None
+    ):
+        """モノラル化・リサンプリング・ノイズ除去済みのブロックを順に返す"""
+        if apply_noise_reduction and settings.NOISE_REDUCTION_BACKEND == "spectral_gate":
+            yield from self._iter_spectral_gate_blocks(input_path, stage_times)
+            return
+
+        nr = _noisereduce() if apply_noise_reduction else None
+        if nr is not None:
+            yield from self._iter_noisereduce_blocks(input_path, nr, stage_times)
+            return
+        if apply_noise_reduction:
+            logger.warning("noisereduce not available, skipping noise reduction")
+
+        yield from self._iter_mono_blocks(input_path)
+
+    def _iter_noisereduce_blocks(
+        self,
+        input_path: str,
+        nr,
+        stage_times: Optional[Dict[str, float]] = None
+    ):
+        """
+        noisereduce でノイズ除去したブロックを順に返す
+
+        noisereduce は処理単位ごとに定常ノイズを推定するため、ブロックを
+        PARALLEL_OVERLAP_SECONDS ずつ重ねて処理し、重なり区間の中央を
+        PARALLEL_CROSSFADE_SECONDS のクロスフェードでつなぐ（parallel_preprocessing と同じ方式）。
+        """
+        overlap = int(settings.PARALLEL_OVERLAP_SECONDS * self.target_sample_rate)
+        fade = min(int(settings.PARALLEL_CROSSFADE_SECONDS * self.target_sample_rate), overlap // 2)
+        # 直前のウィンドウ末尾の入力と、その区間の直前ウィンドウでの処理結果（未出力）
+        context = np.zeros(0, dtype=np.float32)
+        held = np.zeros(0, dtype=np.float32)
+
+        elapsed = 0.0
+        pending = None
+        for mono in self._iter_mono_blocks(input_path):
+            if pending is not None and len(pending) < overlap:
+                # 重なり区間より短いブロックは次のブロックと連結して処理する
+                pending = np.concatenate([pending, mono])
+                continue
+            if pending is not None:
+                stage_start = time.perf_counter()
+                block, context, held = self._noisereduce_window(
+                    nr, context, held, pending, overlap, fade, is_last=False
+                )
+                elapsed += time.perf_counter() - stage_start
+                if len(block):
+                    yield block
+            pending = mono
+
+        if pending is not None:
+            stage_start = time.perf_counter()
+            block, _, _ = self._noisereduce_window(
+                nr, context, held, pending, overlap, fade, is_last=True
+            )
+            elapsed += time.perf_counter() - stage_start
+            if len(block):
+                yield block
+        if stage_times is not None:
+            stage_times["noise_reduction"] = elapsed
+
+    def _noisereduce_window(
+        self,
+        nr,
+        context: np.ndarray,
+        held: np.ndarray,
+        block: np.ndarray,
+        overlap: int,
+        fade: int,
+        is_last: bool
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        直前の入力を前に付けて 1 ウィンドウ分をノイズ除去する
+
+        Returns:
+            (出力するサンプル, 次のウィンドウに付ける入力, その区間の処理結果)
+        """
+        window = np.concatenate([context, block])
+        processed = nr.reduce_noise(
+            y=window,
+            sr=self.target_sample_rate,
+            stationary=True,
+            prop_decrease=0.5
+        ).astype(np.float32, copy=False)
+
+        # 重なり区間: 前半は直前ウィンドウ、後半はこのウィンドウの結果を使う
+        n = len(context)
+        if n:
+            lo, hi = n // 2 - fade, n // 2 + fade
+            processed[:lo] = held[:lo]
+            weight = np.linspace(0.0, 1.0, hi - lo, dtype=np.float32)
+            processed[lo:hi] = held[lo:hi] * (1.0 - weight) + processed[lo:hi] * weight
+
+        keep = 0 if is_last else min(overlap, len(block))
+        split = len(window) - keep
+        return processed[:split], window[split:], processed[split:]
+
+    def _iter_spectral_gate_blocks(
+        self,
+        input_path: str,
+        stage_times: Optional[Dict[str, float]] = None
+    ):
+        """
+        スペクトルゲートでノイズ除去したブロックを順に返す
+
+        ノイズプロファイルはファイル全体から間引いた区間で一度だけ推定し、
+        全ブロックで共通に使う（ブロックごとの推定による境界の不連続を避ける）。
+        """
+        logger.info("Applying noise reduction (spectral gate, streaming)")
+        denoiser = self._create_spectral_gate()
+        samples, _ = signal_quality_analyzer.read_samples(input_path, self.target_sample_rate)
+        denoiser.estimate_profile(samples)
+        del samples
+
+        elapsed = 0.0
+        for mono in self._iter_mono_blocks(input_path):
+            stage_start = time.perf_counter()
+            block = denoiser.process(mono)
+            elapsed += time.perf_counter() - stage_start
+            if len(block):
+                yield block
+
+        stage_start = time.perf_counter()
+        tail = denoiser.flush()
+        elapsed += time.perf_counter() - stage_start
+        if stage_times is not None:
+            stage_times["noise_reduction"] = elapsed
+        if len(tail):
+            yield tail
+
+    def _create_spectral_gate(self) -> SpectralGateDenoiser:
+        """設定値からスペクトルゲートを生成"""
+        return SpectralGateDenoiser(
+            sample_rate=self.target_sample_rate,
+            n_fft=settings.SPECTRAL_GATE_N_FFT,
+            prop_decrease=0.5,
+            n_std_thresh=settings.SPECTRAL_GATE_N_STD_THRESH
+        )
+
+    def _iter_mono_blocks(self, input_path: str):
+        """
+        入力をブロック単位で読み、モノラル・ターゲットレートのブロックを返す
+
+        圧縮形式は ffmpeg パイプから 16kHz モノラルで直接受け取る。
+        リサンプラーの終端出力は最後のブロックに連結する。
+        """
+        if ffmpeg_decoder.should_decode(input_path):
+            yield from ffmpeg_decoder.iter_blocks(input_path, sample_rate=self.target_sample_rate)
+            return
+
+        info = sf.info(input_path)
+        block_frames = max(1, int(settings.AUDIO_STREAMING_BLOCK_SECONDS * info.samplerate))
+
+        resampler = None
+        if info.samplerate != self.target_sample_rate:
+            logger.info(f"Resampling from {info.samplerate}Hz to {self.target_sample_rate}Hz (streaming)")
+            resampler = PolyphaseResampler(info.samplerate, self.target_sample_rate)
+
+        pending = None
+        for block in sf.blocks(input_path, blocksize=block_frames, dtype="float32", always_2d=True):
+            # モノラル変換
+            mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+            # リサンプリング
+            if resampler is not None:
+                mono = resampler.process(mono)
+            if len(mono) == 0:
+                continue
+            if pending is not None:
+                yield pending
+            pending = mono
+
+        if resampler is not None:
+            tail = resampler.flush()
+            if len(tail):
+                pending = tail if pending is None else np.concatenate([pending, tail])
+        if pending is not None:
+            yield pending
+
+    def _normalize_file_in_place(self, path: str, loudness: LoudnessStats) -> None:
+        """出力ファイルをブロック単位で読み戻してゲインとリミッターを適用し、上書きする"""
+        limiter = self.loudness_normalizer.create_limiter(loudness)
+        block_frames = self._block_samples()
+        with sf.SoundFile(path, mode="r+") as f:
+            read_position = 0
+            write_position = 0
+            while True:
+                f.seek(read_position)
+                block = f.read(block_frames, dtype="float32")
+                if len(block) == 0:
+                    break
+                read_position += len(block)
+                # リミッターの出力は入力より遅れるため、未読部分を上書きしない
+                processed = limiter.process(block)
+                f.seek(write_position)
+                f.write(processed)
+                write_position += len(processed)
+            tail = limiter.flush()
+            if len(tail):
+                f.seek(write_position)
+                f.write(tail)
 
     def _resample(
         self,
@@ -100,47 +698,132 @@ class AudioPreprocessor:
         """
         リサンプリング
 
-        NOTE: より高品質なリサンプリングには librosa の使用を推奨
-        ここでは簡易的な実装
+        帯域制限フィルタ付きのポリフェーズ方式（resampler.py）で変換する。
+        ブロック単位で処理するため、入出力以外の一時配列はブロック長で頭打ちになる。
         """
-        # 簡易リサンプリング（線形補間）
-        duration = len(audio_data) / original_sr
-        target_length = int(duration * target_sr)
-
-        indices = np.linspace(0, len(audio_data) - 1, target_length)
-        resampled = np.interp(indices, np.arange(len(audio_data)), audio_data)
-
-        return resampled
+        block_size = int(settings.AUDIO_STREAMING_BLOCK_SECONDS * original_sr)
+        return resample(audio_data, original_sr, target_sr, block_size=block_size)
 
-    def _normalize_volume(self, audio_data: np.ndarray, target_db: float = -20.0) -> np.ndarray:
+    def _normalize_volume(
+        self,
+        audio_data: np.ndarray,
+        loudness: Optional[LoudnessStats] = None
+    ) -> np.ndarray:
         """
-        音量正規化
+        音量正規化（ゲート付きラウドネスを目標値に合わせ、トゥルーピークをリミッターで抑える）
 
         Args:
-            audio_data: 音声データ
-            target_db: 目標音量（dB）
+            audio_data: 音声データ（float32 の書き込み可能な配列はその場で書き換える）
+            loudness: 測定済みのラウドネス（省略時はここでブロック単位に測定）
 
         Returns:
             正規化された音声データ
         """
-        # RMS計算
-        rms = np.sqrt(np.mean(audio_data ** 2))
+        audio_data = np.asarray(audio_data, dtype=np.float32)
+        return self.loudness_normalizer.normalize(audio_data, self._block_samples(), stats=loudness)
+
+    def _block_samples(self) -> int:
+        """16kHz 音声を処理するときの1ブロックのサンプル数"""
+        return max(1, int(settings.AUDIO_STREAMING_BLOCK_SECONDS * self.target_sample_rate))
+
+    def _record_stage_costs(self, stage_times: Dict[str, float], audio_seconds: float) -> None:
+        """実測したステージ処理時間で処理コストの移動平均を更新"""
+        if audio_seconds <= 0:
+            return
+        for stage, seconds in stage_times.items():
+            cost = seconds / audio_seconds
+            previous = self.stage_cost_per_second.get(stage, cost)
+            self.stage_cost_per_second[stage] = 0.7 * previous + 0.3 * cost
+
+    def estimate_stage_time(self, stage: str, audio_seconds: float) -> float:
+        """
+        ステージの処理時間を推定（スキップ時の節約時間の算出に使用）
 
-        if rms == 0:
-            return audio_data
+        Args:
+            stage: ステージ名（noise_reduction / normalization）
+            audio_seconds: 音声長（秒）
 
-        # 目標RMSを計算
-        target_rms = 10 ** (target_db / 20)
+        Returns:
+            推定処理時間（秒）
+        """
+        return self.stage_cost_per_second.get(stage, 0.0) * audio_seconds
 
-        # 正規化
-        normalized = audio_data * (target_rms / rms)
+    def compact_silence(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: Optional[int] = None
+    ) -> Tuple[np.ndarray, TimelineMap]:
+        """
+        長い無音区間を除去して音声を詰める
 
-        # クリッピング防止
-        max_val = np.max(np.abs(normalized))
-        if max_val > 1.0:
-            normalized = normalized / max_val * 0.95
+        30ms フレームのエネルギーをまとめて計算し、閾値未満のフレームが
+        SILENCE_MIN_DURATION 以上続く区間を、前後に SILENCE_PADDING を残して除去する。
+        追加のメモリを使わないよう、入力配列をその場で前方に詰める。
 
-        return normalized
+        Args:
+            audio_data: 音声データ（その場で書き換えられる）
+            sample_rate: サンプリングレート（省略時は 16kHz）
+
+        Returns:
+            (除去後の音声, 元の時刻への対応表)
+        """
+        sr = sample_rate or self.target_sample_rate
+        original_duration = len(audio_data) / sr
+        frame = int(sr * SILENCE_FRAME_SECONDS)
+        n_frames = len(audio_data) // frame
+        if n_frames == 0:
+            return audio_data, TimelineMap.identity(original_duration)
+
+        # フレームエネルギー（dBFS）
+        frames = audio_data[:n_frames * frame].reshape(n_frames, frame)
+        energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame
+        energy_db = 10 * np.log10(energy + 1e-12)
+
+        # 全体が小さい録音でも発話を無音扱いしないよう、発話レベルからの相対値で上限を設ける
+        threshold = min(settings.SILENCE_THRESHOLD_DB, float(np.percentile(energy_db, 95)) - 30.0)
+        silent = np.concatenate(([False], energy_db < threshold, [False]))
+        edges = np.diff(silent.astype(np.int8))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+
+        min_frames = int(np.ceil(settings.SILENCE_MIN_DURATION / SILENCE_FRAME_SECONDS))
+        long_runs = (run_ends - run_starts) >= min_frames
+        run_starts, run_ends = run_starts[long_runs], run_ends[long_runs]
+
+        # 発話との境界には余白を残す（ファイル先頭・末尾は残さない）
+        padding = int(settings.SILENCE_PADDING * sr)
+        cut_starts = np.where(run_starts == 0, 0, run_starts * frame + padding)
+        cut_ends = np.where(run_ends == n_frames, len(audio_data), run_ends * frame - padding)
+        valid = cut_ends > cut_starts
+        cut_starts, cut_ends = cut_starts[valid], cut_ends[valid]
+
+        if len(cut_starts) == 0:
+            return audio_data, TimelineMap.identity(original_duration)
+
+        compact_starts: List[float] = []
+        original_starts: List[float] = []
+        write = 0
+        read = 0
+        for cut_start, cut_end in zip(np.append(cut_starts, len(audio_data)), np.append(cut_ends, len(audio_data))):
+            length = int(cut_start) - read
+            if length > 0:
+                if write != read:
+                    audio_data[write:write + length] = audio_data[read:read + length]
+                compact_starts.append(write / sr)
+                original_starts.append(read / sr)
+                write += length
+            read = int(cut_end)
+
+        if write == 0:
+            # 全体が無音の場合は除去しない
+            return audio_data, TimelineMap.identity(original_duration)
+
+        timeline = TimelineMap(compact_starts, original_starts, write / sr, original_duration)
+        logger.info(
+            f"Silence compaction: removed {timeline.removed_seconds:.1f}s "
+            f"({timeline.removed_ratio:.1%}) in {len(cut_starts)} regions"
+        )
+        return audio_data[:write], timeline
 
     def get_audio_duration(self, audio_path: str) -> float:
         """
@@ -152,10 +835,22 @@ class AudioPreprocessor:
         Returns:
             音声長（秒）
         """
-        audio_data, sample_rate = sf.read(audio_path)
-        duration = len(audio_data) / sample_rate
+        duration = self._estimate_duration(audio_path)
+        if duration == 0 and ffmpeg_decoder.should_decode(audio_path):
+            duration = len(ffmpeg_decoder.decode(audio_path, self.target_sample_rate)) / self.target_sample_rate
         return duration
 
+    def _estimate_duration(self, audio_path: str) -> float:
+        """
+        デコードせずにヘッダから音声長を求める
+
+        ffprobe が使えない圧縮形式では 0 を返す（呼び出し側でバッファを拡張する）
+        """
+        if ffmpeg_decoder.should_decode(audio_path):
+            return ffmpeg_decoder.probe_duration(audio_path) or 0.0
+        info = sf.info(audio_path)
+        return info.frames / info.samplerate
+
 
 # シングルトンインスタンス
 audio_preprocessor = AudioPreprocessor()
@@ -0,0 +1,191 @@
+"""
+音声品質分析サービス
+
+ファイル全体から間引いて読んだ短い区間だけで SNR・音量・クリッピングを推定し、
+ジョブごとにノイズ除去・音量正規化が必要かを判定する
+"""
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..core.config import settings
+from .audio_decoder import ffmpeg_decoder
+from .resampler import resample
+
+logger = logging.getLogger(__name__)
+
+# 分析用フレーム長（秒）
+ANALYSIS_FRAME_SECONDS = 0.03
+
+
+@dataclass
+class SignalQuality:
+    """音声品質の推定値"""
+    snr_db: float  # 発話レベルとノイズフロアの差（dB）
+    loudness_db: float  # 発話区間の平均レベル（dBFS）
+    noise_floor_db: float  # ノイズフロア（dBFS）
+    peak: float  # サンプルの最大振幅
+    clipping_ratio: float  # クリップしたサンプルの割合
+    sampled_seconds: float  # 分析に使った音声長（秒）
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class PreprocessingDecision:
+    """ジョブごとの前処理の要否"""
+    apply_noise_reduction: bool
+    normalize_audio: bool
+    reasons: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SignalQualityAnalyzer:
+    """音声品質分析クラス"""
+
+    def analyze_file(self, path: str) -> SignalQuality:
+        """
+        音声ファイルを間引いて読み、品質を推定
+
+        Args:
+            path: 音声ファイルパス
+
+        Returns:
+            品質の推定値
+        """
+        samples, sample_rate = self.read_samples(path)
+        return self.analyze(samples, sample_rate)
+
+    def read_samples(self, path: str, sample_rate: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        ファイル全体から等間隔に短い区間を読み、連結して返す
+
+        ファイル全体に等間隔で QUALITY_SAMPLE_WINDOWS 個の区間を取り、
+        その区間だけをデコードする。圧縮形式は ffmpeg の入力側シークを使う。
+
+        Args:
+            path: 音声ファイルパス
+            sample_rate: 出力サンプリングレート（省略時はファイルのまま）
+
+        Returns:
+            (モノラル音声データ, サンプリングレート)
+        """
+        windows = settings.QUALITY_SAMPLE_WINDOWS
+        window_seconds = settings.QUALITY_SAMPLE_WINDOW_SECONDS
+
+        if ffmpeg_decoder.should_decode(path):
+            sample_rate = sample_rate or 16000
+            duration = ffmpeg_decoder.probe_duration(path)
+            if duration is None:
+                # 音声長が分からない場合は先頭から連続で読む
+                samples = [ffmpeg_decoder.decode(path, sample_rate, start=0, duration=windows * window_seconds)]
+            else:
+                samples = [
+                    ffmpeg_decoder.decode(path, sample_rate, start=float(start), duration=window_seconds)
+                    for start in np.linspace(0, max(duration - window_seconds, 0), windows)
+                ]
+        else:
+            with sf.SoundFile(path) as f:
+                native_rate = f.samplerate
+                window = int(window_seconds * native_rate)
+                samples = []
+                for start in np.linspace(0, max(f.frames - window, 0), windows).astype(int):
+                    f.seek(int(start))
+                    block = f.read(window, dtype="float32", always_2d=True).mean(axis=1)
+                    if sample_rate and sample_rate != native_rate:
+                        block = resample(block, native_rate, sample_rate)
+                    samples.append(block)
+            sample_rate = sample_rate or native_rate
+
+        if not samples:
+            return np.empty(0, dtype=np.float32), sample_rate
+        return np.concatenate(samples), sample_rate
+
+    def analyze(self, audio_data: np.ndarray, sample_rate: int) -> SignalQuality:
+        """
+        音声データから品質を推定
+
+        Args:
+            audio_data: モノラル音声データ
+            sample_rate: サンプリングレート
+
+        Returns:
+            品質の推定値
+        """
+        frame = int(sample_rate * ANALYSIS_FRAME_SECONDS)
+        n_frames = len(audio_data) // frame
+        if n_frames == 0:
+            return SignalQuality(0.0, -120.0, -120.0, 0.0, 0.0, len(audio_data) / sample_rate)
+
+        frames = audio_data[:n_frames * frame].reshape(n_frames, frame)
+        energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame
+        energy_db = 10 * np.log10(energy + 1e-12)
+
+        noise_floor = float(np.percentile(energy_db, 10))
+        speech_level = float(np.percentile(energy_db, 90))
+
+        # 発話レベルから 20dB 以内のフレームを発話区間とみなして平均レベルを求める
+        active = energy[energy_db > speech_level - 20.0]
+        loudness = float(10 * np.log10(np.mean(active) + 1e-12))
+
+        magnitude = np.abs(audio_data)
+        return SignalQuality(
+            snr_db=speech_level - noise_floor,
+            loudness_db=loudness,
+            noise_floor_db=noise_floor,
+            peak=float(magnitude.max()),
+            clipping_ratio=float(np.count_nonzero(magnitude >= 0.99) / len(audio_data)),
+            sampled_seconds=len(audio_data) / sample_rate
+        )
+
+    def decide(self, quality: SignalQuality) -> PreprocessingDecision:
+        """
+        品質の推定値から前処理の要否を判定
+
+        - ノイズ除去: SNR が QUALITY_MIN_SNR_DB 未満の場合のみ
+        - 音量正規化: 発話レベルが許容範囲外の場合のみ。ただしクリップしたサンプルの割合が
+          QUALITY_MAX_CLIPPING_RATIO を超える場合は、発話レベルが低くても音量を上げない
+          （クリップによる歪みを増幅するだけで認識精度が上がらないため）
+        """
+        reasons = []
+
+        apply_noise_reduction = quality.snr_db < settings.QUALITY_MIN_SNR_DB
+        reasons.append(
+            f"SNR {quality.snr_db:.1f}dB "
+            f"{'<' if apply_noise_reduction else '>='} {settings.QUALITY_MIN_SNR_DB:.1f}dB"
+        )
+
+        in_range = settings.QUALITY_LOUDNESS_MIN_DB <= quality.loudness_db <= settings.QUALITY_LOUDNESS_MAX_DB
+        normalize_audio = not in_range
+        reasons.append(
+            f"loudness {quality.loudness_db:.1f}dBFS "
+            f"{'within' if in_range else 'outside'} "
+            f"[{settings.QUALITY_LOUDNESS_MIN_DB:.0f}, {settings.QUALITY_LOUDNESS_MAX_DB:.0f}]dBFS"
+        )
+
+        if quality.clipping_ratio > settings.QUALITY_MAX_CLIPPING_RATIO:
+            reasons.append(f"clipping detected ({quality.clipping_ratio:.2%} of samples)")
+            if quality.loudness_db < settings.QUALITY_LOUDNESS_MIN_DB:
+                normalize_audio = False
+                reasons.append("gain boost skipped on clipped audio")
+
+        decision = PreprocessingDecision(
+            apply_noise_reduction=apply_noise_reduction,
+            normalize_audio=normalize_audio,
+            reasons=reasons
+        )
+        logger.info(
+            f"Preprocessing decision: noise_reduction={apply_noise_reduction}, "
+            f"normalize={normalize_audio} ({'; '.join(reasons)})"
+        )
+        return decision
+
+
+# シングルトンインスタンス
+signal_quality_analyzer = SignalQualityAnalyzer()
@@ -0,0 +1,156 @@
+"""
+書き起こしチェックポイントサービス
+
+長時間の書き起こし中に、確定したセグメントと書き起こし済みの位置を RAM ディスクへ定期的に保存する。
+ワーカーのクラッシュ・OOM・ソフトタイムアウト後に再投入されたタスクは、
+最後のチェックポイントの位置から書き起こしを再開する。
+"""
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.config import settings
+from ..models.transcription import TranscriptSegment
+
+if TYPE_CHECKING:
+    # 実行時は読み込まない（numpy・noisereduce を書き起こし以外のプロセスで読み込まないため）
+    from .audio_preprocessing import TimelineMap
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TranscriptionCheckpoint:
+    """
+    書き起こしの途中経過
+
+    offset は無音除去後の時刻（Whisper に渡す音声の時間軸）で、
+    segments は元音声の時刻に戻したセグメント。
+    """
+    key: str
+    source: Dict[str, int]  # 元音声ファイルの識別情報（サイズ・更新時刻）
+    attempts: int = 0  # このチェックポイントから開始した実行回数
+    offset: float = 0.0  # 書き起こし済みの位置（秒、無音除去後の時刻）
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+    transcribe_time: float = 0.0  # これまでの実行で書き起こしに費やした時間（秒）
+    updated_at: Optional[str] = None
+
+    @property
+    def transcript_segments(self) -> List[TranscriptSegment]:
+        return [TranscriptSegment(**segment) for segment in self.segments]
+
+
+class CheckpointStore:
+    """チェックポイントの保存先（RAM ディスク上の JSON ファイル）"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(settings.RAMDISK_PATH, "checkpoints")
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def begin(self, key: str, audio_path: str) -> TranscriptionCheckpoint:
+        """
+        実行開始時にチェックポイントを取得（なければ作成）し、実行回数を加算して保存
+
+        元音声が差し替えられている場合は古いチェックポイントを破棄して最初から書き起こす。
+
+        Args:
+            key: チェックポイントのキー（書き起こしID、トラックの場合はトラック番号付き）
+            audio_path: 元音声ファイルパス
+
+        Returns:
+            今回の実行で使うチェックポイント
+        """
+        source = self._fingerprint(audio_path)
+        checkpoint = self.load(key)
+        if checkpoint is not None and checkpoint.source != source:
+            logger.warning(f"Discarding checkpoint {key}: source audio changed")
+            checkpoint = None
+        if checkpoint is None:
+            checkpoint = TranscriptionCheckpoint(key=key, source=source)
+        elif checkpoint.offset > 0:
+            logger.info(
+                f"Resuming {key} from {checkpoint.offset:.1f}s "
+                f"({len(checkpoint.segments)} segments, attempt {checkpoint.attempts + 1})"
+            )
+
+        checkpoint.attempts += 1
+        self.save(checkpoint)
+        return checkpoint
+
+    def load(self, key: str) -> Optional[TranscriptionCheckpoint]:
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return TranscriptionCheckpoint(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {key}: {e}")
+            return None
+
+    def save(self, checkpoint: TranscriptionCheckpoint) -> None:
+        """一時ファイルに書いてから置き換える（書き込み中に落ちても前回分が残る）"""
+        checkpoint.updated_at = datetime.utcnow().isoformat()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(checkpoint.key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(checkpoint), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _fingerprint(self, audio_path: str) -> Dict[str, int]:
+        stat = os.stat(audio_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class CheckpointWriter:
+    """
+    書き起こし中のチェックポイント更新
+
+    確定したセグメントを追加し、TRANSCRIPTION_CHECKPOINT_INTERVAL 秒ごとに保存する。
+    例外発生時は save() で直前までの結果を保存してから再送出する。
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        checkpoint: TranscriptionCheckpoint,
+        timeline: Optional["TimelineMap"] = None
+    ):
+        self.store = store
+        self.checkpoint = checkpoint
+        self.timeline = timeline
+        self._started = time.monotonic()
+        self._base_transcribe_time = checkpoint.transcribe_time
+        self._last_save = self._started
+
+    def add(self, segment: TranscriptSegment) -> None:
+        """確定したセグメントを追加（間隔が空いていれば保存）"""
+        end = self.timeline.to_compact(segment.end) if self.timeline is not None else segment.end
+        self.checkpoint.segments.append(segment.model_dump())
+        self.checkpoint.offset = max(self.checkpoint.offset, end)
+        if time.monotonic() - self._last_save >= settings.TRANSCRIPTION_CHECKPOINT_INTERVAL:
+            self.save()
+
+    def save(self) -> None:
+        self._last_save = time.monotonic()
+        self.checkpoint.transcribe_time = self._base_transcribe_time + (self._last_save - self._started)
+        try:
+            self.store.save(self.checkpoint)
+        except OSError as e:
+            logger.warning(f"Failed to save checkpoint {self.checkpoint.key}: {e}")
+
+
+# シングルトンインスタンス
+checkpoint_store = CheckpointStore()
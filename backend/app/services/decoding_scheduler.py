@@ -0,0 +1,222 @@
+"""
+デコード設定スケジューラ
+
+ジョブごとに音声長・キューの待ちジョブ数・ワーカーの実測処理速度から
+処理時間の目標（TARGET_PROCESSING_RATIO）に収まるデコード設定を選ぶ。
+精度の高い設定から順に予測処理時間を求め、予算内に収まる最初の設定を使う。
+"""
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DecodingProfile:
+    """Whisper のデコード設定"""
+    name: str
+    beam_size: int
+    best_of: int
+    patience: float
+    temperature: List[float] = field(default_factory=lambda: [0.0])
+    batch_size: int = 8
+    relative_cost: float = 1.0  # 実測前の処理時間の見積もり（最も精度の高い設定を 1.0 とする）
+
+    @classmethod
+    def from_settings(cls) -> "DecodingProfile":
+        """WHISPER_* 設定そのままのデコード設定"""
+        return cls(
+            name="default",
+            beam_size=settings.WHISPER_BEAM_SIZE,
+            best_of=settings.WHISPER_BEAM_SIZE,
+            patience=settings.WHISPER_PATIENCE,
+            temperature=list(settings.WHISPER_TEMPERATURE),
+            batch_size=settings.WHISPER_BATCH_SIZE
+        )
+
+    @classmethod
+    def greedy(cls, batch_size: Optional[int] = None) -> "DecodingProfile":
+        """2段階デコードの1パス目（beam 1・温度フォールバックなし）"""
+        return cls(
+            name="greedy",
+            beam_size=1,
+            best_of=1,
+            patience=1.0,
+            temperature=[0.0],
+            batch_size=batch_size or settings.WHISPER_BATCH_SIZE,
+            relative_cost=0.3
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def default_profiles() -> List[DecodingProfile]:
+    """精度の高い順のデコード設定（先頭は WHISPER_* 設定と同じ）"""
+    accurate = DecodingProfile.from_settings()
+    accurate.name = "accurate"
+    return [
+        accurate,
+        DecodingProfile(
+            name="balanced",
+            beam_size=min(3, settings.WHISPER_BEAM_SIZE),
+            best_of=min(3, settings.WHISPER_BEAM_SIZE),
+            patience=1.0,
+            temperature=[0.0, 0.4],
+            batch_size=settings.WHISPER_BATCH_SIZE,
+            relative_cost=0.7
+        ),
+        DecodingProfile(
+            name="fast",
+            beam_size=1,
+            best_of=1,
+            patience=1.0,
+            temperature=[0.0, 0.4],
+            batch_size=settings.WHISPER_BATCH_SIZE * 2,
+            relative_cost=0.45
+        ),
+        DecodingProfile(
+            name="fastest",
+            beam_size=1,
+            best_of=1,
+            patience=1.0,
+            temperature=[0.0],  # 温度フォールバックなし
+            batch_size=settings.WHISPER_BATCH_SIZE * 2,
+            relative_cost=0.35
+        ),
+    ]
+
+
+@dataclass
+class DecodingPlan:
+    """ジョブに割り当てたデコード設定と、その根拠"""
+    profile: DecodingProfile
+    audio_seconds: float  # Whisper に渡す音声長（秒、無音除去後）
+    budget_seconds: float  # 書き起こしに使える時間（秒）
+    predicted_seconds: float  # 選んだ設定での予測処理時間（秒）
+    queue_depth: int
+    speed_ratio: float  # 選んだ設定の実測処理速度（処理時間 / 音声長）
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.to_dict(),
+            "audio_seconds": self.audio_seconds,
+            "budget_seconds": self.budget_seconds,
+            "predicted_seconds": self.predicted_seconds,
+            "queue_depth": self.queue_depth,
+            "speed_ratio": self.speed_ratio,
+        }
+
+
+class DecodingScheduler:
+    """
+    処理時間の目標に合わせたデコード設定の選択
+
+    処理速度（処理時間 / 音声長）は設定ごとに指数移動平均で学習する。
+    実測前は DECODING_INITIAL_SPEED_RATIO（最も精度の高い設定での見積もり）× relative_cost を使う。
+    ワーカープロセスごとの値なので、GPU の違いはそのまま反映される。
+    """
+
+    def __init__(self, profiles: Optional[List[DecodingProfile]] = None):
+        self.profiles = profiles or default_profiles()
+        self._speed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+
+    def speed_ratio(self, profile: DecodingProfile) -> float:
+        """設定の処理速度（処理時間 / 音声長、未実測の設定は実測済みの設定から relative_cost で換算）"""
+        with self._lock:
+            if profile.name in self._speed:
+                return self._speed[profile.name]
+            measured = [
+                self._speed[p.name] / p.relative_cost
+                for p in self.profiles if p.name in self._speed
+            ]
+        base = sum(measured) / len(measured) if measured else settings.DECODING_INITIAL_SPEED_RATIO
+        return base * profile.relative_cost
+
+    def queue_depth(self, queue: str) -> int:
+        """ブローカー（Redis）上の待ちジョブ数（取得できない場合は 0）"""
+        try:
+            if self._redis is None:
+                self._redis = redis.Redis.from_url(settings.REDIS_URL)
+            return int(self._redis.llen(queue))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read queue depth: {e}")
+            return 0
+
+    def plan(
+        self,
+        audio_duration: float,
+        audio_seconds: float,
+        elapsed: float = 0.0,
+        queue_depth: int = 0
+    ) -> DecodingPlan:
+        """
+        ジョブのデコード設定を選ぶ
+
+        予算 = 元音声長 × TARGET_PROCESSING_RATIO − 経過時間（前処理など）を、
+        待ちジョブ数に応じて縮めたもの（後続のジョブの目標も守るため）。
+
+        Args:
+            audio_duration: 元音声の長さ（秒、目標処理時間の基準）
+            audio_seconds: Whisper に渡す音声長（秒、無音除去後）
+            elapsed: ジョブ開始からの経過時間（秒）
+            queue_depth: キューの待ちジョブ数
+
+        Returns:
+            選んだ設定と予測値（予算内に収まる設定がない場合は最も速い設定）
+        """
+        budget = audio_duration * settings.TARGET_PROCESSING_RATIO - elapsed
+        budget /= 1.0 + settings.DECODING_QUEUE_PRESSURE * queue_depth
+
+        chosen = None
+        for profile in self.profiles:
+            ratio = self.speed_ratio(profile)
+            chosen = (profile, ratio)
+            if audio_seconds * ratio <= budget:
+                break
+
+        profile, ratio = chosen
+        plan = DecodingPlan(
+            profile=profile,
+            audio_seconds=audio_seconds,
+            budget_seconds=budget,
+            predicted_seconds=audio_seconds * ratio,
+            queue_depth=queue_depth,
+            speed_ratio=ratio
+        )
+        logger.info(
+            f"Decoding profile '{profile.name}': predicted {plan.predicted_seconds:.1f}s "
+            f"for {audio_seconds:.1f}s of audio (budget {budget:.1f}s, queue depth {queue_depth})"
+        )
+        return plan
+
+    def record(self, profile: DecodingProfile, audio_seconds: float, decode_seconds: float) -> float:
+        """
+        実測した処理時間で処理速度を更新
+
+        Returns:
+            今回の処理速度（処理時間 / 音声長）
+        """
+        if audio_seconds <= 0:
+            return 0.0
+        ratio = decode_seconds / audio_seconds
+        with self._lock:
+            previous = self._speed.get(profile.name)
+            if previous is None:
+                self._speed[profile.name] = ratio
+            else:
+                alpha = settings.DECODING_SPEED_SMOOTHING
+                self._speed[profile.name] = (1 - alpha) * previous + alpha * ratio
+        return ratio
+
+
+# シングルトンインスタンス
+decoding_scheduler = DecodingScheduler()
@@ -0,0 +1,131 @@
+"""
+分散書き起こし
+
+1つの長時間録音を発話区間の切れ目で区切ったチャンクに分け、チャンクごとの書き起こしを
+複数のワーカーで並列に実行する（Celery の chord でファンアウト・ファンイン）。
+
+チャンク境界が発話の途中になる場合に備え、各チャンクは前後を TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+だけ重ねて書き起こす。統合時は各チャンクが担当する範囲（重なりを除いた範囲）に中点が入る
+セグメントだけを残し、境界をまたいで重複したセグメントを取り除く。
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models.transcription import TranscriptSegment
+from .loop_detector import normalize_text
+
+# 重複とみなす時間の重なり（短い方のセグメント長に対する割合）
+_DUPLICATE_OVERLAP_RATIO = 0.5
+
+
+@dataclass
+class TranscriptionChunk:
+    """
+    書き起こしのチャンク（時刻は無音除去後の音声上の秒）
+
+    start〜end を書き起こし、owned_start〜owned_end に中点が入るセグメントを採用する。
+    """
+    index: int
+    start: float
+    end: float
+    owned_start: float
+    owned_end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def plan_chunks(
+    speech: Sequence[Tuple[float, float]],
+    duration: float,
+    chunk_seconds: float,
+    overlap_seconds: float
+) -> List[TranscriptionChunk]:
+    """
+    発話区間の切れ目でチャンクに分割
+
+    連続する発話区間を chunk_seconds を超えない範囲にまとめ、まとまりの間の無音の中点を境界にする。
+    発話が検出されない区間が chunk_seconds より長い場合は、その区間の中を chunk_seconds ごとに区切る。
+
+    Args:
+        speech: 発話区間 [(開始秒, 終了秒), ...]（時刻順）
+        duration: 音声長（秒）
+        chunk_seconds: 1チャンクの目安の長さ（秒）
+        overlap_seconds: 隣のチャンクと重ねる長さ（秒）
+
+    Returns:
+        チャンクのリスト（音声全体を隙間なく覆う）
+    """
+    boundaries = [0.0]
+    previous_end: Optional[float] = None
+    # 末尾の無音も区切れるよう、音声の終端を長さ0の発話区間として扱う
+    for start, end in [*speech, (duration, duration)]:
+        while (
+            start - boundaries[-1] > chunk_seconds
+            and boundaries[-1] + chunk_seconds >= (previous_end or 0.0)
+        ):
+            boundaries.append(boundaries[-1] + chunk_seconds)
+        if previous_end is not None and end - boundaries[-1] > chunk_seconds:
+            cut = (previous_end + start) / 2
+            if boundaries[-1] < cut < duration:
+                boundaries.append(cut)
+        previous_end = end
+    boundaries.append(duration)
+
+    return [
+        TranscriptionChunk(
+            index=i,
+            start=max(owned_start - overlap_seconds, 0.0),
+            end=min(owned_end + overlap_seconds, duration),
+            owned_start=owned_start,
+            owned_end=owned_end
+        )
+        for i, (owned_start, owned_end) in enumerate(zip(boundaries[:-1], boundaries[1:]))
+    ]
+
+
+def merge_chunk_segments(
+    chunk_segments: Sequence[Tuple[TranscriptionChunk, List[TranscriptSegment]]],
+    timeline=None
+) -> Tuple[List[TranscriptSegment], int]:
+    """
+    チャンクごとの書き起こし結果を時刻順に統合
+
+    Args:
+        chunk_segments: [(チャンク, そのチャンクのセグメント（元音声の時刻）), ...]
+        timeline: 無音除去の対応表（チャンクの範囲を元音声の時刻に変換する）
+
+    Returns:
+        (統合したセグメント, 重なりのため除いたセグメント数)
+    """
+    def to_original(t: float, is_end: bool = False) -> float:
+        return timeline.to_original(t, is_end=is_end) if timeline is not None else t
+
+    ordered = sorted(chunk_segments, key=lambda item: item[0].index)
+    merged: List[TranscriptSegment] = []
+    dropped = 0
+    for position, (chunk, segments) in enumerate(ordered):
+        # 最初・最後のチャンクは音声の端までを担当する
+        owned_start = to_original(chunk.owned_start) if position > 0 else float("-inf")
+        owned_end = to_original(chunk.owned_end, is_end=True) if position < len(ordered) - 1 else float("inf")
+        for segment in sorted(segments, key=lambda seg: (seg.start, seg.end)):
+            middle = (segment.start + segment.end) / 2
+            if not owned_start <= middle < owned_end or (merged and _is_duplicate(merged[-1], segment)):
+                dropped += 1
+                continue
+            merged.append(segment)
+    return merged, dropped
+
+
+def _is_duplicate(previous: TranscriptSegment, segment: TranscriptSegment) -> bool:
+    """境界をまたいで両方のチャンクで書き起こされた同じ発話か"""
+    overlap = min(previous.end, segment.end) - max(previous.start, segment.start)
+    shorter = min(previous.end - previous.start, segment.end - segment.start)
+    if shorter <= 0 or overlap / shorter < _DUPLICATE_OVERLAP_RATIO:
+        return False
+    a, b = normalize_text(previous.text), normalize_text(segment.text)
+    return bool(a and b) and (a in b or b in a)
@@ -0,0 +1,348 @@
+"""
+待ち時間・完了時刻の予測
+
+ワーカーごとの処理速度（処理時間 / 音声長）をジョブの完了ごとに指数移動平均で学習し、
+ジョブスケジューラの実行中・待ちジョブを優先順に実行枠（JOB_SCHEDULER_MAX_RUNNING）へ
+割り当てて、各ジョブの待ち順位と開始・完了の予測時刻を求める。
+
+投入時の予測を実際の開始・完了時刻と比較して誤差を集計し、予測の精度を確認できるようにする。
+"""
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import redis
+
+from ..core.config import settings
+from .job_scheduler import JobScheduler, ScheduledJob, job_scheduler
+
+logger = logging.getLogger(__name__)
+
+# 投入前の見積もりに使う仮のジョブID
+_CANDIDATE_JOB_ID = "(new)"
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.utcfromtimestamp(timestamp).isoformat()
+
+
+@dataclass
+class WorkerSpeed:
+    """ワーカーの処理速度"""
+    worker: str  # ワーカーのホスト名
+    ratio: float  # 処理時間 / 音声長（指数移動平均）
+    jobs: int  # 学習に使ったジョブ数
+    updated_at: float  # 最後に完了したジョブの時刻（time.time()）
+
+
+@dataclass
+class JobEstimate:
+    """ジョブの開始・完了の予測"""
+    job_id: str
+    state: str  # pending / running
+    position: int  # 待ち順位（1 が次に投入されるジョブ、実行中は 0）
+    audio_duration: float
+    estimated_start: float  # 予測開始時刻（time.time()、実行中は投入時刻）
+    estimated_finish: float  # 予測完了時刻（time.time()）
+    speed_ratio: float  # 予測に使った処理速度
+
+    def to_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = now if now is not None else time.time()
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "position": self.position,
+            "audio_duration": self.audio_duration,
+            "estimated_start_at": _isoformat(self.estimated_start),
+            "estimated_finish_at": _isoformat(self.estimated_finish),
+            "seconds_until_start": max(self.estimated_start - now, 0.0),
+            "seconds_until_finish": max(self.estimated_finish - now, 0.0),
+            "speed_ratio": self.speed_ratio,
+        }
+
+
+def simulate_queue(
+    running: Sequence[Tuple[ScheduledJob, float]],
+    pending: Sequence[ScheduledJob],
+    slot_ratios: Sequence[float],
+    now: float
+) -> List[JobEstimate]:
+    """
+    実行中・待ちジョブを実行枠に割り当てて開始・完了時刻を予測
+
+    実行中のジョブは投入時刻 + 音声長 × 処理速度で終わるものとし（超過している場合は今すぐ終わるものとする）、
+    待ちジョブは優先順に最も早く空く実行枠へ割り当てる。
+
+    Args:
+        running: 実行中のジョブと投入時刻（投入の早い順）
+        pending: 待ちジョブ（優先度の高い順）
+        slot_ratios: 実行枠ごとの処理速度
+        now: 現在時刻（time.time()）
+
+    Returns:
+        実行中のジョブ、待ちジョブの順の予測
+    """
+    free_at = [now] * len(slot_ratios)
+    estimates: List[JobEstimate] = []
+    for job, started_at in running:
+        slot = free_at.index(min(free_at))
+        ratio = slot_ratios[slot]
+        finish = max(started_at + job.audio_duration * ratio, now)
+        free_at[slot] = max(free_at[slot], finish)
+        estimates.append(JobEstimate(job.job_id, "running", 0, job.audio_duration, started_at, finish, ratio))
+
+    for position, job in enumerate(pending, start=1):
+        slot = free_at.index(min(free_at))
+        ratio = slot_ratios[slot]
+        start = free_at[slot]
+        free_at[slot] = start + job.audio_duration * ratio
+        estimates.append(JobEstimate(
+            job.job_id, "pending", position, job.audio_duration, start, free_at[slot], ratio
+        ))
+    return estimates
+
+
+class EtaEstimator:
+    """
+    ワーカーの処理速度の学習と、待ちジョブの開始・完了時刻の予測
+
+    Redis 上のキー:
+    - eta:workers: ワーカーごとの処理速度（ホスト名 → JSON）
+    - eta:prediction:{書き起こしID}: 投入時の予測と実際の開始時刻（ETA_PREDICTION_TTL 付き）
+    - eta:accuracy: 予測と実績の誤差の累計
+    - eta:recent: 直近の予測と実績（JSON、新しい順に ETA_RECENT_PREDICTIONS 件）
+    """
+
+    PREFIX = "eta"
+
+    def __init__(self, redis_url: Optional[str] = None, scheduler: Optional[JobScheduler] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.scheduler = scheduler or job_scheduler
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url)
+        return self._client
+
+    def workers(self) -> List[WorkerSpeed]:
+        """ETA_WORKER_TTL 以内にジョブを完了したワーカーの処理速度（速い順）"""
+        active_after = time.time() - settings.ETA_WORKER_TTL
+        workers = [
+            WorkerSpeed(**json.loads(raw))
+            for raw in self.client.hvals(self._workers_key)
+        ]
+        return sorted(
+            (worker for worker in workers if worker.updated_at >= active_after),
+            key=lambda worker: worker.ratio
+        )
+
+    def slot_ratios(self) -> List[float]:
+        """実行枠ごとの処理速度（実績のあるワーカーを速い順に割り当て、実績がなければ ETA_INITIAL_RATIO）"""
+        ratios = [worker.ratio for worker in self.workers()] or [settings.ETA_INITIAL_RATIO]
+        return [ratios[i % len(ratios)] for i in range(max(settings.JOB_SCHEDULER_MAX_RUNNING, 1))]
+
+    def estimate_queue(self, now: Optional[float] = None) -> List[JobEstimate]:
+        """ジョブスケジューラの実行中・待ちジョブ全体の予測"""
+        now = now if now is not None else time.time()
+        return simulate_queue(self.scheduler.running(), self.scheduler.pending(), self.slot_ratios(), now)
+
+    def estimate_job(self, job_id: str) -> Optional[JobEstimate]:
+        """ジョブの予測（実行中・待ちジョブでない場合は None）"""
+        return next((estimate for estimate in self.estimate_queue() if estimate.job_id == job_id), None)
+
+    def estimate_new(self, audio_duration: float, plan: str) -> JobEstimate:
+        """
+        これから投入するジョブの見積もり（今投入した場合の待ち順位と開始・完了時刻）
+
+        JOB_SCHEDULER_ENABLED でない場合は待ちジョブを把握できないため、すぐに開始するものとして見積もる。
+
+        Args:
+            audio_duration: 音声長（秒）
+            plan: PlanType の値
+
+        Returns:
+            見積もり（job_id は "(new)"）
+        """
+        now = time.time()
+        candidate = ScheduledJob(
+            job_id=_CANDIDATE_JOB_ID,
+            plan=plan,
+            audio_duration=audio_duration,
+            enqueued_at=now
+        )
+        pending = sorted(self.scheduler.pending() + [candidate], key=lambda job: job.priority(now))
+        estimates = simulate_queue(self.scheduler.running(), pending, self.slot_ratios(), now)
+        return next(estimate for estimate in estimates if estimate.job_id == _CANDIDATE_JOB_ID)
+
+    def record_prediction(self, job_id: str) -> Optional[JobEstimate]:
+        """
+        投入したジョブの予測を記録（完了時に実績と比較する）
+
+        Returns:
+            記録した予測（ジョブスケジューラに登録されていない・Redis に接続できない場合は None）
+        """
+        now = time.time()
+        try:
+            estimate = next((e for e in self.estimate_queue(now) if e.job_id == job_id), None)
+            if estimate is None:
+                return None
+            key = self._prediction_key(job_id)
+            pipe = self.client.pipeline()
+            pipe.hset(key, mapping={
+                "submitted_at": now,
+                "predicted_start": estimate.estimated_start,
+                "predicted_finish": estimate.estimated_finish,
+                "audio_duration": estimate.audio_duration,
+            })
+            pipe.expire(key, settings.ETA_PREDICTION_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record ETA prediction for {job_id}: {e}")
+            return None
+        logger.info(
+            f"Predicted {job_id}: start in {estimate.estimated_start - now:.0f}s, "
+            f"finish in {estimate.estimated_finish - now:.0f}s (position {estimate.position})"
+        )
+        return estimate
+
+    def record_start(self, job_id: str) -> None:
+        """ジョブが実行枠に投入された時刻を記録"""
+        key = self._prediction_key(job_id)
+        try:
+            if self.client.exists(key):
+                self.client.hset(key, "started_at", time.time())
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record start of {job_id}: {e}")
+
+    def record_completion(
+        self,
+        job_id: str,
+        audio_duration: float,
+        processing_time: float,
+        worker: Optional[str] = None
+    ) -> None:
+        """
+        完了したジョブで処理速度を学習し、投入時の予測と実績を比較
+
+        Args:
+            job_id: 書き起こしID
+            audio_duration: 音声長（秒）
+            processing_time: ジョブの処理時間（秒）
+            worker: 書き起こしたワーカーのホスト名（複数のワーカーで分担した場合は None、処理速度は学習しない）
+        """
+        try:
+            if worker and audio_duration > 0:
+                self._update_worker(worker, processing_time / audio_duration)
+            self._record_accuracy(job_id)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record completion of {job_id} for ETA: {e}")
+
+    def accuracy(self) -> Dict[str, Any]:
+        """
+        予測と実績の誤差
+
+        完了までの時間（投入〜完了）の平均絶対誤差・平均誤差（正なら予測より遅い）・実績に対する相対誤差と、
+        開始までの時間（投入〜実行枠への投入）の平均絶対誤差
+        """
+        raw = {k.decode(): float(v) for k, v in self.client.hgetall(self._accuracy_key).items()}
+        jobs = int(raw.get("jobs", 0))
+        started = int(raw.get("started_jobs", 0))
+        return {
+            "jobs": jobs,
+            "finish_mean_abs_error_seconds": raw.get("finish_abs_error", 0.0) / jobs if jobs else None,
+            "finish_mean_error_seconds": raw.get("finish_error", 0.0) / jobs if jobs else None,
+            "finish_mean_abs_relative_error": raw.get("finish_abs_relative_error", 0.0) / jobs if jobs else None,
+            "start_mean_abs_error_seconds": raw.get("start_abs_error", 0.0) / started if started else None,
+            "recent": [
+                json.loads(entry)
+                for entry in self.client.lrange(self._recent_key, 0, settings.ETA_RECENT_PREDICTIONS - 1)
+            ],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """ワーカーの処理速度・待ちジョブの予測・予測の精度"""
+        now = time.time()
+        return {
+            "workers": [asdict(worker) for worker in self.workers()],
+            "slot_ratios": self.slot_ratios(),
+            "queue": [estimate.to_dict(now) for estimate in self.estimate_queue(now)],
+            "accuracy": self.accuracy(),
+        }
+
+    def _update_worker(self, worker: str, ratio: float) -> None:
+        raw = self.client.hget(self._workers_key, worker)
+        speed = WorkerSpeed(worker=worker, ratio=ratio, jobs=0, updated_at=time.time())
+        if raw is not None:
+            previous = WorkerSpeed(**json.loads(raw))
+            alpha = settings.ETA_SMOOTHING
+            speed.ratio = (1 - alpha) * previous.ratio + alpha * ratio
+            speed.jobs = previous.jobs
+        speed.jobs += 1
+        self.client.hset(self._workers_key, worker, json.dumps(asdict(speed)))
+        logger.info(f"Worker {worker} processing ratio {ratio:.3f} (smoothed {speed.ratio:.3f})")
+
+    def _record_accuracy(self, job_id: str) -> None:
+        key = self._prediction_key(job_id)
+        prediction = {k.decode(): float(v) for k, v in self.client.hgetall(key).items()}
+        if not prediction:
+            return
+
+        now = time.time()
+        submitted_at = prediction["submitted_at"]
+        predicted_turnaround = prediction["predicted_finish"] - submitted_at
+        actual_turnaround = now - submitted_at
+        error = actual_turnaround - predicted_turnaround
+        entry = {
+            "job_id": job_id,
+            "audio_duration": prediction["audio_duration"],
+            "predicted_wait_seconds": prediction["predicted_start"] - submitted_at,
+            "actual_wait_seconds": (
+                prediction["started_at"] - submitted_at if "started_at" in prediction else None
+            ),
+            "predicted_turnaround_seconds": predicted_turnaround,
+            "actual_turnaround_seconds": actual_turnaround,
+            "error_seconds": error,
+            "completed_at": _isoformat(now),
+        }
+
+        pipe = self.client.pipeline()
+        pipe.hincrby(self._accuracy_key, "jobs", 1)
+        pipe.hincrbyfloat(self._accuracy_key, "finish_error", error)
+        pipe.hincrbyfloat(self._accuracy_key, "finish_abs_error", abs(error))
+        pipe.hincrbyfloat(self._accuracy_key, "finish_abs_relative_error", abs(error) / max(actual_turnaround, 1.0))
+        if entry["actual_wait_seconds"] is not None:
+            start_error = entry["actual_wait_seconds"] - entry["predicted_wait_seconds"]
+            pipe.hincrby(self._accuracy_key, "started_jobs", 1)
+            pipe.hincrbyfloat(self._accuracy_key, "start_abs_error", abs(start_error))
+        pipe.lpush(self._recent_key, json.dumps(entry))
+        pipe.ltrim(self._recent_key, 0, settings.ETA_RECENT_PREDICTIONS - 1)
+        pipe.delete(key)
+        pipe.execute()
+        logger.info(
+            f"ETA for {job_id}: predicted {predicted_turnaround:.0f}s, actual {actual_turnaround:.0f}s "
+            f"(error {error:+.0f}s)"
+        )
+
+    @property
+    def _workers_key(self) -> str:
+        return f"{self.PREFIX}:workers"
+
+    def _prediction_key(self, job_id: str) -> str:
+        return f"{self.PREFIX}:prediction:{job_id}"
+
+    @property
+    def _accuracy_key(self) -> str:
+        return f"{self.PREFIX}:accuracy"
+
+    @property
+    def _recent_key(self) -> str:
+        return f"{self.PREFIX}:recent"
+
+
+# シングルトンインスタンス
+eta_estimator = EtaEstimator()
@@ -0,0 +1,252 @@
+"""
+書き起こしジョブスケジューラ
+
+書き起こしジョブを Celery のキューへ直接投入せず、いったん待ちジョブとして Redis に登録し、
+実行中のジョブ数が JOB_SCHEDULER_MAX_RUNNING を下回ったときに優先度の高い順に投入する。
+
+優先度（小さいほど先）= 推定音声長 × DURATION_WEIGHT + プランごとのオフセット − 待ち時間 × AGING_RATE
+
+短いジョブを先に処理しつつ（shortest-job-first）、待ち時間に応じて優先度を上げることで
+長時間のセッションがいつまでも後回しにならないようにする。
+"""
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# claim のロックの有効期限・取得待ちの上限（秒）
+CLAIM_LOCK_TIMEOUT = 30
+
+
+@dataclass
+class ScheduledJob:
+    """投入待ちの書き起こしジョブ"""
+    job_id: str  # 書き起こしID
+    plan: str  # PlanType の値
+    audio_duration: float  # 推定音声長（秒）
+    enqueued_at: float  # 登録時刻（time.time()）
+    payload: Dict[str, Any] = field(default_factory=dict)  # 投入時に使う引数
+
+    def wait_seconds(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.enqueued_at
+
+    def priority(self, now: Optional[float] = None) -> float:
+        """優先度（小さいほど先に投入する）"""
+        plan_offset = settings.JOB_SCHEDULER_PLAN_OFFSETS.get(
+            self.plan, max(settings.JOB_SCHEDULER_PLAN_OFFSETS.values(), default=0.0)
+        )
+        return (
+            self.audio_duration * settings.JOB_SCHEDULER_DURATION_WEIGHT
+            + plan_offset
+            - self.wait_seconds(now) * settings.JOB_SCHEDULER_AGING_RATE
+        )
+
+
+def duration_bucket(audio_duration: float) -> str:
+    """待ち時間の集計に使う音声長の区分（例: 600-3600）"""
+    lower = 0
+    for upper in settings.JOB_SCHEDULER_DURATION_BUCKETS:
+        if audio_duration < upper:
+            return f"{lower:g}-{upper:g}"
+        lower = upper
+    return f"{lower:g}+"
+
+
+class JobScheduler:
+    """
+    プラン・音声長による書き起こしジョブの投入順の制御
+
+    Redis 上のキー:
+    - job_scheduler:pending: 待ちジョブ（書き起こしID → JSON）
+    - job_scheduler:running: 投入済みで未完了のジョブ（書き起こしID → 投入時刻）
+    - job_scheduler:running_jobs: 投入済みで未完了のジョブの内容（書き起こしID → JSON）
+    - job_scheduler:wait: 待ち時間の件数・合計（plan:{プラン} / duration:{区分} ごと）
+    - job_scheduler:wait_max: 待ち時間の最大値
+    - job_scheduler:claim_lock: claim の排他ロック
+    """
+
+    PREFIX = "job_scheduler"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url)
+        return self._client
+
+    def submit(self, job: ScheduledJob) -> None:
+        """待ちジョブとして登録"""
+        self.client.hset(self._pending_key, job.job_id, json.dumps(asdict(job), ensure_ascii=False))
+        logger.info(
+            f"Scheduled job {job.job_id} (plan {job.plan}, {job.audio_duration:.0f}s of audio)"
+        )
+
+    def pending(self) -> List[ScheduledJob]:
+        """待ちジョブを優先度の高い順に返す"""
+        now = time.time()
+        jobs = [
+            ScheduledJob(**json.loads(raw))
+            for raw in self.client.hvals(self._pending_key)
+        ]
+        return sorted(jobs, key=lambda job: job.priority(now))
+
+    def pending_count(self) -> int:
+        """待ちジョブ数"""
+        return int(self.client.hlen(self._pending_key))
+
+    def running_count(self) -> int:
+        """実行中のジョブ数（JOB_SCHEDULER_RUNNING_TIMEOUT を過ぎたものは完了扱いにする）"""
+        stale_before = time.time() - settings.JOB_SCHEDULER_RUNNING_TIMEOUT
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(self._running_key, "-inf", stale_before)
+        pipe.zcard(self._running_key)
+        _, count = pipe.execute()
+        return int(count)
+
+    def claim(self, limit: Optional[int] = None) -> List[ScheduledJob]:
+        """
+        空いている実行枠の数だけ優先度の高いジョブを取り出し、実行中として登録
+
+        実行枠の確認から実行中としての登録までを Redis のロックで排他し、
+        複数のプロセスから同時に呼ばれても JOB_SCHEDULER_MAX_RUNNING を超えて投入しない。
+
+        Args:
+            limit: 取り出す上限（省略時は JOB_SCHEDULER_MAX_RUNNING − 実行中のジョブ数）
+
+        Returns:
+            投入するジョブ（優先度の高い順）
+        """
+        lock = self.client.lock(
+            self._claim_lock_key,
+            timeout=CLAIM_LOCK_TIMEOUT,
+            blocking_timeout=CLAIM_LOCK_TIMEOUT
+        )
+        if not lock.acquire():
+            logger.warning("Timed out waiting for the job scheduler claim lock")
+            return []
+        try:
+            return self._claim_locked(limit)
+        finally:
+            try:
+                lock.release()
+            except redis.exceptions.LockError:
+                logger.warning("Job scheduler claim lock expired before release")
+
+    def _claim_locked(self, limit: Optional[int]) -> List[ScheduledJob]:
+        """claim の本体（ロック取得後に呼ぶ）"""
+        if limit is None:
+            limit = settings.JOB_SCHEDULER_MAX_RUNNING - self.running_count()
+        claimed: List[ScheduledJob] = []
+        if limit <= 0:
+            return claimed
+
+        now = time.time()
+        for job in self.pending()[:limit]:
+            pipe = self.client.pipeline()
+            pipe.hdel(self._pending_key, job.job_id)
+            pipe.zadd(self._running_key, {job.job_id: now})
+            pipe.hset(self._running_jobs_key, job.job_id, json.dumps(asdict(job), ensure_ascii=False))
+            pipe.execute()
+            self._record_wait(job, job.wait_seconds(now))
+            claimed.append(job)
+        return claimed
+
+    def running(self) -> List[Tuple[ScheduledJob, float]]:
+        """実行中のジョブと投入時刻（投入の早い順、JOB_SCHEDULER_RUNNING_TIMEOUT を過ぎたものは除く）"""
+        self.running_count()
+        started = self.client.zrange(self._running_key, 0, -1, withscores=True)
+        raw = self.client.hgetall(self._running_jobs_key)
+        jobs = [
+            (ScheduledJob(**json.loads(raw[job_id])), started_at)
+            for job_id, started_at in started
+            if job_id in raw
+        ]
+        stale = set(raw) - {job_id for job_id, _ in started}
+        if stale:
+            self.client.hdel(self._running_jobs_key, *stale)
+        return jobs
+
+    def finish(self, job_id: str) -> None:
+        """実行中のジョブから外す（完了・失敗時）"""
+        try:
+            pipe = self.client.pipeline()
+            pipe.zrem(self._running_key, job_id)
+            pipe.hdel(self._running_jobs_key, job_id)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to mark scheduled job {job_id} as finished: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """待ち・実行中のジョブ数と、プラン・音声長の区分ごとの待ち時間"""
+        pending = self.pending()
+        raw = {k.decode(): float(v) for k, v in self.client.hgetall(self._wait_key).items()}
+        maxima = {k.decode(): float(v) for k, v in self.client.zrange(self._wait_max_key, 0, -1, withscores=True)}
+
+        wait: Dict[str, Dict[str, Any]] = {"plan": {}, "duration": {}}
+        for name, count in raw.items():
+            if not name.endswith(":count"):
+                continue
+            group = name[:-len(":count")]
+            dimension, label = group.split(":", 1)
+            total = raw.get(f"{group}:total", 0.0)
+            wait[dimension][label] = {
+                "jobs": int(count),
+                "mean_seconds": total / count if count else 0.0,
+                "max_seconds": maxima.get(group, 0.0),
+            }
+
+        now = time.time()
+        return {
+            "pending": len(pending),
+            "running": self.running_count(),
+            "max_running": settings.JOB_SCHEDULER_MAX_RUNNING,
+            "oldest_pending_seconds": max((job.wait_seconds(now) for job in pending), default=0.0),
+            "wait": wait,
+        }
+
+    def _record_wait(self, job: ScheduledJob, wait_seconds: float) -> None:
+        groups = [f"plan:{job.plan}", f"duration:{duration_bucket(job.audio_duration)}"]
+        pipe = self.client.pipeline()
+        for group in groups:
+            pipe.hincrby(self._wait_key, f"{group}:count", 1)
+            pipe.hincrbyfloat(self._wait_key, f"{group}:total", wait_seconds)
+            pipe.zadd(self._wait_max_key, {group: wait_seconds}, gt=True)
+        pipe.execute()
+
+    @property
+    def _pending_key(self) -> str:
+        return f"{self.PREFIX}:pending"
+
+    @property
+    def _running_key(self) -> str:
+        return f"{self.PREFIX}:running"
+
+    @property
+    def _running_jobs_key(self) -> str:
+        return f"{self.PREFIX}:running_jobs"
+
+    @property
+    def _wait_key(self) -> str:
+        return f"{self.PREFIX}:wait"
+
+    @property
+    def _wait_max_key(self) -> str:
+        return f"{self.PREFIX}:wait_max"
+
+    @property
+    def _claim_lock_key(self) -> str:
+        return f"{self.PREFIX}:claim_lock"
+
+
+# シングルトンインスタンス
+job_scheduler = JobScheduler()
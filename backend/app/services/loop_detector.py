@@ -0,0 +1,130 @@
+"""
+繰り返しループ検出
+
+condition_on_previous_text=True の逐次デコードでは、音楽や無音の区間で同じフレーズを
+延々と繰り返すことがある（ハルシネーションのループ）。デコード中のセグメント列を監視し、
+同一テキストの連続・文字 n-gram の重複・異常な圧縮率からループを検出する。
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Set
+
+from ..core.config import settings
+
+# 比較時に無視する文字（空白・句読点・記号）
+_IGNORED_CHARS = re.compile(r"[\s、。，．,.!?！？「」『』()（）・…]+")
+
+
+def normalize_text(text: str) -> str:
+    """繰り返し判定用にテキストを正規化"""
+    return _IGNORED_CHARS.sub("", text).lower()
+
+
+@dataclass
+class LoopStats:
+    """ジョブ内で検出したループの集計"""
+    loops_detected: int = 0
+    skipped_seconds: float = 0.0  # ループのため書き起こしを捨てた・飛ばした音声長（秒）
+    dropped_segments: int = 0  # 捨てたセグメント数
+    loops: List[dict] = field(default_factory=list)  # ループごとの範囲と理由
+
+    def to_dict(self) -> dict:
+        return {
+            "loops_detected": self.loops_detected,
+            "skipped_seconds": self.skipped_seconds,
+            "dropped_segments": self.dropped_segments,
+            "loops": list(self.loops),
+        }
+
+
+class LoopDetector:
+    """
+    セグメント列のループ検出
+
+    直近 WHISPER_LOOP_WINDOW_SEGMENTS 件のセグメントを保留しておき、ループと判定した場合は
+    繰り返し部分を捨てる。保留から外れたセグメントだけを確定として返すため、
+    ループのセグメントが進捗通知やチェックポイントに流れることはない。
+    """
+
+    def __init__(self):
+        self.window = max(settings.WHISPER_LOOP_WINDOW_SEGMENTS, settings.WHISPER_LOOP_MIN_REPEATS)
+        self._pending: List[Any] = []
+        self.reason: Optional[str] = None  # ループ検出時の理由
+        self.loop_start: Optional[float] = None  # 捨てた区間の開始時刻（デコード中の音声上の秒）
+        self.loop_end: Optional[float] = None  # 最後に見たセグメントの終了時刻
+        self.dropped: int = 0
+        self.loop_texts: Set[str] = set()  # 捨てたセグメントの正規化テキスト
+
+    @property
+    def tripped(self) -> bool:
+        return self.reason is not None
+
+    def filter(self, segments: Iterable[Any]) -> Iterator[Any]:
+        """
+        faster-whisper のセグメント列からループでないセグメントだけを返す
+
+        ループを検出した時点で元のジェネレータの消費をやめる（以降のデコードは行われない）。
+        """
+        for segment in segments:
+            self._pending.append(segment)
+            self.loop_end = segment.end
+            keep = self._detect()
+            if keep is not None:
+                dropped = self._pending[keep:]
+                self.loop_start = dropped[0].start
+                self.dropped = len(dropped)
+                self.loop_texts = {normalize_text(segment.text) for segment in dropped}
+                yield from self._pending[:keep]
+                self._pending = []
+                return
+            while len(self._pending) > self.window:
+                yield self._pending.pop(0)
+        yield from self._pending
+        self._pending = []
+
+    def _detect(self) -> Optional[int]:
+        """
+        保留中のセグメントがループになっているか判定
+
+        Returns:
+            ループの場合は残すセグメント数（保留の先頭から）、ループでなければ None
+        """
+        pending = self._pending
+        texts = [normalize_text(segment.text) for segment in pending]
+
+        # 同じテキストの連続（最初の1回は残す）
+        min_repeats = settings.WHISPER_LOOP_MIN_REPEATS
+        last = texts[-1]
+        if len(last) >= settings.WHISPER_LOOP_NGRAM_SIZE and len(texts) >= min_repeats:
+            run = 1
+            while run < len(texts) and texts[-run - 1] == last:
+                run += 1
+            if run >= min_repeats:
+                self.reason = "repeated_text"
+                return len(texts) - run + 1
+
+        # 圧縮率の異常なセグメントの連続（セグメント内の繰り返し、すべて捨てる）
+        threshold = settings.WHISPER_LOOP_COMPRESSION_RATIO
+        run = 0
+        for segment in reversed(pending):
+            ratio = getattr(segment, "compression_ratio", None)
+            if ratio is None or ratio <= threshold:
+                break
+            run += 1
+        if run >= 2:
+            self.reason = "compression_ratio"
+            return len(pending) - run
+
+        # 直近のセグメントをまたいだ文字 n-gram の重複（A B A B ... の交互の繰り返しなど）
+        if len(texts) >= self.window:
+            n = settings.WHISPER_LOOP_NGRAM_SIZE
+            joined = "".join(texts[-self.window:])
+            ngrams = [joined[i:i + n] for i in range(len(joined) - n + 1)]
+            if len(ngrams) >= 5 * n:
+                repeated = sum(count - 1 for count in Counter(ngrams).values())
+                if repeated / len(ngrams) > settings.WHISPER_LOOP_NGRAM_REPEAT_RATIO:
+                    self.reason = "ngram_repetition"
+                    return len(texts) - self.window + 1
+
+        return None
@@ -0,0 +1,361 @@
+"""
+ラウドネス正規化（EBU R128 / ITU-R BS.1770 方式）
+
+1パス目で K 特性フィルタ後のゲート付きラウドネスとトゥルーピークをブロック単位に集計し、
+2パス目で単一のゲインとピークリミッターをブロック単位に適用する。
+どちらのパスも音声長に比例する一時配列を作らない。
+"""
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+from scipy.ndimage import minimum_filter1d, uniform_filter1d
+from scipy.signal import lfilter
+
+
+logger = logging.getLogger(__name__)
+
+# ゲーティングブロック長（400ms）と更新間隔（100ms、75% 重なり）
+GATING_BLOCK_SECONDS = 0.4
+GATING_STEP_SECONDS = 0.1
+
+# 絶対ゲートと相対ゲート（LU）
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# ブロックラウドネスのヒストグラム（0.1 LU 刻み、-70 〜 +10 LUFS）
+HISTOGRAM_STEP_LU = 0.1
+HISTOGRAM_BINS = 800
+
+# トゥルーピーク測定のオーバーサンプリング倍率と位相ごとのタップ数（BS.1770 Annex 2 と同じ構成）
+TRUE_PEAK_OVERSAMPLING = 4
+TRUE_PEAK_TAPS = 12
+
+# リミッターの先読み時間（秒）
+LIMITER_LOOKAHEAD_SECONDS = 0.005
+
+
+def _k_weighting(sample_rate: int):
+    """K 特性フィルタ（高域シェルフ + ハイパス）の係数（libebur128 と同じ導出）"""
+    # 高域シェルフ
+    f0 = 1681.974450955533
+    gain_db = 3.999843853973347
+    q = 0.7071752369554196
+    k = np.tan(np.pi * f0 / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = np.array([(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0])
+    shelf_a = np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+
+    # ハイパス
+    f0 = 38.13547087602444
+    q = 0.5003270373238773
+    k = np.tan(np.pi * f0 / sample_rate)
+    a0 = 1 + k / q + k * k
+    highpass_b = np.array([1.0, -2.0, 1.0])
+    highpass_a = np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+
+    return np.convolve(shelf_b, highpass_b), np.convolve(shelf_a, highpass_a)
+
+
+@lru_cache(maxsize=1)
+def _true_peak_phases() -> np.ndarray:
+    """
+    トゥルーピーク検出用の補間フィルタ（サンプル間の 4 点を求める位相ごとの係数）
+
+    各位相は np.convolve にそのまま渡せるよう、係数を時間反転せずに返す。
+    """
+    length = TRUE_PEAK_OVERSAMPLING * TRUE_PEAK_TAPS
+    n = np.arange(length)
+    prototype = np.sinc((n - (length - 1) / 2) / TRUE_PEAK_OVERSAMPLING) * np.kaiser(length, 5.0)
+    phases = prototype.reshape(TRUE_PEAK_TAPS, TRUE_PEAK_OVERSAMPLING).T
+    phases = phases / phases.sum(axis=1, keepdims=True)
+    return phases.astype(np.float32)
+
+
+def _interpolated_peaks(x: np.ndarray) -> np.ndarray:
+    """
+    サンプル間の補間点の絶対値の最大（位相ごと）
+
+    戻り値の i 番目は x[i + 5] と x[i + 6] の間の区間に対応する（長さ len(x) - 11）。
+    """
+    return np.max([np.abs(np.convolve(x, phase, mode="valid")) for phase in _true_peak_phases()], axis=0)
+
+
+@dataclass
+class LoudnessStats:
+    """ラウドネス測定結果（チャンクごとの結果は merge で合算できる）"""
+    block_counts: np.ndarray = field(default_factory=lambda: np.zeros(HISTOGRAM_BINS, dtype=np.int64))
+    block_energy: np.ndarray = field(default_factory=lambda: np.zeros(HISTOGRAM_BINS, dtype=np.float64))
+    true_peak: float = 0.0
+    sample_peak: float = 0.0
+    samples: int = 0
+
+    def merge(self, other: "LoudnessStats") -> "LoudnessStats":
+        """別区間の測定結果を合算"""
+        return LoudnessStats(
+            block_counts=self.block_counts + other.block_counts,
+            block_energy=self.block_energy + other.block_energy,
+            true_peak=max(self.true_peak, other.true_peak),
+            sample_peak=max(self.sample_peak, other.sample_peak),
+            samples=self.samples + other.samples
+        )
+
+    @property
+    def integrated_loudness(self) -> Optional[float]:
+        """ゲート付き統合ラウドネス（LUFS、ゲートを通るブロックがない場合は None）"""
+        total = self.block_counts.sum()
+        if total == 0:
+            return None
+        relative_gate = _energy_to_lufs(self.block_energy.sum() / total) + RELATIVE_GATE_LU
+
+        centers = ABSOLUTE_GATE_LUFS + (np.arange(HISTOGRAM_BINS) + 0.5) * HISTOGRAM_STEP_LU
+        gated = centers > relative_gate
+        count = self.block_counts[gated].sum()
+        if count == 0:
+            return None
+        return _energy_to_lufs(self.block_energy[gated].sum() / count)
+
+    @property
+    def true_peak_db(self) -> float:
+        """トゥルーピーク（dBTP）"""
+        return float(20 * np.log10(self.true_peak + 1e-12))
+
+    def to_dict(self) -> dict:
+        return {
+            "integrated_loudness": self.integrated_loudness,
+            "true_peak_db": self.true_peak_db,
+            "sample_peak": self.sample_peak,
+        }
+
+
+def _energy_to_lufs(energy):
+    return -0.691 + 10 * np.log10(energy + 1e-20)
+
+
+class LoudnessMeter:
+    """
+    ストリーミング対応ラウドネスメーター
+
+    K 特性フィルタの状態・100ms 未満の端数・直前3区間のエネルギーをブロック間で保持し、
+    400ms ゲーティングブロックのラウドネスをヒストグラムに積算する。
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.step = int(round(sample_rate * GATING_STEP_SECONDS))
+        self.steps_per_block = int(round(GATING_BLOCK_SECONDS / GATING_STEP_SECONDS))
+        self._b, self._a = _k_weighting(sample_rate)
+        self._zi = np.zeros(len(self._a) - 1)
+        self._remainder = np.empty(0, dtype=np.float64)
+        self._recent = np.empty(0, dtype=np.float64)
+        self._peak_context = np.zeros(TRUE_PEAK_TAPS - 1, dtype=np.float32)
+        self.stats = LoudnessStats()
+
+    def prime(self, block: np.ndarray) -> None:
+        """フィルタ状態だけを進める（チャンク分割時に直前の音声で初期化する用途）"""
+        _, self._zi = lfilter(self._b, self._a, block, zi=self._zi)
+        block = np.asarray(block, dtype=np.float32)
+        self._peak_context = np.concatenate([self._peak_context, block])[-(TRUE_PEAK_TAPS - 1):]
+
+    def process(self, block: np.ndarray) -> None:
+        """1ブロック分を測定に加える"""
+        if len(block) == 0:
+            return
+        block = np.asarray(block, dtype=np.float32)
+        self.stats.samples += len(block)
+        self.stats.sample_peak = max(self.stats.sample_peak, float(np.max(np.abs(block))))
+        self._update_true_peak(block)
+
+        weighted, self._zi = lfilter(self._b, self._a, block, zi=self._zi)
+        if len(self._remainder):
+            weighted = np.concatenate([self._remainder, weighted])
+        n_steps = len(weighted) // self.step
+        frames = weighted[:n_steps * self.step].reshape(n_steps, self.step)
+        step_energy = np.einsum("ij,ij->i", frames, frames)
+        self._remainder = weighted[n_steps * self.step:]
+
+        energy = np.concatenate([self._recent, step_energy])
+        n_blocks = len(energy) - self.steps_per_block + 1
+        if n_blocks > 0:
+            block_energy = sum(
+                energy[i:i + n_blocks] for i in range(self.steps_per_block)
+            ) / (self.step * self.steps_per_block)
+            self._add_blocks(block_energy)
+            self._recent = energy[n_blocks:]
+        else:
+            self._recent = energy
+
+    def result(self) -> LoudnessStats:
+        """測定結果を返す"""
+        self.stats.true_peak = max(self.stats.true_peak, self.stats.sample_peak)
+        return self.stats
+
+    def _add_blocks(self, block_energy: np.ndarray) -> None:
+        loudness = _energy_to_lufs(block_energy)
+        passed = loudness > ABSOLUTE_GATE_LUFS
+        index = np.minimum(
+            ((loudness[passed] - ABSOLUTE_GATE_LUFS) / HISTOGRAM_STEP_LU).astype(np.int64),
+            HISTOGRAM_BINS - 1
+        )
+        self.stats.block_counts += np.bincount(index, minlength=HISTOGRAM_BINS)
+        self.stats.block_energy += np.bincount(index, weights=block_energy[passed], minlength=HISTOGRAM_BINS)
+
+    def _update_true_peak(self, block: np.ndarray) -> None:
+        x = np.concatenate([self._peak_context, block])
+        self._peak_context = x[-(TRUE_PEAK_TAPS - 1):]
+        self.stats.true_peak = max(self.stats.true_peak, float(_interpolated_peaks(x).max()))
+
+
+class PeakLimiter:
+    """
+    ゲイン適用 + 先読みピークリミッター
+
+    ゲイン適用後にトゥルーピーク（4倍オーバーサンプリングで検出）が ceiling を超える
+    箇所だけ、その前後を滑らかに減衰させる。減衰量は「先読み幅の最小値フィルタ → 移動平均」
+    で求めるため、ピーク位置では必ず ceiling 以下になる。
+    リミッターが有効な場合、出力は入力より先読み分だけ遅れる（遅れた分は次ブロックまたは flush で返る）。
+    """
+
+    def __init__(self, sample_rate: int, gain: float, ceiling: float, enabled: bool = True):
+        self.gain = np.float32(gain)
+        self.ceiling = ceiling
+        self.enabled = enabled
+        self.lookahead = max(1, int(sample_rate * LIMITER_LOOKAHEAD_SECONDS))
+        self.smoothing = self.lookahead | 1
+        # 補間フィルタの長さ分はブロック端でトゥルーピークを検出できない
+        self.radius = self.lookahead + self.smoothing // 2 + TRUE_PEAK_TAPS
+        self.limited_samples = 0
+        self._context = np.zeros(self.radius, dtype=np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """1ブロック分にゲインとリミッターを適用"""
+        if not self.enabled:
+            return block * self.gain
+
+        x = np.concatenate([self._context, block * self.gain])
+        if len(x) < 2 * self.radius:
+            self._context = x
+            return np.empty(0, dtype=np.float32)
+
+        output = x[self.radius:len(x) - self.radius]
+        required = self.ceiling / np.maximum(self._true_peak_envelope(x), self.ceiling)
+        if required.min() < 1.0:
+            envelope = minimum_filter1d(required, size=2 * self.lookahead + 1, mode="nearest")
+            envelope = uniform_filter1d(envelope, size=self.smoothing, mode="nearest")
+            output = output * envelope[self.radius:len(x) - self.radius]
+            self.limited_samples += int(np.count_nonzero(required[self.radius:len(x) - self.radius] < 1.0))
+
+        self._context = x[len(x) - 2 * self.radius:].copy()
+        return output
+
+    def _true_peak_envelope(self, x: np.ndarray) -> np.ndarray:
+        """各サンプル周辺のトゥルーピーク（サンプル値と前後の補間点の絶対値の最大）"""
+        envelope = np.abs(x)
+        # サンプル値がどれも ceiling の半分未満なら補間点も超えないため省略する
+        if envelope.max() < 0.5 * self.ceiling:
+            return envelope
+        between = _interpolated_peaks(x)
+        offset = TRUE_PEAK_TAPS // 2 - 1
+        # 補間点は前後どちらのサンプルの減衰量にも反映する
+        for start in (offset, offset + 1):
+            view = envelope[start:start + len(between)]
+            np.maximum(view, between, out=view)
+        return envelope
+
+    def flush(self) -> np.ndarray:
+        """残りの出力を返す"""
+        if not self.enabled:
+            return np.empty(0, dtype=np.float32)
+        output = self.process(np.zeros(self.radius, dtype=np.float32))
+        self._context = np.zeros(self.radius, dtype=np.float32)
+        return output
+
+    def run(self, audio_data: np.ndarray, block_size: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        配列全体をブロック単位で処理
+
+        Args:
+            audio_data: 入力音声
+            block_size: 1ブロックのサンプル数
+            out: 出力先（audio_data 自身を渡すとその場で書き換える）
+
+        Returns:
+            処理後の音声
+        """
+        if out is None:
+            out = np.empty(len(audio_data), dtype=np.float32)
+        written = 0
+        # 出力は入力より遅れるため、その場で書き換えても未読部分を上書きしない
+        for i in range(0, len(audio_data), block_size):
+            chunk = self.process(audio_data[i:i + block_size])
+            out[written:written + len(chunk)] = chunk
+            written += len(chunk)
+        tail = self.flush()
+        out[written:written + len(tail)] = tail
+        return out
+
+
+class LoudnessNormalizer:
+    """2パス方式のラウドネス正規化"""
+
+    def __init__(self, sample_rate: int = 16000, target_lufs: float = -20.0, true_peak_db: float = -1.0):
+        self.sample_rate = sample_rate
+        self.target_lufs = target_lufs
+        self.ceiling = 10 ** (true_peak_db / 20)
+
+    def create_meter(self) -> LoudnessMeter:
+        """1パス目用のメーターを生成"""
+        return LoudnessMeter(self.sample_rate)
+
+    def measure(self, blocks: Iterable[np.ndarray]) -> LoudnessStats:
+        """ブロック列のラウドネスを測定"""
+        meter = self.create_meter()
+        for block in blocks:
+            meter.process(block)
+        return meter.result()
+
+    def gain(self, stats: LoudnessStats) -> float:
+        """目標ラウドネスに合わせるゲイン"""
+        loudness = stats.integrated_loudness
+        if loudness is None:
+            return 1.0
+        return float(10 ** ((self.target_lufs - loudness) / 20))
+
+    def create_limiter(self, stats: LoudnessStats) -> PeakLimiter:
+        """2パス目用のゲイン + リミッターを生成（ピークが上限を超えない場合はゲインのみ）"""
+        gain = self.gain(stats)
+        enabled = stats.true_peak * gain > self.ceiling
+        logger.info(
+            f"Loudness {stats.integrated_loudness} LUFS -> {self.target_lufs} LUFS "
+            f"(gain {20 * np.log10(gain):+.1f}dB, true peak {stats.true_peak_db:.1f}dBTP, "
+            f"limiter {'on' if enabled else 'off'})"
+        )
+        return PeakLimiter(self.sample_rate, gain, self.ceiling, enabled=enabled)
+
+    def normalize(self, audio_data: np.ndarray, block_size: int, stats: Optional[LoudnessStats] = None) -> np.ndarray:
+        """
+        配列をその場で正規化
+
+        Args:
+            audio_data: 音声データ（書き込み可能な配列はその場で書き換える）
+            block_size: 1ブロックのサンプル数
+            stats: 測定済みの統計量（省略時はここで1パス目を実行）
+
+        Returns:
+            正規化された音声データ
+        """
+        if stats is None:
+            stats = self.measure(audio_data[i:i + block_size] for i in range(0, len(audio_data), block_size))
+        limiter = self.create_limiter(stats)
+        if not limiter.enabled and audio_data.flags.writeable and audio_data.dtype == np.float32:
+            audio_data *= limiter.gain
+            return audio_data
+        return limiter.run(
+            audio_data,
+            block_size,
+            out=audio_data if audio_data.flags.writeable and audio_data.dtype == np.float32 else None
+        )
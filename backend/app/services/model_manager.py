@@ -0,0 +1,178 @@
+"""
+モデル常駐管理サービス
+
+ジョブごとにモデルを解放・再ロードせず、ワーカープロセス内に常駐させる。
+最後の利用から一定時間が経過した場合、またはメモリが逼迫した場合にのみアンロードする。
+ロード・ヒット・アンロードの回数を記録し、ジョブ結果やログから参照できるようにする。
+"""
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def read_available_memory_mb() -> Optional[float]:
+    """ホストの利用可能メモリ（MB）を /proc/meminfo から取得（取得できない場合は None）"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class ModelLifecycleManager:
+    """
+    モデルの常駐管理
+
+    acquire() でモデルを取得する（未ロードならロード）。利用中のモデルはアンロードしない。
+    バックグラウンドの監視スレッドが一定間隔でアイドル時間とメモリ逼迫を確認する。
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        name: str = "model",
+        idle_timeout: float = 600.0,
+        monitor_interval: float = 30.0,
+        pressure_check: Optional[Callable[[], Optional[str]]] = None
+    ):
+        """
+        Args:
+            loader: モデルを生成する関数
+            name: ログ用のモデル名
+            idle_timeout: 最後の利用からアンロードまでの秒数（0 以下で無期限に常駐）
+            monitor_interval: 監視スレッドの確認間隔（秒）
+            pressure_check: メモリ逼迫時に理由の文字列を返す関数（逼迫していなければ None）
+        """
+        self.loader = loader
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self.monitor_interval = monitor_interval
+        self.pressure_check = pressure_check
+
+        self._model = None
+        self._lock = threading.RLock()
+        self._in_use = 0
+        self._last_used = 0.0
+        self._monitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.loads = 0
+        self.hits = 0
+        self.evictions: Dict[str, int] = {}
+        self.load_seconds = 0.0
+        self.last_load_seconds: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """
+        モデルを取得（with ブロックの間はアンロードされない）
+
+        Yields:
+            ロード済みモデル
+        """
+        with self._lock:
+            if self._model is None:
+                start = time.perf_counter()
+                self._model = self.loader()
+                self.last_load_seconds = time.perf_counter() - start
+                self.load_seconds += self.last_load_seconds
+                self.loads += 1
+                logger.info(f"{self.name} loaded in {self.last_load_seconds:.1f}s (loads={self.loads})")
+                self._ensure_monitor()
+            else:
+                self.hits += 1
+                logger.info(f"{self.name} reused (hits={self.hits})")
+            self._in_use += 1
+            model = self._model
+
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+
+    def evict(self, reason: str = "manual") -> bool:
+        """
+        モデルをアンロード
+
+        Args:
+            reason: アンロード理由（カウンタのキーになる）
+
+        Returns:
+            アンロードした場合 True（未ロード・利用中の場合は False）
+        """
+        with self._lock:
+            if self._model is None or self._in_use:
+                return False
+            self._model = None
+            self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        gc.collect()
+        logger.info(f"{self.name} evicted ({reason})")
+        return True
+
+    def check(self) -> Optional[str]:
+        """
+        アイドル時間とメモリ逼迫を確認し、必要ならアンロード
+
+        Returns:
+            アンロードした場合はその理由
+        """
+        with self._lock:
+            if self._model is None or self._in_use:
+                return None
+            idle = time.monotonic() - self._last_used
+
+        reason = None
+        if self.idle_timeout > 0 and idle >= self.idle_timeout:
+            reason = "idle_timeout"
+        elif self.pressure_check is not None:
+            reason = self.pressure_check()
+        if reason and self.evict(reason):
+            return reason
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """ロード・ヒット・アンロードの回数"""
+        return {
+            "resident": self.is_loaded,
+            "loads": self.loads,
+            "hits": self.hits,
+            "evictions": dict(self.evictions),
+            "load_seconds_total": self.load_seconds,
+            "last_load_seconds": self.last_load_seconds,
+        }
+
+    def shutdown(self) -> None:
+        """監視スレッドを停止してモデルを解放"""
+        self._stop.set()
+        self.evict("shutdown")
+
+    def _ensure_monitor(self) -> None:
+        if self._monitor is not None and self._monitor.is_alive():
+            return
+        if self.idle_timeout <= 0 and self.pressure_check is None:
+            return
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._run_monitor, name=f"{self.name}-monitor", daemon=True)
+        self._monitor.start()
+
+    def _run_monitor(self) -> None:
+        # 初回ロード時に起動し、以降はプロセス終了（または shutdown）まで確認を続ける
+        while not self._stop.wait(self.monitor_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.warning(f"{self.name} monitor check failed: {e}")
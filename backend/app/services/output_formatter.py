@@ -48,13 +48,14 @@ class OutputFormatter:
             lines.append("=" * 80)
             lines.append("")
 
-        # 書き起こしセグメント
+        # 書き起こしセグメント（話者別トラックの場合は話者ラベル付き）
         for segment in segments:
+            text = f"{segment.speaker}: {segment.text}" if segment.speaker else segment.text
             if include_timestamps:
                 timestamp = self._format_timestamp(segment.start)
-                lines.append(f"[{timestamp}] {segment.text}")
+                lines.append(f"[{timestamp}] {text}")
             else:
-                lines.append(segment.text)
+                lines.append(text)
 
         return "\n".join(lines)
 
@@ -83,7 +84,8 @@ class OutputFormatter:
                 "created_at": created_at.isoformat() if created_at else None,
                 "session_log": session_log,
                 "total_segments": len(segments),
-                "total_duration": segments[-1].end if segments else 0
+                "total_duration": max((segment.end for segment in segments), default=0),
+                "speakers": sorted({segment.speaker for segment in segments if segment.speaker})
             },
             "segments": [
                 {
@@ -91,7 +93,8 @@ class OutputFormatter:
                     "end": segment.end,
                     "duration": segment.end - segment.start,
                     "text": segment.text,
-                    "confidence": segment.confidence
+                    "confidence": segment.confidence,
+                    "speaker": segment.speaker
                 }
                 for segment in segments
             ]
@@ -180,6 +183,10 @@ class OutputFormatter:
             font-size: 0.9em;
             margin-right: 10px;
         }
+        .speaker {
+            font-weight: bold;
+            margin-right: 10px;
+        }
         .text {
             line-height: 1.6;
         }
@@ -219,6 +226,8 @@ class OutputFormatter:
             timestamp = self._format_timestamp(segment.start)
             html_parts.append('        <div class="segment">')
             html_parts.append(f'            <span class="timestamp">[{timestamp}]</span>')
+            if segment.speaker:
+                html_parts.append(f'            <span class="speaker">{self._escape_html(segment.speaker)}</span>')
             html_parts.append(f'            <span class="text">{self._escape_html(segment.text)}</span>')
             html_parts.append('        </div>')
 
@@ -0,0 +1,251 @@
+"""
+並列音声前処理サービス
+
+信号を重なりのあるチャンクに分割し、リサンプリングとノイズ除去を
+ProcessPoolExecutor で並列に実行する。音声データは共有メモリに置き、
+ワーカーへは共有メモリ名とチャンク範囲だけを渡す（配列を pickle しない）。
+チャンク境界はクロスフェードでつなぎ、音量正規化はチャンクごとの統計量から
+合算したラウドネス測定結果から求めた全体共通のゲインで行うため、逐次処理と同じ結果になる。
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..core.config import settings
+from .audio_decoder import ffmpeg_decoder
+from .loudness import GATING_BLOCK_SECONDS, GATING_STEP_SECONDS, LoudnessMeter, LoudnessStats
+
+logger = logging.getLogger(__name__)
+
+
+def _process_chunk(job: dict) -> dict:
+    """
+    1チャンク分のリサンプリング・ノイズ除去（ワーカープロセスで実行）
+
+    担当範囲のうちクロスフェード区間を除いた部分を出力用共有メモリへ直接書き込み、
+    クロスフェード区間は親プロセスで合成するため戻り値として返す。
+    """
+    from .resampler import resample
+    from .spectral_gate import NoiseProfile, SpectralGateDenoiser
+
+    input_shm = shared_memory.SharedMemory(name=job["input_name"])
+    output_shm = shared_memory.SharedMemory(name=job["output_name"])
+    try:
+        source = np.ndarray((job["input_length"],), dtype=np.float32, buffer=input_shm.buf)
+        output = np.ndarray((job["output_length"],), dtype=np.float32, buffer=output_shm.buf)
+
+        segment = source[job["segment_start"]:job["segment_end"]]
+        if job["sample_rate"] != job["target_rate"]:
+            processed = resample(segment, job["sample_rate"], job["target_rate"])
+        else:
+            processed = segment.copy()
+
+        if job["noise_profile"] is not None:
+            denoiser = SpectralGateDenoiser(
+                sample_rate=job["target_rate"],
+                n_fft=settings.SPECTRAL_GATE_N_FFT,
+                prop_decrease=0.5,
+                profile=NoiseProfile(job["noise_profile"])
+            )
+            block_size = int(settings.AUDIO_STREAMING_BLOCK_SECONDS * job["target_rate"])
+            processed = denoiser.denoise(processed, block_size=block_size, out=processed)
+        elif job["use_noisereduce"]:
+            import noisereduce as nr
+            processed = nr.reduce_noise(
+                y=processed,
+                sr=job["target_rate"],
+                stationary=True,
+                prop_decrease=0.5
+            ).astype(np.float32, copy=False)
+
+        # processed[0] は出力全体の segment_output_start に対応する
+        base = job["segment_output_start"]
+        own_start, own_end = job["own_start"], job["own_end"]
+        fade = job["crossfade"]
+
+        core_start = own_start + (fade if not job["is_first"] else 0)
+        core_end = own_end - (fade if not job["is_last"] else 0)
+        output[core_start:core_end] = processed[core_start - base:core_end - base]
+
+        loudness = None
+        if job["measure_loudness"]:
+            # 直前の音声でフィルタ状態を初期化し、担当範囲から始まるゲーティングブロックを
+            # すべて測定できるよう末尾は次チャンクの先頭まで少し読む
+            rate = job["target_rate"]
+            meter = LoudnessMeter(rate)
+            meter.prime(processed[max(0, own_start - base - int(GATING_BLOCK_SECONDS * rate)):own_start - base])
+            tail = 0 if job["is_last"] else int((GATING_BLOCK_SECONDS - GATING_STEP_SECONDS) * rate)
+            meter.process(processed[own_start - base:own_end + tail - base])
+            loudness = meter.result()
+
+        return {
+            "index": job["index"],
+            "loudness": loudness,
+            "left": None if job["is_first"] else processed[own_start - fade - base:own_start + fade - base].copy(),
+            "right": None if job["is_last"] else processed[own_end - fade - base:own_end + fade - base].copy(),
+        }
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+
+class ParallelPreprocessor:
+    """チャンク並列前処理クラス"""
+
+    def __init__(self, target_sample_rate: int = 16000):
+        self.target_sample_rate = target_sample_rate
+
+    def process(
+        self,
+        input_path: str,
+        workers: int,
+        noise_profile: Optional[np.ndarray] = None,
+        use_noisereduce: bool = False,
+        measure_loudness: bool = True
+    ) -> Tuple[np.ndarray, Optional[LoudnessStats]]:
+        """
+        音声ファイルを並列に前処理
+
+        Args:
+            input_path: 入力音声ファイルパス
+            workers: ワーカープロセス数
+            noise_profile: スペクトルゲートのノイズ閾値（指定時はスペクトルゲートでノイズ除去）
+            use_noisereduce: noisereduce でチャンクごとにノイズ除去するか
+            measure_loudness: 音量正規化用にラウドネスを測定するか
+
+        Returns:
+            (16kHz モノラル float32 配列（音量正規化前）, 全チャンクを合算したラウドネス)
+        """
+        input_shm, input_length, sample_rate = self._load_to_shared_memory(input_path)
+        try:
+            g = gcd(sample_rate, self.target_sample_rate)
+            up, down = self.target_sample_rate // g, sample_rate // g
+            output_length = -(-input_length * up // down)
+            output_shm = shared_memory.SharedMemory(create=True, size=max(output_length, 1) * 4)
+            try:
+                jobs = self._plan_chunks(
+                    input_length, sample_rate, up, down, output_length,
+                    input_shm.name, output_shm.name,
+                    noise_profile, use_noisereduce, measure_loudness
+                )
+                logger.info(f"Parallel preprocessing: {len(jobs)} chunks on {workers} workers")
+
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = sorted(executor.map(_process_chunk, jobs), key=lambda r: r["index"])
+
+                output = np.ndarray((output_length,), dtype=np.float32, buffer=output_shm.buf)
+                self._crossfade(output, jobs, results)
+                audio_data = output.copy()
+                del output
+            finally:
+                output_shm.close()
+                output_shm.unlink()
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+
+        loudness = None
+        if measure_loudness:
+            loudness = LoudnessStats()
+            for result in results:
+                loudness = loudness.merge(result["loudness"])
+        return audio_data, loudness
+
+    def _load_to_shared_memory(self, input_path: str) -> Tuple[shared_memory.SharedMemory, int, int]:
+        """入力をモノラル float32 で共有メモリに読み込む"""
+        if ffmpeg_decoder.should_decode(input_path):
+            # ffmpeg 側で 16kHz モノラルまで変換済み
+            audio_data = ffmpeg_decoder.decode(input_path, sample_rate=self.target_sample_rate)
+            shm = shared_memory.SharedMemory(create=True, size=max(len(audio_data), 1) * 4)
+            np.ndarray((len(audio_data),), dtype=np.float32, buffer=shm.buf)[:] = audio_data
+            return shm, len(audio_data), self.target_sample_rate
+
+        info = sf.info(input_path)
+        shm = shared_memory.SharedMemory(create=True, size=max(info.frames, 1) * 4)
+        view = np.ndarray((info.frames,), dtype=np.float32, buffer=shm.buf)
+        block_frames = max(1, int(settings.AUDIO_STREAMING_BLOCK_SECONDS * info.samplerate))
+        position = 0
+        for block in sf.blocks(input_path, blocksize=block_frames, dtype="float32", always_2d=True):
+            n = min(len(block), info.frames - position)
+            view[position:position + n] = block[:n].mean(axis=1)
+            position += n
+        del view
+        return shm, position, info.samplerate
+
+    def _plan_chunks(
+        self,
+        input_length: int,
+        sample_rate: int,
+        up: int,
+        down: int,
+        output_length: int,
+        input_name: str,
+        output_name: str,
+        noise_profile: Optional[np.ndarray],
+        use_noisereduce: bool,
+        measure_loudness: bool
+    ) -> List[dict]:
+        """
+        チャンク分割を決める
+
+        境界はダウンサンプリング比 M の倍数に揃え、各チャンクのリサンプル結果が
+        出力全体のサンプル位置とずれないようにする。スペクトルゲートを使う場合は
+        さらに STFT の hop 長の倍数に揃え、逐次処理と同じフレーム位置で分析する。
+        """
+        align = down
+        if noise_profile is not None:
+            align *= settings.SPECTRAL_GATE_N_FFT // 4
+        crossfade = int(settings.PARALLEL_CROSSFADE_SECONDS * self.target_sample_rate)
+        chunk = max(align, int(settings.PARALLEL_CHUNK_SECONDS * sample_rate) // align * align)
+        overlap = -(-int(settings.PARALLEL_OVERLAP_SECONDS * sample_rate) // align) * align
+        # 重なりはクロスフェード区間とフィルタの過渡応答を十分に含む長さにする
+        overlap = max(overlap, -(-(2 * crossfade * down) // up) // align * align + align)
+
+        boundaries = list(range(0, input_length, chunk)) + [input_length]
+        # 末尾の短すぎるチャンクは直前に併合する
+        if len(boundaries) > 2 and (boundaries[-1] - boundaries[-2]) * up // down < 4 * crossfade:
+            boundaries.pop(-2)
+
+        jobs = []
+        for i in range(len(boundaries) - 1):
+            start, end = boundaries[i], boundaries[i + 1]
+            is_last = i == len(boundaries) - 2
+            segment_start = max(0, start - overlap)
+            jobs.append({
+                "index": i,
+                "input_name": input_name,
+                "output_name": output_name,
+                "input_length": input_length,
+                "output_length": output_length,
+                "sample_rate": sample_rate,
+                "target_rate": self.target_sample_rate,
+                "segment_start": segment_start,
+                "segment_end": min(input_length, end + overlap),
+                "segment_output_start": segment_start * up // down,
+                "own_start": start * up // down,
+                "own_end": output_length if is_last else end * up // down,
+                "crossfade": crossfade,
+                "is_first": i == 0,
+                "is_last": is_last,
+                "noise_profile": noise_profile,
+                "use_noisereduce": use_noisereduce and noise_profile is None,
+                "measure_loudness": measure_loudness,
+            })
+        return jobs
+
+    def _crossfade(self, output: np.ndarray, jobs: List[dict], results: List[dict]) -> None:
+        """チャンク境界のクロスフェード区間を合成して書き込む"""
+        for job, left, right in zip(jobs[1:], results[:-1], results[1:]):
+            boundary = job["own_start"]
+            fade = job["crossfade"]
+            weight = np.linspace(0.0, 1.0, 2 * fade, dtype=np.float32)
+            output[boundary - fade:boundary + fade] = left["right"] * (1.0 - weight) + right["left"] * weight
+
+
+# シングルトンインスタンス
+parallel_preprocessor = ParallelPreprocessor()
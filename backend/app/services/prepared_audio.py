@@ -0,0 +1,94 @@
+"""
+前処理済み音声の受け渡し
+
+前処理（CPU キュー）と書き起こし（GPU キュー）を別タスクに分けた場合に、
+Whisper に渡す 16kHz モノラル音声と無音除去の対応表・前処理レポートを
+RAM ディスク経由で次のタスクへ渡す。
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..core.config import settings
+from .audio_preprocessing import TimelineMap
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreparedAudio:
+    """書き起こし直前の音声（前処理・無音除去済み）"""
+    audio: np.ndarray  # 16kHz モノラル float32（無音除去後）
+    sample_rate: int
+    audio_duration: float  # 元音声の長さ（秒）
+    timeline: Optional[TimelineMap] = None  # 無音除去の対応表
+    preprocessing: Dict[str, Any] = field(default_factory=dict)  # 前処理レポート
+
+
+class PreparedAudioStore:
+    """前処理済み音声の保存先（RAM ディスク上の .npy と JSON）"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(settings.RAMDISK_PATH, "prepared")
+
+    def save(self, key: str, prepared: PreparedAudio) -> None:
+        """音声とメタデータを保存（メタデータは最後に書き、存在すれば保存完了とみなす）"""
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(self._audio_path(key), np.asarray(prepared.audio, dtype=np.float32))
+        metadata = {
+            "sample_rate": prepared.sample_rate,
+            "audio_duration": prepared.audio_duration,
+            "timeline": prepared.timeline.to_dict() if prepared.timeline is not None else None,
+            "preprocessing": prepared.preprocessing,
+        }
+        tmp_path = f"{self._metadata_path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        os.replace(tmp_path, self._metadata_path(key))
+
+    def load(self, key: str, mmap: bool = False) -> Optional[PreparedAudio]:
+        """
+        保存済みの前処理結果を読み込む（ない場合・読めない場合は None）
+
+        Args:
+            key: 保存キー
+            mmap: 音声をメモリマップで開く（一部の区間だけを書き起こす場合に全体を読み込まない）
+        """
+        try:
+            with open(self._metadata_path(key), encoding="utf-8") as f:
+                metadata = json.load(f)
+            audio = np.load(self._audio_path(key), mmap_mode="r" if mmap else None)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable prepared audio {key}: {e}")
+            return None
+        timeline = metadata["timeline"]
+        return PreparedAudio(
+            audio=audio,
+            sample_rate=metadata["sample_rate"],
+            audio_duration=metadata["audio_duration"],
+            timeline=TimelineMap.from_dict(timeline) if timeline is not None else None,
+            preprocessing=metadata["preprocessing"],
+        )
+
+    def delete(self, key: str) -> None:
+        for path in (self._metadata_path(key), self._audio_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _audio_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _metadata_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+
+# シングルトンインスタンス
+prepared_audio_store = PreparedAudioStore()
@@ -0,0 +1,211 @@
+"""
+書き起こし進捗ストリーミングサービス
+
+ワーカーが書き起こし中のセグメントと進捗率を書き起こしごとの Redis Stream に追記し、
+API が同じストリームを読み出して Server-Sent Events でクライアントへ中継する。
+Celery の結果バックエンドをポーリングせずに途中経過のテキストを表示できる。
+"""
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from ..core.config import settings
+from ..models.transcription import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+# ストリームを終了させるイベント
+TERMINAL_EVENTS = ("completed", "failed")
+
+# 読み出し側で送る終了イベント（ストリームの削除・新着のないまま PROGRESS_STREAM_IDLE_TIMEOUT 経過）
+EXPIRED_EVENT = "expired"
+TIMEOUT_EVENT = "timeout"
+
+
+class SegmentProgressReporter:
+    """
+    セグメント単位の進捗通知
+
+    書き起こされたセグメントを溜めておき、前回の通知から PROGRESS_STREAM_MIN_INTERVAL 秒
+    以上経過したときにまとめてストリームへ追記する（セグメントごとに Redis へ書き込まない）。
+    進捗率は segment.end / audio_duration を progress_start〜progress_end に割り当てて求める。
+    """
+
+    def __init__(
+        self,
+        service: "ProgressStreamService",
+        transcription_id: str,
+        audio_duration: float,
+        progress_start: int = 50,
+        progress_end: int = 75,
+        extra: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        event: str = "segments"
+    ):
+        """
+        Args:
+            service: 追記先のストリームサービス
+            transcription_id: 書き起こしID
+            audio_duration: 元音声の長さ（秒、セグメントの時刻と同じ時間軸）
+            progress_start: 書き起こし開始時の進捗率
+            progress_end: 書き起こし完了時の進捗率
+            extra: 各イベントに付加するフィールド（トラック番号など）
+            on_progress: 通知のたびに呼ぶコールバック（Celery のタスク状態更新など）
+            event: 追記するイベント種別（下書きの場合は draft）
+        """
+        self.service = service
+        self.transcription_id = transcription_id
+        self.audio_duration = audio_duration
+        self.progress_start = progress_start
+        self.progress_end = progress_end
+        self.extra = extra or {}
+        self.on_progress = on_progress
+        self.event = event
+        self.first_published_at: Optional[float] = None  # 最初にセグメントを追記した時刻（time.time()）
+
+        self._pending: List[TranscriptSegment] = []
+        self._last_flush = time.monotonic()
+        self._last_end = 0.0
+
+    @property
+    def progress(self) -> int:
+        ratio = min(self._last_end / self.audio_duration, 1.0) if self.audio_duration > 0 else 0.0
+        return int(self.progress_start + (self.progress_end - self.progress_start) * ratio)
+
+    def add(self, segment: TranscriptSegment) -> None:
+        """書き起こされたセグメントを追加（間隔が空いていれば通知）"""
+        self._pending.append(segment)
+        self._last_end = max(self._last_end, segment.end)
+        if time.monotonic() - self._last_flush >= settings.PROGRESS_STREAM_MIN_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """溜まっているセグメントと現在の進捗率を通知"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        segments, self._pending = self._pending, []
+        progress = self.progress
+        if self.first_published_at is None:
+            self.first_published_at = time.time()
+        self.service.publish(
+            self.transcription_id,
+            self.event,
+            progress=progress,
+            position=self._last_end,
+            duration=self.audio_duration,
+            segments=[seg.model_dump() for seg in segments],
+            **self.extra
+        )
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+
+class ProgressStreamService:
+    """書き起こし進捗の Redis Stream 読み書き"""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url)
+        return self._client
+
+    def stream_key(self, transcription_id: str) -> str:
+        return f"transcription:{transcription_id}:progress"
+
+    def publish(self, transcription_id: str, event: str, **data: Any) -> Optional[str]:
+        """
+        イベントをストリームに追記
+
+        Redis に書き込めない場合も書き起こしは続行する（警告ログのみ）。
+
+        Args:
+            transcription_id: 書き起こしID
+            event: イベント種別（stage / draft / segments / refined / completed / failed）
+            **data: イベントの内容（JSON で保存）
+
+        Returns:
+            追記したエントリID（失敗時は None）
+        """
+        key = self.stream_key(transcription_id)
+        try:
+            pipe = self.client.pipeline()
+            pipe.xadd(
+                key,
+                {"event": event, "data": json.dumps(data, ensure_ascii=False)},
+                maxlen=settings.PROGRESS_STREAM_MAXLEN,
+                approximate=True
+            )
+            pipe.expire(key, settings.PROGRESS_STREAM_TTL)
+            entry_id, _ = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to publish progress for {transcription_id}: {e}")
+            return None
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    def exists(self, transcription_id: str) -> bool:
+        """ストリームがあるか（投入後〜最後の追記から PROGRESS_STREAM_TTL の間）"""
+        return bool(self.client.exists(self.stream_key(transcription_id)))
+
+    def create_reporter(
+        self,
+        transcription_id: str,
+        audio_duration: float,
+        **kwargs: Any
+    ) -> SegmentProgressReporter:
+        """セグメント単位の進捗通知を作成（引数は SegmentProgressReporter を参照）"""
+        return SegmentProgressReporter(self, transcription_id, audio_duration, **kwargs)
+
+    async def tail(
+        self,
+        transcription_id: str,
+        last_id: str = "0"
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        ストリームを先頭（または last_id の次）から読み続ける
+
+        完了・失敗イベントを読んだ時点で終了する。PROGRESS_STREAM_BLOCK_MS の間
+        新しいイベントがなければ None を返す（接続維持のハートビート用）。
+        ストリームが削除された場合は expired、PROGRESS_STREAM_IDLE_TIMEOUT の間新しいイベントが
+        なければ timeout を最後に返して終了する（どちらもエントリIDは最後に読んだもの）。
+
+        Yields:
+            {"id": エントリID, "event": 種別, "data": 内容} または None
+        """
+        key = self.stream_key(transcription_id)
+        client = aioredis.Redis.from_url(self.redis_url)
+        last_event_at = time.monotonic()
+        try:
+            while True:
+                response = await client.xread({key: last_id}, block=settings.PROGRESS_STREAM_BLOCK_MS)
+                if not response:
+                    idle_seconds = time.monotonic() - last_event_at
+                    if not await client.exists(key):
+                        yield {"id": last_id, "event": EXPIRED_EVENT, "data": {}}
+                        return
+                    if idle_seconds >= settings.PROGRESS_STREAM_IDLE_TIMEOUT:
+                        yield {"id": last_id, "event": TIMEOUT_EVENT, "data": {"idle_seconds": idle_seconds}}
+                        return
+                    yield None
+                    continue
+                last_event_at = time.monotonic()
+                for entry_id, fields in response[0][1]:
+                    last_id = entry_id.decode()
+                    event = fields[b"event"].decode()
+                    yield {"id": last_id, "event": event, "data": json.loads(fields[b"data"])}
+                    if event in TERMINAL_EVENTS:
+                        return
+        finally:
+            await client.aclose()
+
+
+# シングルトンインスタンス
+progress_stream = ProgressStreamService()
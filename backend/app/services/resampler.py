@@ -0,0 +1,178 @@
+"""
+ポリフェーズ FIR リサンプラー
+
+帯域制限（Kaiser 窓付き sinc）フィルタによる有理数比リサンプリング
+フィルタバンクはサンプリングレートの組ごとにキャッシュし、
+ブロック間で状態を引き継ぐためストリーミング処理にも使用できる
+"""
+from functools import lru_cache
+from math import gcd
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# フィルタ半長（ゼロ交差の数）と阻止域特性
+FILTER_ZERO_CROSSINGS = 16
+FILTER_KAISER_BETA = 8.6  # 阻止域減衰 約 -85dB
+FILTER_ROLLOFF = 0.94  # ナイキスト周波数に対する通過域の割合
+
+# 1回の行列積で計算する出力サンプル数（一時配列のサイズ上限）
+_OUTPUT_BATCH = 8192
+
+
+class FilterBank:
+    """
+    ポリフェーズ分解済みのフィルタバンク
+
+    Attributes:
+        up: アップサンプリング比 L
+        down: ダウンサンプリング比 M
+        taps: 1位相あたりのタップ数 K
+        delay: 群遅延（アップサンプル後のサンプル数）
+        phases: 位相ごとの係数（時間反転済み、shape=(L, K)）
+    """
+
+    def __init__(self, original_sr: int, target_sr: int):
+        g = gcd(original_sr, target_sr)
+        self.up = target_sr // g
+        self.down = original_sr // g
+
+        # アップサンプル後のレートで正規化したカットオフ周波数
+        factor = max(self.up, self.down)
+        cutoff = FILTER_ROLLOFF * 0.5 / factor
+        half_length = int(np.ceil(FILTER_ZERO_CROSSINGS * factor / FILTER_ROLLOFF))
+
+        t = np.arange(-half_length, half_length + 1, dtype=np.float64)
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * t)
+        prototype *= np.kaiser(len(t), FILTER_KAISER_BETA)
+        # ゼロ挿入によるゲイン低下を補償
+        prototype *= self.up / prototype.sum()
+
+        self.delay = half_length
+        self.taps = int(np.ceil(len(prototype) / self.up))
+
+        padded = np.zeros(self.taps * self.up, dtype=np.float64)
+        padded[:len(prototype)] = prototype
+        # phases[p, k] = h[p + k*L] を時間反転して x[base-K+1 .. base] との内積にする
+        self.phases = padded.reshape(self.taps, self.up).T[:, ::-1].astype(np.float32).copy()
+
+
+@lru_cache(maxsize=16)
+def get_filter_bank(original_sr: int, target_sr: int) -> FilterBank:
+    """サンプリングレートの組に対応するフィルタバンクを取得（キャッシュ付き）"""
+    return FilterBank(original_sr, target_sr)
+
+
+class PolyphaseResampler:
+    """
+    状態を持つポリフェーズリサンプラー
+
+    出力 y[n] は入力 x に対して
+        y[n] = Σ_k h[p + kL] · x[base - k],  p = (nM + D) mod L, base = (nM + D) // L
+    で計算される（D はフィルタの群遅延で、出力の時間軸を入力と揃える）。
+    ブロック境界をまたぐのに必要な直近 K-1 サンプルだけを保持する。
+    """
+
+    def __init__(self, original_sr: int, target_sr: int):
+        self.bank = get_filter_bank(original_sr, target_sr)
+        self._history = np.zeros(self.bank.taps - 1, dtype=np.float32)
+        self._offset = -(self.bank.taps - 1)  # _history[0] の入力サンプル番号
+        self._next_output = 0
+        self._input_count = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """1ブロック分をリサンプリング（確定した出力のみ返す）"""
+        self._input_count += len(block)
+        return self._run(np.asarray(block, dtype=np.float32), flush=False)
+
+    def flush(self) -> np.ndarray:
+        """入力終端以降をゼロとみなし、残りの出力を返す"""
+        return self._run(np.empty(0, dtype=np.float32), flush=True)
+
+    def _run(self, block: np.ndarray, flush: bool) -> np.ndarray:
+        bank = self.bank
+        L, M, K, D = bank.up, bank.down, bank.taps, bank.delay
+
+        if flush:
+            # 入力長 N に対する出力長は ceil(N * L / M)
+            end = -(-self._input_count * L // M)
+            needed_input = (max(end - 1, 0) * M + D) // L + 1
+            pad = max(0, needed_input - (self._offset + len(self._history) + len(block)))
+            block = np.concatenate([block, np.zeros(pad, dtype=np.float32)])
+
+        buffer = np.concatenate([self._history, block]) if len(self._history) else block
+        available = self._offset + len(buffer)
+
+        # base(n) < available を満たす出力まで計算できる
+        end = max(self._next_output, -(-(available * L - D) // M))
+        if flush:
+            end = min(end, -(-self._input_count * L // M))
+        start = self._next_output
+
+        output = np.empty(max(end - start, 0), dtype=np.float32)
+        if len(output):
+            windows = sliding_window_view(buffer, K)
+            for batch_start in range(start, end, _OUTPUT_BATCH):
+                batch_end = min(batch_start + _OUTPUT_BATCH, end)
+                self._compute(windows, batch_start, batch_end, output[batch_start - start:batch_end - start])
+
+        self._next_output = max(end, start)
+
+        # 次の出力に必要な入力だけを残す
+        next_base = (self._next_output * M + D) // L
+        keep_from = max(0, min(len(buffer), next_base - K + 1 - self._offset))
+        self._history = buffer[keep_from:].copy()
+        self._offset += keep_from
+        return output
+
+    def _compute(self, windows: np.ndarray, start: int, end: int, out: np.ndarray) -> None:
+        """出力 [start, end) を位相ごとの行列ベクトル積で計算"""
+        bank = self.bank
+        L, M, K, D = bank.up, bank.down, bank.taps, bank.delay
+        count = end - start
+
+        # 位相は出力 L 個ごとに巡回し、同位相の入力窓は M サンプル間隔で並ぶ
+        for r in range(min(L, count)):
+            n = start + r
+            phase = (n * M + D) % L
+            first_row = (n * M + D) // L - K + 1 - self._offset
+            rows = len(range(r, count, L))
+            view = windows[first_row:first_row + (rows - 1) * M + 1:M]
+            out[r::L] = view @ bank.phases[phase]
+
+
+def resample(
+    audio_data: np.ndarray,
+    original_sr: int,
+    target_sr: int,
+    block_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    配列全体をリサンプリング
+
+    Args:
+        audio_data: 入力音声（モノラル）
+        original_sr: 入力サンプリングレート
+        target_sr: 出力サンプリングレート
+        block_size: 処理ブロック長（省略時は一括）
+
+    Returns:
+        リサンプリング後の音声（float32）
+    """
+    if original_sr == target_sr:
+        return np.asarray(audio_data, dtype=np.float32)
+
+    resampler = PolyphaseResampler(original_sr, target_sr)
+    total = -(-len(audio_data) * resampler.bank.up // resampler.bank.down)
+    output = np.empty(total, dtype=np.float32)
+
+    step = block_size or max(len(audio_data), 1)
+    written = 0
+    for i in range(0, len(audio_data), step):
+        chunk = resampler.process(audio_data[i:i + step])
+        output[written:written + len(chunk)] = chunk
+        written += len(chunk)
+    tail = resampler.flush()
+    output[written:written + len(tail)] = tail
+    return output
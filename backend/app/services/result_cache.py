@@ -0,0 +1,277 @@
+"""
+書き起こし結果キャッシュ
+
+アップロードされた音声の内容ハッシュと、結果に影響するデコード設定をキーに
+書き起こし結果を Redis に保存する。同じセッション音声の再アップロード
+（保持期間切れ後の再取得や二重アップロード）は GPU で処理し直さずに結果を返す。
+
+保存期間は書き起こしデータの保持期間（RESULT_CACHE_TTL、既定 8時間）に合わせ、
+合計サイズが RESULT_CACHE_MAX_BYTES を超えたら最後に使われた時刻の古い順に削除する。
+キャッシュはユーザーをまたいで共有されるため、書き起こしを削除したときは対応するエントリも削除する（purge）。
+"""
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import redis
+
+from ..core.config import settings
+from .trpg_prompt import get_trpg_initial_prompt
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_audio_file(audio_path: str) -> str:
+    """音声ファイルの内容ハッシュ（SHA-256、ファイル全体をメモリに載せずに計算）"""
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def decode_parameters(language: str = "ja", task: str = "transcribe") -> Dict[str, Any]:
+    """
+    書き起こし結果に影響する設定（キャッシュキーに使う）
+
+    前処理ワーカー（GPU なし）でも書き起こしワーカーと同じキーになるよう、Whisper サービスを作らずに
+    WHISPER_* 設定から組み立てる。デコード設定スケジューラが選ぶ設定はジョブごとに変わるため含めず、
+    基準となる WHISPER_* 設定でデコードした結果だけを保存する。
+    設定に表れない処理の変更は RESULT_CACHE_VERSION を上げてキーを変える。
+    """
+    return {
+        "version": settings.RESULT_CACHE_VERSION,
+        "model": settings.WHISPER_MODEL,
+        "compute_type": settings.WHISPER_COMPUTE_TYPE,
+        "language": language,
+        "task": task,
+        "initial_prompt": get_trpg_initial_prompt(),
+        "beam_size": settings.WHISPER_BEAM_SIZE,
+        "patience": settings.WHISPER_PATIENCE,
+        "temperature": list(settings.WHISPER_TEMPERATURE),
+        "vad_filter": settings.WHISPER_VAD_FILTER,
+        "condition_on_previous_text": settings.WHISPER_CONDITION_ON_PREVIOUS_TEXT,
+        "two_pass": settings.WHISPER_TWO_PASS_ENABLED,
+        "loop_detection": settings.WHISPER_LOOP_DETECTION_ENABLED,
+        "batched": settings.WHISPER_BATCHED_ENABLED,
+        "batch_min_duration": settings.WHISPER_BATCH_MIN_DURATION,
+        "distributed": settings.TRANSCRIPTION_DISTRIBUTED_ENABLED,
+        "distributed_min_duration": settings.TRANSCRIPTION_DISTRIBUTED_MIN_DURATION,
+        "chunk_seconds": settings.TRANSCRIPTION_CHUNK_SECONDS,
+        "chunk_overlap_seconds": settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS,
+        "noise_reduction_backend": settings.NOISE_REDUCTION_BACKEND,
+        "adaptive_preprocessing": settings.ADAPTIVE_PREPROCESSING_ENABLED,
+        "silence_compaction": settings.SILENCE_COMPACTION_ENABLED,
+    }
+
+
+class ResultCacheService:
+    """
+    内容アドレス方式の書き起こし結果キャッシュ
+
+    Redis 上のキー:
+    - result_cache:entry:{key}: 結果の JSON（TTL 付き）
+    - result_cache:index: 最後に使われた時刻（削除順の管理）
+    - result_cache:sizes: エントリごとのバイト数
+    - result_cache:stats: ヒット・ミスなどの累計
+    - result_cache:transcription:{書き起こしID}: 書き起こしの結果を保存・取得したエントリのキー（TTL 付き）
+    """
+
+    PREFIX = "result_cache"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url)
+        return self._client
+
+    def cache_key(self, audio_path: str, parameters: Dict[str, Any]) -> str:
+        """
+        音声ファイルとデコード設定からキャッシュキーを生成
+
+        Args:
+            audio_path: 元音声ファイルパス
+            parameters: 結果に影響する設定（モデル・言語・プロンプト・ビーム設定など）
+
+        Returns:
+            キャッシュキー（音声ハッシュ:設定ハッシュ）
+        """
+        encoded = json.dumps(parameters, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return f"{hash_audio_file(audio_path)}:{hashlib.sha256(encoded).hexdigest()[:16]}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュ済みの結果を取得
+
+        ヒットした場合は保存期間を延長する（新しい書き起こしの保持期間と揃える）。
+        Redis に接続できない場合はミスとして扱う。
+        """
+        entry_key = self._entry_key(key)
+        try:
+            raw = self.client.get(entry_key)
+            pipe = self.client.pipeline()
+            if raw is None:
+                pipe.hincrby(self._stats_key, "misses", 1)
+            else:
+                pipe.expire(entry_key, settings.RESULT_CACHE_TTL)
+                pipe.zadd(self._index_key, {key: time.time()})
+                pipe.hincrby(self._stats_key, "hits", 1)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read result cache: {e}")
+            return None
+        if raw is None:
+            return None
+
+        try:
+            result = json.loads(raw)
+        except ValueError as e:
+            logger.warning(f"Discarding unreadable result cache entry {key}: {e}")
+            self.delete(key)
+            return None
+        self._incr_float("audio_seconds_saved", result.get("audio_duration", 0.0))
+        self._incr_float("processing_seconds_saved", result.get("processing_time", 0.0))
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        結果を保存し、合計サイズの上限を超えた分を古い順に削除
+
+        Args:
+            key: cache_key() で生成したキー
+            result: segments / full_text / audio_duration などを含む辞書
+        """
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        if len(data) > settings.RESULT_CACHE_MAX_BYTES:
+            logger.info(f"Result too large to cache ({len(data)} bytes)")
+            return
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self._entry_key(key), data, ex=settings.RESULT_CACHE_TTL)
+            pipe.zadd(self._index_key, {key: time.time()})
+            pipe.hset(self._sizes_key, key, len(data))
+            pipe.hincrby(self._stats_key, "stores", 1)
+            pipe.execute()
+            self._evict()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to write result cache: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            pipe = self.client.pipeline()
+            pipe.delete(self._entry_key(key))
+            pipe.zrem(self._index_key, key)
+            pipe.hdel(self._sizes_key, key)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to delete result cache entry {key}: {e}")
+
+    def link(self, transcription_id: str, key: str) -> None:
+        """書き起こしとエントリを対応付ける（書き起こしの削除時にエントリも削除するため）"""
+        try:
+            self.client.set(self._transcription_key(transcription_id), key, ex=settings.RESULT_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to link result cache entry to {transcription_id}: {e}")
+
+    def purge(self, transcription_id: str) -> bool:
+        """
+        書き起こしに対応するエントリを削除
+
+        Returns:
+            エントリを削除した場合は True
+        """
+        link_key = self._transcription_key(transcription_id)
+        key = self.client.get(link_key)
+        if key is None:
+            return False
+        self.delete(key.decode() if isinstance(key, bytes) else key)
+        self.client.delete(link_key)
+        logger.info(f"Purged result cache entry of {transcription_id}")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット率などの累計と現在の使用量"""
+        try:
+            raw = self.client.hgetall(self._stats_key)
+            sizes = self.client.hvals(self._sizes_key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read result cache stats: {e}")
+            return {}
+        counters = {k.decode(): float(v) for k, v in raw.items()}
+        hits = int(counters.get("hits", 0))
+        misses = int(counters.get("misses", 0))
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stores": int(counters.get("stores", 0)),
+            "evictions": int(counters.get("evictions", 0)),
+            "entries": len(sizes),
+            "bytes": sum(int(size) for size in sizes),
+            "max_bytes": settings.RESULT_CACHE_MAX_BYTES,
+            "audio_seconds_saved": counters.get("audio_seconds_saved", 0.0),
+            "processing_seconds_saved": counters.get("processing_seconds_saved", 0.0),
+        }
+
+    def _evict(self) -> None:
+        """期限切れのエントリを索引から外し、上限を超えた分を最後に使われた時刻の古い順に削除"""
+        expired = self.client.zrangebyscore(self._index_key, "-inf", time.time() - settings.RESULT_CACHE_TTL)
+        if expired:
+            pipe = self.client.pipeline()
+            pipe.zrem(self._index_key, *expired)
+            pipe.hdel(self._sizes_key, *expired)
+            pipe.execute()
+
+        sizes = {k: int(v) for k, v in self.client.hgetall(self._sizes_key).items()}
+        total = sum(sizes.values())
+        if total <= settings.RESULT_CACHE_MAX_BYTES:
+            return
+
+        evicted = 0
+        for member in self.client.zrange(self._index_key, 0, -1):
+            if total <= settings.RESULT_CACHE_MAX_BYTES:
+                break
+            key = member.decode() if isinstance(member, bytes) else member
+            total -= sizes.get(member, 0)
+            self.delete(key)
+            evicted += 1
+        if evicted:
+            self.client.hincrby(self._stats_key, "evictions", evicted)
+            logger.info(f"Evicted {evicted} result cache entries ({total} bytes remain)")
+
+    def _incr_float(self, field: str, amount: float) -> None:
+        try:
+            self.client.hincrbyfloat(self._stats_key, field, amount)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to update result cache stats: {e}")
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.PREFIX}:entry:{key}"
+
+    @property
+    def _index_key(self) -> str:
+        return f"{self.PREFIX}:index"
+
+    @property
+    def _sizes_key(self) -> str:
+        return f"{self.PREFIX}:sizes"
+
+    @property
+    def _stats_key(self) -> str:
+        return f"{self.PREFIX}:stats"
+
+    def _transcription_key(self, transcription_id: str) -> str:
+        return f"{self.PREFIX}:transcription:{transcription_id}"
+
+
+# シングルトンインスタンス
+result_cache = ResultCacheService()
@@ -0,0 +1,194 @@
+"""
+書き起こし結果の保存
+
+書き起こし結果を Celery の結果バックエンドに返さず、セグメントを列ごとの配列にまとめた
+JSON を zlib で圧縮して transcription_result:{キー} に1回だけ保存する（TRANSCRIPTION_RESULT_TTL 付き）。
+タスクの戻り値には参照（キー・セグメント数・バイト数・期限）だけを入れる。
+
+全文テキストとミックス出力はセグメントから生成できるため保存せず、読み出し時に生成する。
+"""
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from ..core.config import settings
+from ..models.transcription import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# 時刻はミリ秒の整数、スコア類は小数点以下4桁で保存する
+_TIME_SCALE = 1000
+_SCORE_FIELDS = ("confidence", "compression_ratio", "no_speech_prob")
+
+
+def encode_segments(segments: List[TranscriptSegment]) -> Dict[str, Any]:
+    """
+    セグメントを列ごとの配列に変換（値がすべて None の列・話者のない列は省略）
+
+    Args:
+        segments: 書き起こしセグメント
+
+    Returns:
+        列名 → 値のリスト（話者は speakers のラベルの番号、話者なしは -1）
+    """
+    columns: Dict[str, Any] = {
+        "start": [round(segment.start * _TIME_SCALE) for segment in segments],
+        "end": [round(segment.end * _TIME_SCALE) for segment in segments],
+        "text": [segment.text for segment in segments],
+    }
+    for name in _SCORE_FIELDS:
+        values = [getattr(segment, name) for segment in segments]
+        if any(value is not None for value in values):
+            columns[name] = [round(value, 4) if value is not None else None for value in values]
+
+    speakers = sorted({segment.speaker for segment in segments if segment.speaker})
+    if speakers:
+        index = {speaker: i for i, speaker in enumerate(speakers)}
+        columns["speakers"] = speakers
+        columns["speaker"] = [index.get(segment.speaker, -1) for segment in segments]
+    return columns
+
+
+def decode_segments(columns: Dict[str, Any]) -> List[TranscriptSegment]:
+    """encode_segments() の逆変換"""
+    speakers = columns.get("speakers", [])
+    segments = []
+    for i, text in enumerate(columns["text"]):
+        speaker = columns["speaker"][i] if speakers else -1
+        segments.append(TranscriptSegment(
+            start=columns["start"][i] / _TIME_SCALE,
+            end=columns["end"][i] / _TIME_SCALE,
+            text=text,
+            speaker=speakers[speaker] if speaker >= 0 else None,
+            **{name: columns[name][i] for name in _SCORE_FIELDS if name in columns}
+        ))
+    return segments
+
+
+@dataclass
+class StoredResult:
+    """保存済みの書き起こし結果"""
+    segments: List[TranscriptSegment]
+    session_log: Optional[str] = None
+    created_at: Optional[str] = None  # 保存日時（ISO 8601、UTC）
+
+    @property
+    def full_text(self) -> str:
+        return " ".join(segment.text for segment in self.segments)
+
+
+def encode_result(result: StoredResult) -> bytes:
+    """書き起こし結果を保存形式（列ごとの配列の JSON を zlib で圧縮）に変換"""
+    record = {
+        "version": FORMAT_VERSION,
+        "created_at": result.created_at,
+        "session_log": result.session_log,
+        "segments": encode_segments(result.segments),
+    }
+    return zlib.compress(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        settings.TRANSCRIPTION_RESULT_COMPRESSION_LEVEL
+    )
+
+
+def decode_result(data: bytes) -> StoredResult:
+    """
+    encode_result() の逆変換
+
+    Raises:
+        ValueError: 保存形式として読めない場合
+    """
+    try:
+        record = json.loads(zlib.decompress(data))
+        if record["version"] != FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {record['version']}")
+        return StoredResult(
+            segments=decode_segments(record["segments"]),
+            session_log=record["session_log"],
+            created_at=record["created_at"],
+        )
+    except (zlib.error, KeyError, IndexError, TypeError) as e:
+        raise ValueError(str(e)) from e
+
+
+class TranscriptionResultStore:
+    """
+    圧縮した書き起こし結果の保存先
+
+    Redis 上のキー:
+    - transcription_result:{キー}: 結果（zlib 圧縮した JSON、TTL 付き）
+    """
+
+    PREFIX = "transcription_result"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url)
+        return self._client
+
+    def put(
+        self,
+        key: str,
+        segments: List[TranscriptSegment],
+        session_log: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        結果を保存（保存できない場合は例外を送出し、ジョブを失敗として扱う）
+
+        Args:
+            key: 保存キー（書き起こしID。話者別トラック・チャンクの途中結果は接尾辞付き）
+            segments: 書き起こしセグメント
+            session_log: セッションログ（ミックス出力の生成に使う）
+
+        Returns:
+            タスクの戻り値に入れる参照
+        """
+        created_at = datetime.utcnow()
+        data = encode_result(StoredResult(segments, session_log, created_at.isoformat()))
+        self.client.set(self._key(key), data, ex=settings.TRANSCRIPTION_RESULT_TTL)
+        return {
+            "key": key,
+            "segment_count": len(segments),
+            "bytes": len(data),
+            "expires_at": (created_at + timedelta(seconds=settings.TRANSCRIPTION_RESULT_TTL)).isoformat(),
+        }
+
+    def get(self, key: str) -> Optional[StoredResult]:
+        """保存済みの結果を取得（ない場合・期限切れ・読めない場合は None）"""
+        data = self.client.get(self._key(key))
+        if data is None:
+            return None
+        try:
+            return decode_result(data)
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable transcription result {key}: {e}")
+            return None
+
+    def exists(self, key: str) -> bool:
+        """保存済みの結果があるか（読み出さずに確認する）"""
+        return bool(self.client.exists(self._key(key)))
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self._key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to delete transcription result {key}: {e}")
+
+    def _key(self, key: str) -> str:
+        return f"{self.PREFIX}:{key}"
+
+
+# シングルトンインスタンス
+transcription_result_store = TranscriptionResultStore()
@@ -0,0 +1,185 @@
+"""
+スペクトルゲート方式のノイズ除去
+
+numpy の rfft による STFT と overlap-add でブロック単位に処理する
+ノイズプロファイルは最も静かなフレームから一度だけ推定し、以降のブロックで使い回す
+noisereduce（stationary=True）と同じ考え方だが、全体を一度に処理しないため
+メモリ使用量はブロック長で頭打ちになる
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+# ノイズプロファイル推定に使う静かなフレームの割合
+NOISE_FRAME_PERCENTILE = 20.0
+
+# プロファイル推定時に分析する最大フレーム数（長い音声は等間隔に間引く）
+MAX_PROFILE_FRAMES = 4096
+
+
+class NoiseProfile:
+    """周波数ビンごとのゲート閾値（dB）"""
+
+    def __init__(self, threshold_db: np.ndarray):
+        self.threshold_db = threshold_db
+
+
+class SpectralGateDenoiser:
+    """
+    ストリーミング対応スペクトルゲート
+
+    各 STFT フレームで、振幅がノイズ閾値を下回るビンを prop_decrease だけ減衰させる。
+    ブロック境界をまたぐため、未処理の入力末尾と overlap-add の途中結果を保持する。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        n_fft: int = 1024,
+        hop_length: Optional[int] = None,
+        prop_decrease: float = 0.5,
+        n_std_thresh: float = 1.5,
+        profile: Optional[NoiseProfile] = None
+    ):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length or n_fft // 4
+        if self.n_fft % self.hop_length:
+            raise ValueError("n_fft must be a multiple of hop_length")
+        self.overlap = self.n_fft // self.hop_length
+        self.prop_decrease = prop_decrease
+        self.n_std_thresh = n_std_thresh
+        self.profile = profile
+
+        self.window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+        # 分析窓と合成窓の積の重なり和（hop が n_fft の約数なら定数）
+        self._ola_norm = float(np.sum(self.window ** 2) / self.hop_length)
+        self.reset()
+
+    def reset(self) -> None:
+        """ストリーミング状態を初期化（ノイズプロファイルは保持）"""
+        # 先頭に n_fft - hop のゼロを置き、最初のサンプルから完全に重なるようにする
+        self._input = np.zeros(self.n_fft - self.hop_length, dtype=np.float32)
+        self._pending = np.zeros((self.overlap - 1, self.hop_length), dtype=np.float32)
+        self._skip = self.n_fft - self.hop_length
+        self._input_count = 0
+        self._output_count = 0
+
+    def estimate_profile(self, audio_data: np.ndarray) -> NoiseProfile:
+        """
+        最も静かなフレームからノイズプロファイルを推定
+
+        Args:
+            audio_data: プロファイル推定に使う音声（全体または間引いたサンプル）
+
+        Returns:
+            推定したノイズプロファイル（以降の処理にも使われる）
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float32)
+        if len(audio_data) < self.n_fft:
+            audio_data = np.pad(audio_data, (0, self.n_fft - len(audio_data)))
+
+        frames = sliding_window_view(audio_data, self.n_fft)[::self.hop_length]
+        if len(frames) > MAX_PROFILE_FRAMES:
+            frames = frames[np.linspace(0, len(frames) - 1, MAX_PROFILE_FRAMES).astype(int)]
+
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+        # フレームの静かさは全帯域のパワー和で判定する
+        frame_power = np.sum(spectrum.real ** 2 + spectrum.imag ** 2, axis=1)
+        quiet_frames = frame_power <= np.percentile(frame_power, NOISE_FRAME_PERCENTILE)
+        quiet = self._magnitude_db(spectrum[quiet_frames])
+
+        threshold = quiet.mean(axis=0) + self.n_std_thresh * quiet.std(axis=0)
+        self.profile = NoiseProfile(threshold.astype(np.float32))
+        logger.info(f"Noise profile estimated from {len(quiet)} quiet frames")
+        return self.profile
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        1ブロック分のノイズを除去
+
+        出力は STFT の重なり分だけ入力より遅れる（遅れた分は次ブロックまたは flush で返る）。
+        """
+        if self.profile is None:
+            raise RuntimeError("Noise profile is not estimated")
+        block = np.asarray(block, dtype=np.float32)
+        self._input_count += len(block)
+        return self._run(np.concatenate([self._input, block]))
+
+    def flush(self) -> np.ndarray:
+        """残りの出力を返し、出力長を入力長に揃える"""
+        output = self._run(np.concatenate([self._input, np.zeros(self.n_fft, dtype=np.float32)]))
+        remaining = self._input_count - self._output_count + len(output)
+        output = output[:max(remaining, 0)]
+        self.reset()
+        return output
+
+    def denoise(self, audio_data: np.ndarray, block_size: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        配列全体をブロック単位で処理
+
+        Args:
+            audio_data: 入力音声
+            block_size: 1ブロックのサンプル数
+            out: 出力先（audio_data 自身を渡すとその場で書き換える）
+
+        Returns:
+            ノイズ除去後の音声
+        """
+        if out is None:
+            out = np.empty(len(audio_data), dtype=np.float32)
+        written = 0
+        # 出力は入力より遅れるため、その場で書き換えても未読部分を上書きしない
+        for i in range(0, len(audio_data), block_size):
+            chunk = self.process(audio_data[i:i + block_size])
+            out[written:written + len(chunk)] = chunk
+            written += len(chunk)
+        tail = self.flush()
+        out[written:written + len(tail)] = tail
+        return out
+
+    def _run(self, buffer: np.ndarray) -> np.ndarray:
+        n_frames = (len(buffer) - self.n_fft) // self.hop_length + 1 if len(buffer) >= self.n_fft else 0
+        if n_frames <= 0:
+            self._input = buffer
+            return np.empty(0, dtype=np.float32)
+
+        frames = sliding_window_view(buffer, self.n_fft)[::self.hop_length][:n_frames]
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+
+        # ゲートマスク（閾値以上は 1、未満は 1 - prop_decrease）を周波数方向に平滑化
+        mask = (self._magnitude_db(spectrum) > self.profile.threshold_db).astype(np.float32)
+        mask[:, 1:-1] = 0.25 * mask[:, :-2] + 0.5 * mask[:, 1:-1] + 0.25 * mask[:, 2:]
+        spectrum *= mask * self.prop_decrease + (1.0 - self.prop_decrease)
+
+        restored = np.fft.irfft(spectrum, n=self.n_fft, axis=1).astype(np.float32)
+        restored *= self.window
+
+        # overlap-add: フレームを hop 長のサブブロックに分けて足し合わせる
+        hop = self.hop_length
+        accumulated = np.zeros((n_frames + self.overlap - 1, hop), dtype=np.float32)
+        accumulated[:self.overlap - 1] += self._pending
+        for r in range(self.overlap):
+            accumulated[r:r + n_frames] += restored[:, r * hop:(r + 1) * hop]
+
+        self._pending = accumulated[n_frames:].copy()
+        self._input = buffer[n_frames * hop:].copy()
+
+        output = accumulated[:n_frames].reshape(-1)
+        output /= self._ola_norm
+
+        # 先頭のゼロ埋め部分は出力しない
+        if self._skip:
+            dropped = min(self._skip, len(output))
+            output = output[dropped:]
+            self._skip -= dropped
+
+        self._output_count += len(output)
+        return output
+
+    def _magnitude_db(self, spectrum: np.ndarray) -> np.ndarray:
+        return 20 * np.log10(np.abs(spectrum) + 1e-10)
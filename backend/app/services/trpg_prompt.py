@@ -0,0 +1,44 @@
+"""
+TRPG 用語の初期プロンプト
+
+Whisper のデコードと結果キャッシュのキーの両方で使うため、faster-whisper を読み込まずに参照できるよう
+Whisper サービスから分けている。
+"""
+
+
+def get_trpg_initial_prompt() -> str:
+    """
+    TRPG用語辞書を含む初期プロンプトを生成
+
+    Whisper のゼロショット学習を活用し、TRPG特有の用語を
+    正しく認識させるための初期プロンプト
+    """
+    trpg_terms = [
+        # システム名
+        "クトゥルフ神話TRPG", "Call of Cthulhu", "CoC",
+        "ソード・ワールド", "Sword World",
+        "ダンジョンズ&ドラゴンズ", "D&D",
+
+        # 基本用語
+        "ゲームマスター", "GM", "キーパー", "KP",
+        "プレイヤーキャラクター", "PC", "ノンプレイヤーキャラクター", "NPC",
+        "ダイスロール", "ロール", "判定",
+
+        # ダイス表記
+        "1D100", "1d100", "2D6", "2d6", "1D20", "1d20",
+        "ファンブル", "クリティカル", "スペシャル",
+
+        # 能力値
+        "STR", "CON", "POW", "DEX", "APP", "SIZ", "INT", "EDU",
+        "HP", "MP", "SAN", "正気度",
+
+        # 技能
+        "目星", "聞き耳", "図書館", "説得", "心理学",
+        "回避", "隠れる", "忍び歩き",
+
+        # その他
+        "シナリオ", "セッション", "シーン",
+        "探索", "戦闘", "イベント",
+    ]
+
+    return "、".join(trpg_terms) + "。"
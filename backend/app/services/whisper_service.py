@@ -3,29 +3,79 @@ Faster-Whisper 音声認識サービス
 
 large-v3-turbo モデルを使用した高速・高精度な日本語書き起こし
 """
+import itertools
 import logging
-from typing import List, Optional
-from faster_whisper import WhisperModel
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+import numpy as np
 import subprocess
 
 from ..core.config import settings
 from ..models.transcription import TranscriptSegment
+from .audio_preprocessing import TimelineMap
+from .decoding_scheduler import DecodingProfile
+from .trpg_prompt import get_trpg_initial_prompt
+from .loop_detector import LoopDetector, LoopStats, normalize_text
+from .model_manager import ModelLifecycleManager, read_available_memory_mb
 
 logger = logging.getLogger(__name__)
 
+# Whisper の入力サンプリングレート
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class RefinementReport:
+    """低信頼度区間の再デコード結果"""
+    audio_seconds: float = 0.0  # 1パス目でデコードした音声長（秒、無音除去後）
+    flagged_segments: int = 0  # 低信頼度と判定したセグメント数
+    refined_seconds: float = 0.0  # 再デコードした音声長（秒）
+    accepted_spans: int = 0  # 再デコード結果を採用した区間数
+    decode_seconds: float = 0.0  # 再デコードの処理時間（秒）
+    spans: List[dict] = field(default_factory=list)  # 区間ごとの結果（元音声の時刻）
+
+    @property
+    def refined_ratio(self) -> float:
+        """再デコードした音声の割合"""
+        return self.refined_seconds / self.audio_seconds if self.audio_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "audio_seconds": self.audio_seconds,
+            "flagged_segments": self.flagged_segments,
+            "refined_seconds": self.refined_seconds,
+            "refined_ratio": self.refined_ratio,
+            "accepted_spans": self.accepted_spans,
+            "decode_seconds": self.decode_seconds,
+        }
+
 
 class WhisperService:
     """Whisper 音声認識サービス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        compute_type: Optional[str] = None
+    ):
         """
         Whisper モデルを初期化
 
         GPU(CUDA) での実行を前提とし、float16 精度で高速化
+
+        Args:
+            model_name: モデル名（省略時は WHISPER_MODEL）
+            device: デバイス（省略時は WHISPER_DEVICE）
+            compute_type: 計算精度（省略時は WHISPER_COMPUTE_TYPE）
         """
-        self.model = None
-        self.device = settings.WHISPER_DEVICE
-        self.compute_type = settings.WHISPER_COMPUTE_TYPE
+        self.model_name = model_name or settings.WHISPER_MODEL
+        self.device = device or settings.WHISPER_DEVICE
+        self.compute_type = compute_type or settings.WHISPER_COMPUTE_TYPE
 
         # CUDA 利用可能性チェック
         if self.device == "cuda" and not self._is_cuda_available():
@@ -34,126 +84,540 @@ class WhisperService:
             self.compute_type = "int8"
 
         logger.info(
-            f"Initializing Whisper model: {settings.WHISPER_MODEL} "
+            f"Initializing Whisper model: {self.model_name} "
             f"on {self.device} with {self.compute_type}"
         )
 
+        # モデルはジョブをまたいで常駐させ、アイドル時・メモリ逼迫時のみ解放する
+        self.model_manager = ModelLifecycleManager(
+            self._create_model,
+            name=f"Whisper model {self.model_name}",
+            idle_timeout=settings.WHISPER_MODEL_IDLE_TIMEOUT,
+            monitor_interval=settings.WHISPER_MODEL_MONITOR_INTERVAL,
+            pressure_check=self._memory_pressure
+        )
+
+    def _create_model(self) -> WhisperModel:
+        """モデルを生成（ModelLifecycleManager から呼ばれる）"""
+        return WhisperModel(
+            self.model_name,
+            device=self.device,
+            compute_type=self.compute_type,
+            download_root=None,  # デフォルトのキャッシュディレクトリを使用
+        )
+
     def load_model(self):
-        """モデルをロード（遅延初期化）"""
-        if self.model is None:
-            self.model = WhisperModel(
-                settings.WHISPER_MODEL,
-                device=self.device,
-                compute_type=self.compute_type,
-                download_root=None,  # デフォルトのキャッシュディレクトリを使用
-            )
-            logger.info("Whisper model loaded successfully")
+        """モデルをロード（ロード済みなら何もしない）"""
+        with self.model_manager.acquire():
+            pass
+
+    def model_stats(self) -> dict:
+        """モデルのロード・ヒット・アンロード回数"""
+        return self.model_manager.stats()
 
     def transcribe(
         self,
-        audio_path: str,
+        audio: Union[str, np.ndarray],
         language: str = "ja",
         task: str = "transcribe",
-        initial_prompt: Optional[str] = None
+        initial_prompt: Optional[str] = None,
+        timeline: Optional[TimelineMap] = None,
+        batched: Optional[bool] = None,
+        on_segment: Optional[Callable[[TranscriptSegment], None]] = None,
+        start_offset: float = 0.0,
+        profile: Optional[DecodingProfile] = None,
+        loop_stats: Optional[LoopStats] = None,
+        end_offset: Optional[float] = None
     ) -> tuple[List[TranscriptSegment], str]:
         """
-        音声ファイルを書き起こし
+        音声を書き起こし
 
         Args:
-            audio_path: 音声ファイルパス
+            audio: 音声ファイルパス、または 16kHz モノラル float32 配列
+                （配列の場合はデコードを省略してそのまま推論する）
             language: 言語コード（デフォルト: ja）
             task: タスク（transcribe または translate）
             initial_prompt: 初期プロンプト（TRPG用語辞書など）
+            timeline: 無音除去の対応表（指定時はタイムスタンプを元音声の時刻に戻す）
+            batched: バッチ推論を使うか（省略時は WHISPER_BATCHED_ENABLED かつ
+                WHISPER_BATCH_MIN_DURATION 以上の音声で使う）
+            on_segment: セグメントが確定するたびに呼ぶコールバック（進捗通知用）
+            start_offset: この時刻（秒、timeline 適用前）から書き起こす（チェックポイントからの再開用）
+            profile: デコード設定（省略時は WHISPER_* 設定）
+            loop_stats: 繰り返しループの検出結果の集計先
+            end_offset: この時刻（秒、timeline 適用前）までを書き起こす（分散書き起こしのチャンク用）
 
         Returns:
             (セグメントリスト, 全文テキスト)
         """
-        self.load_model()
-
         # TRPG用語を含む初期プロンプト
         if initial_prompt is None:
-            initial_prompt = self._get_trpg_initial_prompt()
-
-        logger.info(f"Starting transcription: {audio_path}")
-
-        # Whisper 実行
-        segments, info = self.model.transcribe(
-            audio_path,
-            language=language,
-            task=task,
-            beam_size=settings.WHISPER_BEAM_SIZE,
-            patience=settings.WHISPER_PATIENCE,
-            temperature=settings.WHISPER_TEMPERATURE,
-            vad_filter=settings.WHISPER_VAD_FILTER,
-            condition_on_previous_text=settings.WHISPER_CONDITION_ON_PREVIOUS_TEXT,
-            initial_prompt=initial_prompt,
-        )
+            initial_prompt = get_trpg_initial_prompt()
+        if profile is None:
+            profile = DecodingProfile.from_settings()
+
+        if start_offset > 0 or end_offset is not None:
+            if not isinstance(audio, np.ndarray):
+                audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+            end = int(end_offset * SAMPLE_RATE) if end_offset is not None else len(audio)
+            audio = np.asarray(audio[int(start_offset * SAMPLE_RATE):end], dtype=np.float32)
+            if len(audio) < SAMPLE_RATE // 10:
+                logger.info(f"Nothing left to transcribe after {start_offset:.2f} seconds")
+                return [], ""
+
+        if batched is None:
+            batched = settings.WHISPER_BATCHED_ENABLED
+            if batched and isinstance(audio, np.ndarray):
+                batched = len(audio) / SAMPLE_RATE >= settings.WHISPER_BATCH_MIN_DURATION
+
+        with self.model_manager.acquire() as model:
+            if batched:
+                return self._transcribe_batched(
+                    model, audio, language, task, initial_prompt, timeline, on_segment, start_offset, profile,
+                    loop_stats
+                )
+            return self._transcribe_with_model(
+                model, audio, language, task, initial_prompt, timeline, on_segment, start_offset, profile,
+                loop_stats
+            )
 
-        logger.info(
-            f"Detected language: {info.language} "
-            f"(probability: {info.language_probability:.2f})"
-        )
+    def _transcribe_with_model(
+        self,
+        model: WhisperModel,
+        audio: Union[str, np.ndarray],
+        language: str,
+        task: str,
+        initial_prompt: Optional[str],
+        timeline: Optional[TimelineMap],
+        on_segment: Optional[Callable[[TranscriptSegment], None]] = None,
+        offset: float = 0.0,
+        profile: Optional[DecodingProfile] = None,
+        loop_stats: Optional[LoopStats] = None
+    ) -> tuple[List[TranscriptSegment], str]:
+        """
+        ロード済みモデルで逐次デコード（セグメントの生成が終わるまでモデルを保持する）
 
-        # セグメント変換
-        transcript_segments = []
-        full_text_parts = []
+        繰り返しループを検出した場合はその時点でデコードを打ち切り、次の発話区間から
+        初期プロンプトだけの文脈でデコードをやり直す。
+        """
+        profile = profile or DecodingProfile.from_settings()
+        detect_loops = settings.WHISPER_LOOP_DETECTION_ENABLED
+        if isinstance(audio, np.ndarray):
+            logger.info(f"Starting transcription: in-memory buffer ({len(audio) / SAMPLE_RATE:.2f} seconds)")
+        else:
+            logger.info(f"Starting transcription: {audio}")
+            if detect_loops:
+                # ループ後に途中から再開するため配列にしておく
+                audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        transcript_segments: List[TranscriptSegment] = []
+        position = 0.0
+        while True:
+            # Whisper 実行
+            segments, info = model.transcribe(
+                audio[int(position * SAMPLE_RATE):] if position > 0 else audio,
+                language=language,
+                task=task,
+                beam_size=profile.beam_size,
+                best_of=profile.best_of,
+                patience=profile.patience,
+                temperature=profile.temperature,
+                vad_filter=settings.WHISPER_VAD_FILTER,
+                condition_on_previous_text=settings.WHISPER_CONDITION_ON_PREVIOUS_TEXT,
+                initial_prompt=initial_prompt,
+            )
+            if position == 0:
+                logger.info(
+                    f"Detected language: {info.language} "
+                    f"(probability: {info.language_probability:.2f})"
+                )
 
-        for segment in segments:
-            transcript_segments.append(
-                TranscriptSegment(
-                    start=segment.start,
-                    end=segment.end,
-                    text=segment.text.strip(),
-                    confidence=segment.avg_logprob if hasattr(segment, 'avg_logprob') else None
+            detector = LoopDetector() if detect_loops else None
+            transcript_segments.extend(
+                self._convert_segments(
+                    detector.filter(segments) if detector is not None else segments,
+                    timeline,
+                    offset=offset + position,
+                    on_segment=on_segment
                 )
             )
-            full_text_parts.append(segment.text.strip())
+            if detector is None or not detector.tripped:
+                break
+
+            # ループ区間を飛ばして次の発話から再開（文脈は初期プロンプトにリセットされる）
+            loop_start = position + detector.loop_start
+            loop_end = position + detector.loop_end
+            resume = self._next_speech_start(audio, loop_end)
+            skipped_until = resume if resume is not None else len(audio) / SAMPLE_RATE
+            logger.warning(
+                f"Repetition loop detected ({detector.reason}) at {offset + loop_start:.1f}s, "
+                f"dropped {detector.dropped} segments, skipping to {offset + skipped_until:.1f}s"
+            )
+            if loop_stats is not None:
+                loop_stats.loops_detected += 1
+                loop_stats.dropped_segments += detector.dropped
+                loop_stats.skipped_seconds += skipped_until - loop_start
+                loop_stats.loops.append({
+                    "start": self._to_original(offset + loop_start, timeline),
+                    "end": self._to_original(offset + skipped_until, timeline, is_end=True),
+                    "reason": detector.reason,
+                })
+            if resume is None or resume <= position:
+                break
+            position = resume
+
+        return transcript_segments, self._join_text(transcript_segments)
+
+    def _next_speech_start(self, audio: np.ndarray, after: float) -> Optional[float]:
+        """
+        指定時刻以降で最初の発話区間の開始時刻（秒）
 
-        full_text = " ".join(full_text_parts)
+        WHISPER_LOOP_SEARCH_SECONDS の範囲で発話が見つからなければその範囲の末尾から再開し、
+        音声の末尾に達した場合は None を返す。
+        """
+        start = int(after * SAMPLE_RATE)
+        end = min(start + int(settings.WHISPER_LOOP_SEARCH_SECONDS * SAMPLE_RATE), len(audio))
+        if end - start < SAMPLE_RATE // 10:
+            return None
+        speech = get_speech_timestamps(audio[start:end], VadOptions(), sampling_rate=SAMPLE_RATE)
+        if speech:
+            return (start + speech[0]["start"]) / SAMPLE_RATE
+        return end / SAMPLE_RATE if end < len(audio) else None
+
+    def _to_original(self, t: float, timeline: Optional[TimelineMap], is_end: bool = False) -> float:
+        return timeline.to_original(t, is_end=is_end) if timeline is not None else t
+
+    def _transcribe_batched(
+        self,
+        model: WhisperModel,
+        audio: Union[str, np.ndarray],
+        language: str,
+        task: str,
+        initial_prompt: Optional[str],
+        timeline: Optional[TimelineMap],
+        on_segment: Optional[Callable[[TranscriptSegment], None]] = None,
+        offset: float = 0.0,
+        profile: Optional[DecodingProfile] = None,
+        loop_stats: Optional[LoopStats] = None
+    ) -> tuple[List[TranscriptSegment], str]:
+        """
+        長時間音声のバッチ推論
+
+        VAD で発話区間を検出して WHISPER_BATCH_CHUNK_SECONDS 以下のチャンクにまとめ、
+        BatchedInferencePipeline で WHISPER_BATCH_SIZE 個ずつ同時にデコードする。
+        メル特徴量はチャンク分まとめて計算されるため、WHISPER_BATCH_WINDOW_SECONDS ごとの
+        範囲に分けて推論し、各範囲の開始時刻を足して全体のタイムスタンプに戻す。
 
+        チャンクは前のテキストを文脈にせず独立にデコードされる（condition_on_previous_text は効かない）。
+        それでも無音・音楽のチャンクで同じフレーズが並ぶことがあるため、逐次デコードと同じく
+        繰り返しループを検出して捨てる（_drop_batched_loops）。
+        """
+        profile = profile or DecodingProfile.from_settings()
+        if not isinstance(audio, np.ndarray):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        duration = len(audio) / SAMPLE_RATE
+        chunk_seconds = int(min(settings.WHISPER_BATCH_CHUNK_SECONDS, model.feature_extractor.chunk_length))
+
+        speech = get_speech_timestamps(
+            audio,
+            VadOptions(
+                max_speech_duration_s=chunk_seconds,
+                min_silence_duration_ms=settings.WHISPER_BATCH_MIN_SILENCE_MS
+            ),
+            sampling_rate=SAMPLE_RATE
+        )
+        windows = self._group_speech_windows(speech, int(settings.WHISPER_BATCH_WINDOW_SECONDS * SAMPLE_RATE))
         logger.info(
-            f"Transcription completed: {len(transcript_segments)} segments, "
-            f"{len(full_text)} characters"
+            f"Starting batched transcription: {duration:.2f} seconds, "
+            f"{len(speech)} speech regions in {len(windows)} windows "
+            f"(batch size {profile.batch_size})"
         )
 
-        return transcript_segments, full_text
+        pipeline = BatchedInferencePipeline(model)
+        transcript_segments: List[TranscriptSegment] = []
+        for window_start, window_end, regions in windows:
+            window_offset = offset + window_start / SAMPLE_RATE
+            segments, _ = pipeline.transcribe(
+                audio[window_start:window_end],
+                language=language,
+                task=task,
+                beam_size=profile.beam_size,
+                best_of=profile.best_of,
+                patience=profile.patience,
+                temperature=profile.temperature,
+                initial_prompt=initial_prompt,
+                vad_filter=False,
+                clip_timestamps=[
+                    {
+                        "start": (region["start"] - window_start) / SAMPLE_RATE,
+                        "end": (region["end"] - window_start) / SAMPLE_RATE,
+                    }
+                    for region in regions
+                ],
+                chunk_length=chunk_seconds,
+                batch_size=profile.batch_size,
+                without_timestamps=False,
+            )
+            if settings.WHISPER_LOOP_DETECTION_ENABLED:
+                segments = self._drop_batched_loops(segments, timeline, window_offset, loop_stats)
+            transcript_segments.extend(self._convert_segments(segments, timeline, offset=window_offset, on_segment=on_segment))
+
+        transcript_segments.sort(key=lambda seg: (seg.start, seg.end))
+        return transcript_segments, self._join_text(transcript_segments)
 
-    def _get_trpg_initial_prompt(self) -> str:
+    def _drop_batched_loops(
+        self,
+        segments: Iterable,
+        timeline: Optional[TimelineMap],
+        offset: float,
+        loop_stats: Optional[LoopStats]
+    ) -> Iterator:
         """
-        TRPG用語辞書を含む初期プロンプトを生成
+        バッチ推論のセグメント列から繰り返しループを除く
 
-        Whisper のゼロショット学習を活用し、TRPG特有の用語を
-        正しく認識させるための初期プロンプト
+        各チャンクは独立にデコードされるため、ループを検出してもデコードはやり直さない。
+        繰り返し部分と、それに続く同じテキストのセグメントを捨てて、残りのセグメントの検査を続ける。
         """
-        trpg_terms = [
-            # システム名
-            "クトゥルフ神話TRPG", "Call of Cthulhu", "CoC",
-            "ソード・ワールド", "Sword World",
-            "ダンジョンズ&ドラゴンズ", "D&D",
+        remaining = iter(segments)
+        while True:
+            detector = LoopDetector()
+            yield from detector.filter(remaining)
+            if not detector.tripped:
+                return
+
+            loop_start, loop_end = detector.loop_start, detector.loop_end
+            dropped = detector.dropped
+            resumed = None
+            for segment in remaining:
+                if normalize_text(segment.text) not in detector.loop_texts:
+                    resumed = segment
+                    break
+                loop_end = segment.end
+                dropped += 1
+            logger.warning(
+                f"Repetition loop detected in batched decoding ({detector.reason}) at {offset + loop_start:.1f}s, "
+                f"dropped {dropped} segments up to {offset + loop_end:.1f}s"
+            )
+            if loop_stats is not None:
+                loop_stats.loops_detected += 1
+                loop_stats.dropped_segments += dropped
+                loop_stats.skipped_seconds += loop_end - loop_start
+                loop_stats.loops.append({
+                    "start": self._to_original(offset + loop_start, timeline),
+                    "end": self._to_original(offset + loop_end, timeline, is_end=True),
+                    "reason": detector.reason,
+                })
+            if resumed is None:
+                return
+            remaining = itertools.chain([resumed], remaining)
+
+    def refine_low_confidence(
+        self,
+        audio: np.ndarray,
+        segments: List[TranscriptSegment],
+        language: str = "ja",
+        task: str = "transcribe",
+        initial_prompt: Optional[str] = None,
+        timeline: Optional[TimelineMap] = None,
+        profile: Optional[DecodingProfile] = None
+    ) -> tuple[List[TranscriptSegment], RefinementReport]:
+        """
+        低信頼度のセグメントだけを高コストの設定で再デコードして差し替え
 
-            # 基本用語
-            "ゲームマスター", "GM", "キーパー", "KP",
-            "プレイヤーキャラクター", "PC", "ノンプレイヤーキャラクター", "NPC",
-            "ダイスロール", "ロール", "判定",
+        貪欲法（beam 1）の1パス目の結果から avg_logprob / compression_ratio / no_speech_prob で
+        低信頼度のセグメントを選び、隣接するものを区間にまとめて profile の設定で再デコードする。
+        再デコード結果の平均対数尤度が1パス目以上の区間だけを採用する。
 
-            # ダイス表記
-            "1D100", "1d100", "2D6", "2d6", "1D20", "1d20",
-            "ファンブル", "クリティカル", "スペシャル",
+        Args:
+            audio: 1パス目に渡した 16kHz モノラル音声（無音除去後）
+            segments: 1パス目のセグメント（元音声の時刻）
+            language: 言語コード
+            task: タスク（transcribe または translate）
+            initial_prompt: 初期プロンプト
+            timeline: 無音除去の対応表
+            profile: 再デコードの設定（省略時は WHISPER_* 設定）
 
-            # 能力値
-            "STR", "CON", "POW", "DEX", "APP", "SIZ", "INT", "EDU",
-            "HP", "MP", "SAN", "正気度",
+        Returns:
+            (差し替え後のセグメントリスト, 再デコードの集計)
+        """
+        if initial_prompt is None:
+            initial_prompt = get_trpg_initial_prompt()
+        profile = profile or DecodingProfile.from_settings()
+        report = RefinementReport(audio_seconds=len(audio) / SAMPLE_RATE)
+
+        segments = sorted(segments, key=lambda seg: (seg.start, seg.end))
+        flagged = [self._is_low_confidence(seg) for seg in segments]
+        report.flagged_segments = sum(flagged)
+        spans = self._plan_refinement_spans(segments, flagged, timeline, report.audio_seconds)
+        if not spans:
+            return segments, report
+
+        refined = list(segments)
+        start_time = time.perf_counter()
+        with self.model_manager.acquire() as model:
+            for first, last, span_start, span_end in spans:
+                clip = audio[int(span_start * SAMPLE_RATE):int(span_end * SAMPLE_RATE)]
+                decoded, _ = model.transcribe(
+                    clip,
+                    language=language,
+                    task=task,
+                    beam_size=profile.beam_size,
+                    best_of=profile.best_of,
+                    patience=profile.patience,
+                    temperature=profile.temperature,
+                    vad_filter=False,
+                    condition_on_previous_text=False,
+                    initial_prompt=initial_prompt,
+                )
+                candidates = self._convert_segments(decoded, timeline, offset=span_start)
+                original = segments[first:last + 1]
+                accepted = self._accept_refinement(original, candidates)
+                if accepted:
+                    refined[first:last + 1] = [None] * (last + 1 - first)
+                    refined.extend(candidates)
+                    report.accepted_spans += 1
+
+                report.refined_seconds += span_end - span_start
+                report.spans.append({
+                    "start": original[0].start,
+                    "end": original[-1].end,
+                    "accepted": accepted,
+                    "segments": candidates if accepted else [],
+                })
+        report.decode_seconds = time.perf_counter() - start_time
+
+        refined = sorted((seg for seg in refined if seg is not None), key=lambda seg: (seg.start, seg.end))
+        logger.info(
+            f"Refined {len(spans)} low-confidence spans ({report.refined_ratio:.1%} of audio, "
+            f"{report.accepted_spans} accepted) in {report.decode_seconds:.1f}s"
+        )
+        return refined, report
+
+    def _is_low_confidence(self, segment: TranscriptSegment) -> bool:
+        """再デコード対象のセグメントか"""
+        return (
+            (segment.confidence is not None
+             and segment.confidence < settings.WHISPER_REFINE_LOGPROB_THRESHOLD)
+            or (segment.compression_ratio is not None
+                and segment.compression_ratio > settings.WHISPER_REFINE_COMPRESSION_RATIO_THRESHOLD)
+            or (segment.no_speech_prob is not None
+                and segment.no_speech_prob > settings.WHISPER_REFINE_NO_SPEECH_THRESHOLD)
+        )
+
+    def _plan_refinement_spans(
+        self,
+        segments: List[TranscriptSegment],
+        flagged: List[bool],
+        timeline: Optional[TimelineMap],
+        duration: float
+    ) -> List[tuple]:
+        """
+        低信頼度のセグメントを再デコード区間にまとめる
+
+        間隔が WHISPER_REFINE_MERGE_GAP 以下の低信頼度セグメントは同じ区間にまとめ、
+        前後に WHISPER_REFINE_PADDING を足す（隣のセグメントには食い込ませない）。
+
+        Returns:
+            [(先頭セグメント番号, 末尾セグメント番号, 開始時刻, 終了時刻), ...]
+            （時刻は無音除去後の音声上の秒）
+        """
+        def compact(t: float) -> float:
+            return timeline.to_compact(t) if timeline is not None else t
+
+        groups: List[List[int]] = []
+        for i, is_flagged in enumerate(flagged):
+            if not is_flagged:
+                continue
+            if groups and compact(segments[i].start) - compact(segments[groups[-1][-1]].end) <= settings.WHISPER_REFINE_MERGE_GAP:
+                groups[-1].extend(range(groups[-1][-1] + 1, i + 1))
+            else:
+                groups.append([i])
+
+        spans = []
+        padding = settings.WHISPER_REFINE_PADDING
+        for group in groups:
+            first, last = group[0], group[-1]
+            lower = compact(segments[first - 1].end) if first > 0 else 0.0
+            upper = compact(segments[last + 1].start) if last + 1 < len(segments) else duration
+            span_start = max(compact(segments[first].start) - padding, lower, 0.0)
+            span_end = min(compact(segments[last].end) + padding, upper, duration)
+            if span_end - span_start > 0.1:
+                spans.append((first, last, span_start, span_end))
+        return spans
+
+    def _accept_refinement(
+        self,
+        original: List[TranscriptSegment],
+        candidates: List[TranscriptSegment]
+    ) -> bool:
+        """再デコード結果を採用するか（長さで重み付けした平均対数尤度で比較）"""
+        if not candidates:
+            # 再デコードで何も出なければ、無音と判定された区間のみ削除する
+            return all(
+                seg.no_speech_prob is not None
+                and seg.no_speech_prob > settings.WHISPER_REFINE_NO_SPEECH_THRESHOLD
+                for seg in original
+            )
 
-            # 技能
-            "目星", "聞き耳", "図書館", "説得", "心理学",
-            "回避", "隠れる", "忍び歩き",
+        def score(segments: List[TranscriptSegment]) -> float:
+            weights = [max(seg.end - seg.start, 0.01) for seg in segments]
+            values = [seg.confidence if seg.confidence is not None else -10.0 for seg in segments]
+            return float(np.average(values, weights=weights))
+
+        return score(candidates) >= score(original)
+
+    def _group_speech_windows(self, speech: List[dict], window_samples: int) -> List[tuple]:
+        """連続する発話区間を window_samples 以下の範囲にまとめる（発話区間は分割しない）"""
+        windows = []
+        current: List[dict] = []
+        for region in speech:
+            if current and region["end"] - current[0]["start"] > window_samples:
+                windows.append((current[0]["start"], current[-1]["end"], current))
+                current = []
+            current.append(region)
+        if current:
+            windows.append((current[0]["start"], current[-1]["end"], current))
+        return windows
+
+    def _convert_segments(
+        self,
+        segments: Iterable,
+        timeline: Optional[TimelineMap],
+        offset: float = 0.0,
+        on_segment: Optional[Callable[[TranscriptSegment], None]] = None
+    ) -> List[TranscriptSegment]:
+        """
+        faster-whisper のセグメントを元音声の時刻の TranscriptSegment に変換
 
-            # その他
-            "シナリオ", "セッション", "シーン",
-            "探索", "戦闘", "イベント",
-        ]
+        セグメントはデコードされた順に逐次生成されるため、on_segment は書き起こしの進行に合わせて呼ばれる。
+        """
+        transcript_segments = []
+        for segment in segments:
+            start, end = segment.start + offset, segment.end + offset
+            if timeline is not None:
+                start = timeline.to_original(start)
+                end = timeline.to_original(end, is_end=True)
+
+            transcript_segment = TranscriptSegment(
+                start=start,
+                end=end,
+                text=segment.text.strip(),
+                confidence=segment.avg_logprob if hasattr(segment, 'avg_logprob') else None,
+                compression_ratio=getattr(segment, 'compression_ratio', None),
+                no_speech_prob=getattr(segment, 'no_speech_prob', None)
+            )
+            transcript_segments.append(transcript_segment)
+            if on_segment is not None:
+                on_segment(transcript_segment)
+        return transcript_segments
 
-        return "、".join(trpg_terms) + "。"
+    def _join_text(self, transcript_segments: List[TranscriptSegment]) -> str:
+        full_text = " ".join(segment.text for segment in transcript_segments)
+        logger.info(
+            f"Transcription completed: {len(transcript_segments)} segments, "
+            f"{len(full_text)} characters"
+        )
+        return full_text
 
     def _is_cuda_available(self) -> bool:
         """
@@ -172,13 +636,96 @@ class WhisperService:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
+    def _memory_pressure(self) -> Optional[str]:
+        """
+        メモリ逼迫の確認（ModelLifecycleManager の監視スレッドから呼ばれる）
+
+        Returns:
+            逼迫している場合は理由（ホストメモリ / GPU メモリ）、それ以外は None
+        """
+        available = read_available_memory_mb()
+        if available is not None and available < settings.WHISPER_MODEL_MIN_AVAILABLE_MEMORY_MB:
+            return "host_memory_pressure"
+
+        if self.device == "cuda":
+            try:
+                result = subprocess.run(
+                    ['nvidia-smi', '--query-gpu=memory.free', '--format=csv,noheader,nounits'],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=5
+                )
+                free = [float(line) for line in result.stdout.decode().split()]
+                if free and min(free) < settings.WHISPER_MODEL_MIN_FREE_GPU_MEMORY_MB:
+                    return "gpu_memory_pressure"
+            except (FileNotFoundError, ValueError, subprocess.TimeoutExpired):
+                pass
+
+        return None
+
     def cleanup(self):
-        """モデルをメモリから解放"""
-        if self.model is not None:
-            del self.model
-            self.model = None
-            logger.info("Whisper model cleaned up")
+        """モデルをメモリから解放（ワーカー終了時など。通常のジョブ終了時は呼ばない）"""
+        self.model_manager.evict("cleanup")
+
+
+def detect_speech(audio: np.ndarray, max_speech_seconds: float) -> List[tuple]:
+    """
+    発話区間を検出（分散書き起こしのチャンク分割用、モデルは使わない）
+
+    Args:
+        audio: 16kHz モノラル float32 配列
+        max_speech_seconds: 発話区間の最大長（これより長い発話は分割する）
+
+    Returns:
+        [(開始秒, 終了秒), ...]
+    """
+    speech = get_speech_timestamps(
+        audio,
+        VadOptions(
+            max_speech_duration_s=max_speech_seconds,
+            min_silence_duration_ms=settings.WHISPER_BATCH_MIN_SILENCE_MS
+        ),
+        sampling_rate=SAMPLE_RATE
+    )
+    return [(region["start"] / SAMPLE_RATE, region["end"] / SAMPLE_RATE) for region in speech]
+
+
+# シングルトンインスタンス（初回利用時に生成し、デバイスの確認は書き起こしを行うプロセスでのみ行う）
+_whisper_service: Optional[WhisperService] = None
+
+# 下書き用の小さいモデル（DRAFT_TRANSCRIPT_ENABLED の場合のみ初回利用時に生成）
+_draft_whisper_service: Optional[WhisperService] = None
+
+
+def get_whisper_service() -> WhisperService:
+    """書き起こし用の Whisper サービスを取得"""
+    global _whisper_service
+    if _whisper_service is None:
+        _whisper_service = WhisperService()
+    return _whisper_service
+
+
+def get_draft_whisper_service() -> WhisperService:
+    """下書き用の Whisper サービスを取得"""
+    global _draft_whisper_service
+    if _draft_whisper_service is None:
+        _draft_whisper_service = WhisperService(
+            model_name=settings.DRAFT_WHISPER_MODEL,
+            device=settings.DRAFT_WHISPER_DEVICE,
+            compute_type=settings.DRAFT_WHISPER_COMPUTE_TYPE
+        )
+    return _draft_whisper_service
+
+
+def cleanup_services() -> None:
+    """生成済みのサービスの常駐モデルを解放"""
+    for service in (_whisper_service, _draft_whisper_service):
+        if service is not None:
+            service.cleanup()
 
 
-# シングルトンインスタンス
-whisper_service = WhisperService()
+def __getattr__(name: str):
+    # 従来の `from .whisper_service import whisper_service` も初回参照時の生成にする
+    if name == "whisper_service":
+        return get_whisper_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -22,10 +22,27 @@ celery_app.conf.update(
     timezone="Asia/Tokyo",
     enable_utc=True,
     task_track_started=True,
+    # タスク結果には書き起こし結果の参照だけを入れ、参照先と同じ期間で削除する
+    result_expires=settings.TRANSCRIPTION_RESULT_TTL,
     task_time_limit=3600 * 4,  # 4時間タイムアウト
     task_soft_time_limit=3600 * 3.5,  # 3.5時間でソフトタイムアウト
     worker_prefetch_multiplier=1,  # GPU処理は1つずつ
-    worker_max_tasks_per_child=10,  # メモリリーク対策
+    # メモリリーク対策（プロセス再生成のたびにモデルの再ロードが発生するため、
+    # タスク数は大きめにしてメモリ使用量の上限で再生成する）
+    worker_max_tasks_per_child=settings.CELERY_WORKER_MAX_TASKS_PER_CHILD,
+    worker_max_memory_per_child=settings.CELERY_WORKER_MAX_MEMORY_PER_CHILD_MB * 1024,  # KB 単位
+    # 前処理（CPU）と書き起こし（GPU）を別キューに分け、それぞれのワーカーで処理する
+    task_routes={
+        "preprocess_transcription": {"queue": settings.CELERY_PREPROCESS_QUEUE},
+        "process_transcription": {"queue": settings.CELERY_TRANSCRIBE_QUEUE},
+        "transcribe_prepared": {"queue": settings.CELERY_TRANSCRIBE_QUEUE},
+        "transcribe_track": {"queue": settings.CELERY_TRANSCRIBE_QUEUE},
+        "transcribe_chunk": {"queue": settings.CELERY_TRANSCRIBE_QUEUE},
+        # チャンクの統合は GPU を使わない
+        "merge_chunk_transcriptions": {"queue": settings.CELERY_PREPROCESS_QUEUE},
+        # 待ちジョブの投入は GPU の空きを待たずに実行する
+        "release_scheduled_jobs": {"queue": settings.CELERY_PREPROCESS_QUEUE},
+    },
 )
 
 # Celery Beat スケジュール（定期タスク）
@@ -34,4 +51,8 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.cleanup_tasks.cleanup_old_transcriptions',
         'schedule': crontab(minute='*/30'),  # 30分ごとに実行
     },
+    'release-scheduled-jobs': {
+        'task': 'release_scheduled_jobs',
+        'schedule': 60.0,  # 1分ごと（ジョブ完了時の投入の取りこぼし対策）
+    },
 }
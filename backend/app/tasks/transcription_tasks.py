@@ -2,22 +2,704 @@
 書き起こしタスク
 
 Celery ワーカーで実行される非同期処理
+
+faster_whisper・noisereduce・numpy に依存するサービス（Whisper・音声前処理・音質分析）は
+タスクの実行時にインポートする。celery_app の include でこのモジュールを読み込む
+Beat・クリーンアップ専用ワーカーではデバイスの確認やモデル関連の読み込みを行わない。
 """
 import logging
 import os
+import sys
+import threading
 import time
+import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import redis
+from celery import chain, chord, group
+from celery.result import AsyncResult
+from celery.signals import worker_process_shutdown
+from kombu.exceptions import OperationalError
 
 from .celery_app import celery_app
-from ..services.whisper_service import whisper_service
-from ..services.audio_preprocessing import audio_preprocessor
-from ..services.output_formatter import output_formatter
+from ..services.progress_stream import progress_stream
+from ..services.decoding_scheduler import DecodingProfile, decoding_scheduler
+from ..services.loop_detector import LoopStats
+from ..services.checkpoint import CheckpointWriter, TranscriptionCheckpoint, checkpoint_store
+from ..services.result_cache import decode_parameters, result_cache
+from ..services.result_store import transcription_result_store
+from ..services.job_scheduler import ScheduledJob, job_scheduler
+from ..services.eta_estimator import eta_estimator
+from ..models.transcription import TranscriptSegment
+from ..models.user import PlanType
 from ..core.config import settings
 
+if TYPE_CHECKING:
+    from ..services.prepared_audio import PreparedAudio
+
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(bind=True, name="process_transcription")
+# Whisper サービスのモジュール名（読み込み済みかどうかの確認用）
+_WHISPER_SERVICE_MODULE = f"{__name__.rsplit('.', 2)[0]}.services.whisper_service"
+
+
+@worker_process_shutdown.connect
+def _release_model(**kwargs):
+    """ワーカープロセス終了時に常駐モデルを解放（書き起こしを行っていないプロセスでは何もしない）"""
+    whisper_module = sys.modules.get(_WHISPER_SERVICE_MODULE)
+    if whisper_module is not None:
+        whisper_module.cleanup_services()
+
+
+class _DraftCancelled(Exception):
+    """本番モデルの書き起こしが終わったため下書きを打ち切る"""
+
+
+class _DraftTranscription:
+    """
+    小さいモデルによる下書きの書き起こし
+
+    確定したセグメントを draft イベントとして進捗ストリームへ追記する。下書きの失敗はジョブの失敗にしない。
+
+    - 本番モデルと別のデバイスの場合（start）: 並行して別スレッドで全体を下書きし、
+      本番モデルが先に終わった場合は次のセグメントで打ち切る
+    - 本番モデルと同じ GPU の場合（run）: 並行させると本番のデコードが遅くなるため、
+      本番の前に先頭の DRAFT_SHARED_DEVICE_SECONDS 秒だけを下書きする
+    """
+
+    def __init__(
+        self,
+        transcription_id: str,
+        audio_data,
+        audio_duration: float,
+        timeline=None,
+        start_offset: float = 0.0,
+        speaker: Optional[str] = None,
+        stream_fields: Optional[Dict[str, Any]] = None,
+        end_offset: Optional[float] = None
+    ):
+        self.audio_data = audio_data
+        self.timeline = timeline
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        self.speaker = speaker
+        self.reporter = progress_stream.create_reporter(
+            transcription_id,
+            audio_duration,
+            extra=stream_fields,
+            event="draft"
+        )
+        self.segments = 0
+        self.completed_at: Optional[float] = None  # 下書きが最後まで終わった時刻（time.time()）
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"draft-{transcription_id}", daemon=True)
+
+    def start(self) -> None:
+        """別スレッドで下書きを開始"""
+        self.started_at = time.time()
+        self._thread.start()
+
+    def run(self) -> None:
+        """この場で下書きを最後まで実行"""
+        self.started_at = time.time()
+        self._run()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        下書きを打ち切ってスレッドの終了を待つ
+
+        Returns:
+            下書きの計測結果（開始からの経過秒）
+        """
+        self._cancel.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        first_published_at = self.reporter.first_published_at
+        return {
+            "model": settings.DRAFT_WHISPER_MODEL,
+            "segments": self.segments,
+            "first_segment_seconds": (
+                first_published_at - self.started_at if first_published_at is not None else None
+            ),
+            "completed_seconds": (
+                self.completed_at - self.started_at if self.completed_at is not None else None
+            ),
+            "background": self._thread.ident is not None,
+            "end_offset": self.end_offset,
+            "cancelled": self.completed_at is None and self.error is None,
+            "error": self.error,
+        }
+
+    def _on_segment(self, segment: TranscriptSegment) -> None:
+        if self._cancel.is_set():
+            raise _DraftCancelled()
+        segment.speaker = self.speaker
+        self.reporter.add(segment)
+        self.segments += 1
+
+    def _run(self) -> None:
+        from ..services.whisper_service import get_draft_whisper_service
+
+        try:
+            get_draft_whisper_service().transcribe(
+                self.audio_data,
+                language="ja",
+                task="transcribe",
+                timeline=self.timeline,
+                on_segment=self._on_segment,
+                start_offset=self.start_offset,
+                end_offset=self.end_offset,
+                profile=DecodingProfile.greedy()
+            )
+            self.reporter.flush()
+            self.completed_at = time.time()
+        except _DraftCancelled:
+            logger.info("Draft transcription cancelled: final transcription finished first")
+        except Exception as e:
+            self.error = str(e)
+            logger.warning(f"Draft transcription failed: {e}")
+
+
+def _draft_shares_device() -> bool:
+    """下書きモデルが本番モデルと同じ GPU で動くか"""
+    return settings.DRAFT_WHISPER_DEVICE != "cpu" and settings.DRAFT_WHISPER_DEVICE == settings.WHISPER_DEVICE
+
+
+def _prepare_audio(audio_path: str, on_stage: Callable[..., None]) -> "PreparedAudio":
+    """
+    音声ファイルを前処理し、長い無音区間を除去して Whisper に渡せる形にする（CPU 処理）
+
+    Args:
+        audio_path: 音声ファイルパス
+        on_stage: 進捗通知コールバック
+
+    Returns:
+        前処理済み音声と無音除去の対応表・前処理レポート
+    """
+    from ..services.audio_preprocessing import audio_preprocessor
+    from ..services.audio_quality import PreprocessingDecision, signal_quality_analyzer
+    from ..services.prepared_audio import PreparedAudio
+
+    # 1. 音声前処理
+    logger.info("Step 1/4: Audio preprocessing")
+    on_stage("preprocessing", 25)
+
+    # 音声品質を間引き分析し、必要な前処理ステージだけを実行
+    quality = None
+    if settings.ADAPTIVE_PREPROCESSING_ENABLED:
+        quality = signal_quality_analyzer.analyze_file(audio_path)
+        decision = signal_quality_analyzer.decide(quality)
+    else:
+        decision = PreprocessingDecision(
+            apply_noise_reduction=True,
+            normalize_audio=True,
+            reasons=["adaptive preprocessing disabled"]
+        )
+
+    # 前処理結果はメモリ上のバッファで受け渡す（WAV はデバッグ時のみ書き出し）
+    debug_output_path = None
+    if settings.AUDIO_DEBUG_SAVE_PREPROCESSED:
+        debug_output_path = os.path.join(
+            settings.RAMDISK_PATH,
+            f"preprocessed_{os.path.basename(audio_path)}"
+        )
+
+    preprocessed = audio_preprocessor.preprocess_to_buffer(
+        audio_path,
+        apply_noise_reduction=decision.apply_noise_reduction,
+        normalize_audio=decision.normalize_audio,
+        streaming=settings.AUDIO_STREAMING_ENABLED,
+        debug_output_path=debug_output_path,
+        workers=settings.AUDIO_PREPROCESS_WORKERS
+    )
+
+    audio_duration = preprocessed.duration
+    logger.info(f"Audio duration: {audio_duration:.2f} seconds")
+
+    # スキップしたステージの推定節約時間
+    skipped_stages = []
+    if not decision.apply_noise_reduction:
+        skipped_stages.append("noise_reduction")
+    if not decision.normalize_audio:
+        skipped_stages.append("normalization")
+    preprocessing_time_saved = sum(
+        audio_preprocessor.estimate_stage_time(stage, audio_duration)
+        for stage in skipped_stages
+    )
+    preprocessing_report = {
+        "quality": quality.to_dict() if quality else None,
+        "decision": decision.to_dict(),
+        "skipped_stages": skipped_stages,
+        "stage_times": preprocessed.stage_times,
+        "estimated_time_saved": preprocessing_time_saved,
+    }
+
+    # 長い無音区間を除去（タイムスタンプは書き起こし後に元の時刻へ戻す）
+    audio_data = preprocessed.audio
+    sample_rate = preprocessed.sample_rate
+    timeline = None
+    if settings.SILENCE_COMPACTION_ENABLED:
+        audio_data, timeline = audio_preprocessor.compact_silence(
+            audio_data,
+            preprocessed.sample_rate
+        )
+    del preprocessed
+
+    return PreparedAudio(
+        audio=audio_data,
+        sample_rate=sample_rate,
+        audio_duration=audio_duration,
+        timeline=timeline,
+        preprocessing=preprocessing_report
+    )
+
+
+
+def _transcribe_audio(
+    audio_path: str,
+    transcription_id: str,
+    on_stage: Callable[..., None],
+    speaker: Optional[str] = None,
+    stream_fields: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[TranscriptionCheckpoint] = None,
+    started_at: Optional[float] = None,
+    prepared: Optional["PreparedAudio"] = None
+) -> Dict[str, Any]:
+    """
+    1つの音声ファイルを前処理して書き起こす（単一音声・話者別トラック共通）
+
+    書き起こし中は確定したセグメントと進捗率（segment.end / audio_duration）を
+    間引いて進捗ストリームへ追記する。チェックポイントを渡した場合は確定したセグメントと
+    書き起こし済みの位置を定期的に保存し、前回の実行が途中で終わっていればその位置から再開する。
+
+    Args:
+        audio_path: 音声ファイルパス
+        transcription_id: 書き起こしID（進捗ストリームのキー）
+        on_stage: 進捗通知コールバック（ステータス名, 進捗率, publish=ストリームへ追記するか）
+        speaker: セグメントに付ける話者ラベル
+        stream_fields: 進捗ストリームの各イベントに付加するフィールド
+        checkpoint: 途中経過の保存先（checkpoint_store.begin() で取得したもの）
+        started_at: ジョブの開始時刻（time.time()、デコード設定の予算計算に使う）
+        prepared: 前処理済みの音声（前処理タスクで作成済みの場合。省略時はここで前処理する）
+
+    Returns:
+        segments / full_text / audio_duration / 無音除去量 / 前処理レポートを含む辞書
+    """
+    from ..services.whisper_service import get_whisper_service
+
+    whisper_service = get_whisper_service()
+    if started_at is None:
+        started_at = time.time()
+
+    if prepared is None:
+        prepared = _prepare_audio(audio_path, on_stage)
+    audio_data = prepared.audio
+    sample_rate = prepared.sample_rate
+    audio_duration = prepared.audio_duration
+    timeline = prepared.timeline
+    preprocessing_report = prepared.preprocessing
+    del prepared
+
+    # 2. Whisper書き起こし
+    logger.info("Step 2/4: Whisper transcription")
+    on_stage("transcribing", 50)
+
+    # 2段階デコードでは1パス目を貪欲法で行い、低信頼度の区間だけを再デコードする
+    two_pass = settings.WHISPER_TWO_PASS_ENABLED
+    reporter = progress_stream.create_reporter(
+        transcription_id,
+        audio_duration,
+        progress_start=50,
+        progress_end=70 if two_pass else 75,
+        extra=stream_fields,
+        on_progress=lambda progress: on_stage("transcribing", progress, publish=False)
+    )
+
+    # 前回の実行で書き起こし済みの区間はスキップする
+    resumed_from = 0.0
+    previous_segments: List[TranscriptSegment] = []
+    previous_transcribe_time = 0.0
+    writer = None
+    if checkpoint is not None:
+        resumed_from = checkpoint.offset
+        previous_segments = checkpoint.transcript_segments
+        previous_transcribe_time = checkpoint.transcribe_time
+        writer = CheckpointWriter(checkpoint_store, checkpoint, timeline)
+
+    # 処理時間の目標に収まるデコード設定を選ぶ
+    plan = None
+    if settings.DECODING_SCHEDULER_ENABLED:
+        plan = decoding_scheduler.plan(
+            audio_duration,
+            max(len(audio_data) / sample_rate - resumed_from, 0.0),
+            elapsed=time.time() - started_at,
+            queue_depth=_queue_depth()
+        )
+    decode_profile = plan.profile if plan is not None else DecodingProfile.from_settings()
+    first_pass_profile = DecodingProfile.greedy(decode_profile.batch_size) if two_pass else decode_profile
+
+    def on_segment(segment: TranscriptSegment) -> None:
+        segment.speaker = speaker
+        reporter.add(segment)
+        if writer is not None:
+            writer.add(segment)
+
+    # 小さいモデルの下書きを先に配信し、最初の文字起こしが表示されるまでの時間を縮める
+    draft = None
+    if settings.DRAFT_TRANSCRIPT_ENABLED:
+        shares_device = _draft_shares_device()
+        draft = _DraftTranscription(
+            transcription_id,
+            audio_data,
+            audio_duration,
+            timeline=timeline,
+            start_offset=resumed_from,
+            speaker=speaker,
+            stream_fields=stream_fields,
+            end_offset=resumed_from + settings.DRAFT_SHARED_DEVICE_SECONDS if shares_device else None
+        )
+        if shares_device:
+            draft.run()
+        else:
+            draft.start()
+
+    loop_stats = LoopStats()
+    transcribe_start = time.time()
+    draft_report = None
+    try:
+        segments, _ = whisper_service.transcribe(
+            audio_data,
+            language="ja",
+            task="transcribe",
+            timeline=timeline,
+            on_segment=on_segment,
+            start_offset=resumed_from,
+            profile=first_pass_profile,
+            loop_stats=loop_stats
+        )
+        reporter.flush()
+        first_pass_time = time.time() - transcribe_start
+        segments = previous_segments + segments
+        if draft is not None:
+            draft_report = draft.stop()
+
+        refinement = None
+        if two_pass:
+            if writer is not None:
+                writer.save()
+            on_stage("refining", 70)
+            segments, refinement = whisper_service.refine_low_confidence(
+                audio_data,
+                segments,
+                language="ja",
+                task="transcribe",
+                timeline=timeline,
+                profile=decode_profile
+            )
+    except Exception:
+        # クラッシュ・ソフトタイムアウト時は直前までの結果を残して再開できるようにする
+        if writer is not None:
+            writer.save()
+        raise
+    finally:
+        if draft is not None and draft_report is None:
+            draft.stop()
+    run_transcribe_time = time.time() - transcribe_start
+    transcribe_time = previous_transcribe_time + run_transcribe_time
+    transcribed_audio_seconds = len(audio_data) / sample_rate
+    del audio_data
+
+    decoding_report = None
+    if plan is not None:
+        decoding_report = plan.to_dict()
+        decoding_report["decode_seconds"] = run_transcribe_time
+        decoding_report["decode_ratio"] = decoding_scheduler.record(
+            first_pass_profile, plan.audio_seconds, first_pass_time
+        )
+
+    refinement_report = None
+    if refinement is not None:
+        for span in refinement.spans:
+            for segment in span["segments"]:
+                segment.speaker = speaker
+        accepted = [span for span in refinement.spans if span["accepted"]]
+        if accepted:
+            # 差し替えた区間をクライアントへ通知（同じ時間範囲の表示を置き換える）
+            progress_stream.publish(
+                transcription_id,
+                "refined",
+                spans=[
+                    {
+                        "start": span["start"],
+                        "end": span["end"],
+                        "segments": [seg.model_dump() for seg in span["segments"]],
+                    }
+                    for span in accepted
+                ],
+                **(stream_fields or {})
+            )
+        # 全体を高コストの設定でデコードした場合の見積もりと比較
+        baseline_seconds = transcribed_audio_seconds * decoding_scheduler.speed_ratio(decoding_scheduler.profiles[0])
+        refinement_report = refinement.to_dict()
+        refinement_report.update({
+            "first_pass_seconds": first_pass_time,
+            "total_decode_seconds": run_transcribe_time,
+            "estimated_baseline_seconds": baseline_seconds,
+        })
+        logger.info(
+            f"Two-pass decoding took {run_transcribe_time:.1f}s "
+            f"(estimated {baseline_seconds:.1f}s for full {decoding_scheduler.profiles[0].name} decoding)"
+        )
+
+    if draft_report is not None:
+        # 最初の文字起こし（下書き・本番のどちらか早い方）が届くまでの時間
+        final_first = reporter.first_published_at
+        draft_report["first_final_segment_seconds"] = (
+            final_first - draft.started_at if final_first is not None else None
+        )
+        candidates = [
+            seconds for seconds in (
+                draft_report["first_segment_seconds"],
+                draft_report["first_final_segment_seconds"]
+            )
+            if seconds is not None
+        ]
+        draft_report["time_to_first_transcript"] = min(candidates) if candidates else None
+        logger.info(
+            f"Draft transcript ({draft_report['segments']} segments): "
+            f"time to first transcript {draft_report['time_to_first_transcript']}s"
+        )
+
+    full_text = " ".join(segment.text for segment in segments)
+
+    # 無音除去による削減量（GPU 秒は今回の実測処理速度から換算）
+    silence_removed_seconds = timeline.removed_seconds if timeline else 0.0
+    transcribed_seconds = audio_duration - silence_removed_seconds
+    gpu_seconds_saved = (
+        silence_removed_seconds * transcribe_time / transcribed_seconds
+        if transcribed_seconds > 0 else 0.0
+    )
+    logger.info(
+        f"Silence compaction saved ~{gpu_seconds_saved:.1f} GPU seconds "
+        f"({silence_removed_seconds:.1f}s of audio removed)"
+    )
+
+    return {
+        "segments": segments,
+        "full_text": full_text,
+        "audio_duration": audio_duration,
+        "transcribed_seconds": transcribed_seconds,
+        "transcribe_time": transcribe_time,
+        "silence_removed_seconds": silence_removed_seconds,
+        "silence_removed_ratio": timeline.removed_ratio if timeline else 0.0,
+        "gpu_seconds_saved": gpu_seconds_saved,
+        "resumed_from": resumed_from,
+        "attempts": checkpoint.attempts if checkpoint is not None else 1,
+        "decoding": decoding_report,
+        "refinement": refinement_report,
+        "loops": loop_stats.to_dict(),
+        "draft": draft_report,
+        "preprocessing": preprocessing_report,
+    }
+
+
+def _serialize_segment(segment: TranscriptSegment) -> Dict[str, Any]:
+    """セグメントを結果キャッシュ用の辞書に変換"""
+    return {
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "confidence": segment.confidence,
+        "speaker": segment.speaker
+    }
+
+
+def _load_partial_segments(key: str) -> List[TranscriptSegment]:
+    """話者別トラック・チャンクの途中結果のセグメントを読み込む"""
+    stored = transcription_result_store.get(key)
+    if stored is None:
+        raise RuntimeError(f"Partial transcription result not found: {key}")
+    return stored.segments
+
+
+def _begin_checkpoint(key: str, audio_path: str) -> Optional[TranscriptionCheckpoint]:
+    """
+    実行開始時のチェックポイントを取得
+
+    Returns:
+        チェックポイント（無効化されている場合は None）
+
+    Raises:
+        RuntimeError: 実行回数が TRANSCRIPTION_MAX_ATTEMPTS を超えた場合
+            （同じ位置でクラッシュし続けるジョブの再投入を止める）
+    """
+    if not settings.TRANSCRIPTION_CHECKPOINT_ENABLED:
+        return None
+    checkpoint = checkpoint_store.begin(key, audio_path)
+    if checkpoint.attempts > settings.TRANSCRIPTION_MAX_ATTEMPTS:
+        raise RuntimeError(f"Giving up after {checkpoint.attempts - 1} attempts")
+    return checkpoint
+
+
+def _can_retry(checkpoint: Optional[TranscriptionCheckpoint]) -> bool:
+    """チェックポイントから再開する再試行が可能か"""
+    return checkpoint is not None and checkpoint.attempts < settings.TRANSCRIPTION_MAX_ATTEMPTS
+
+
+def _result_cache_key(audio_path: str) -> Optional[str]:
+    """
+    結果キャッシュのキー（音声の内容ハッシュ + 結果に影響する設定）
+
+    Returns:
+        キャッシュキー（無効化されている場合・ファイルを読めない場合は None）
+    """
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+    try:
+        return result_cache.cache_key(audio_path, decode_parameters(language="ja", task="transcribe"))
+    except OSError as e:
+        logger.warning(f"Failed to hash {audio_path} for result cache: {e}")
+        return None
+
+
+def _model_stats() -> Dict[str, Any]:
+    """書き起こし用モデルのロード・ヒット・アンロード回数"""
+    from ..services.whisper_service import get_whisper_service
+
+    return get_whisper_service().model_stats()
+
+
+def _remove_file(path: str) -> None:
+    """一時音声ファイルを削除（失敗しても処理は続行）"""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception as e:
+        logger.warning(f"Failed to cleanup temporary file {path}: {e}")
+
+
+def _stage_callback(task, transcription_id: str) -> Callable[..., None]:
+    """タスク状態と進捗ストリームを更新する進捗通知コールバックを作成"""
+    def on_stage(status: str, progress: int, publish: bool = True) -> None:
+        task.update_state(
+            state="PROCESSING",
+            meta={
+                "transcription_id": transcription_id,
+                "status": status,
+                "progress": progress
+            }
+        )
+        if publish:
+            progress_stream.publish(transcription_id, "stage", status=status, progress=progress)
+
+    return on_stage
+
+
+def _complete_transcription(
+    transcription_id: str,
+    audio_path: str,
+    session_log: Optional[str],
+    result: Dict[str, Any],
+    start_time: float,
+    cache_key: Optional[str],
+    on_stage: Callable[..., None],
+    worker: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    書き起こし結果を保存し、一時ファイルを削除してジョブを完了
+
+    セグメントは transcription_result_store に1回だけ保存し、戻り値（Celery の結果バックエンドに
+    保存される）には参照とメタデータだけを入れる。
+
+    Args:
+        transcription_id: 書き起こしID
+        audio_path: 元音声ファイルパス
+        session_log: セッションログ
+        result: _transcribe_audio() の戻り値
+        start_time: ジョブの開始時刻（time.time()）
+        cache_key: 結果キャッシュのキー（保存しない場合は None）
+        on_stage: 進捗通知コールバック
+        worker: 書き起こしたワーカーのホスト名（処理速度の学習に使う。複数のワーカーで分担した場合は None）
+
+    Returns:
+        タスクの処理結果辞書
+    """
+    segments = result["segments"]
+
+    # 3. 結果の保存（全文テキスト・ミックス出力は読み出し時にセグメントから生成する）
+    logger.info("Step 3/4: Storing result")
+    on_stage("formatting", 75)
+
+    stored = transcription_result_store.put(transcription_id, segments, session_log=session_log)
+
+    # 4. クリーンアップ（モデルは次のジョブのために常駐させたままにする）
+    logger.info("Step 4/4: Cleanup")
+    _remove_file(audio_path)
+    checkpoint_store.delete(transcription_id)
+    logger.info("Temporary files cleaned up")
+
+    processing_time = time.time() - start_time
+    achieved_ratio = processing_time / result["audio_duration"] if result["audio_duration"] > 0 else 0.0
+    # 負荷に応じて精度を下げた設定の結果は、空いているときの依頼に返さないよう保存しない
+    profile_name = result["decoding"]["profile"]["name"] if result["decoding"] else None
+    if profile_name not in (None, decoding_scheduler.profiles[0].name):
+        cache_key = None
+    if cache_key is not None:
+        result_cache.link(transcription_id, cache_key)
+        result_cache.put(cache_key, {
+            "segments": [_serialize_segment(seg) for seg in segments],
+            "full_text": result["full_text"],
+            "audio_duration": result["audio_duration"],
+            "processing_time": processing_time,
+            "decoding_profile": profile_name,
+            "cached_at": datetime.utcnow().isoformat(),
+        })
+    logger.info(
+        f"Transcription completed: {transcription_id} "
+        f"in {processing_time:.2f} seconds "
+        f"(ratio {achieved_ratio:.3f}, target {settings.TARGET_PROCESSING_RATIO:.3f})"
+    )
+    progress_stream.publish(
+        transcription_id,
+        "completed",
+        progress=100,
+        segment_count=len(segments),
+        processing_time=processing_time
+    )
+    eta_estimator.record_completion(transcription_id, result["audio_duration"], processing_time, worker)
+    _finish_scheduled(transcription_id)
+
+    # 結果を返す
+    return {
+        "transcription_id": transcription_id,
+        "status": "completed",
+        "result": stored,
+        "audio_duration": result["audio_duration"],
+        "processing_time": processing_time,
+        "processing_ratio": achieved_ratio,
+        "target_processing_ratio": settings.TARGET_PROCESSING_RATIO,
+        "decoding": result["decoding"],
+        "refinement": result["refinement"],
+        "loops": result["loops"],
+        "draft": result["draft"],
+        "silence_removed_seconds": result["silence_removed_seconds"],
+        "silence_removed_ratio": result["silence_removed_ratio"],
+        "gpu_seconds_saved": result["gpu_seconds_saved"],
+        "resumed_from": result["resumed_from"],
+        "attempts": result["attempts"],
+        "preprocessing": result["preprocessing"],
+        "cache": {"hit": False, "stored": cache_key is not None},
+        "model": _model_stats(),
+        "completed_at": datetime.utcnow().isoformat()
+    }
+
+
+# acks_late + reject_on_worker_lost: ワーカーがクラッシュ・OOM で落ちた場合もタスクを再投入する
+@celery_app.task(bind=True, name="process_transcription", acks_late=True, reject_on_worker_lost=True)
 def process_transcription(
     self,
     transcription_id: str,
@@ -37,125 +719,898 @@ def process_transcription(
     """
     logger.info(f"Starting transcription task: {transcription_id}")
     start_time = time.time()
+    on_stage = _stage_callback(self, transcription_id)
 
+    checkpoint = None
     try:
         # ステータス更新: 処理中
-        self.update_state(
-            state="PROCESSING",
-            meta={
-                "transcription_id": transcription_id,
-                "status": "processing",
-                "progress": 0
-            }
-        )
+        on_stage("processing", 0)
 
-        # 1. 音声前処理
-        logger.info("Step 1/4: Audio preprocessing")
-        self.update_state(
-            state="PROCESSING",
-            meta={
-                "transcription_id": transcription_id,
-                "status": "preprocessing",
-                "progress": 25
-            }
-        )
+        # 同じ音声・同じ設定の書き起こし結果があれば書き起こしを省略する
+        cache_key = _result_cache_key(audio_path)
+        cached = result_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            return _complete_from_cache(transcription_id, audio_path, session_log, cached, start_time, cache_key)
 
-        preprocessed_path = audio_preprocessor.preprocess(
+        checkpoint = _begin_checkpoint(transcription_id, audio_path)
+        result = _transcribe_audio(
             audio_path,
-            apply_noise_reduction=True,
-            normalize_audio=True
+            transcription_id,
+            on_stage,
+            checkpoint=checkpoint,
+            started_at=start_time
+        )
+        return _complete_transcription(
+            transcription_id, audio_path, session_log, result, start_time, cache_key, on_stage,
+            worker=self.request.hostname
         )
 
-        audio_duration = audio_preprocessor.get_audio_duration(preprocessed_path)
-        logger.info(f"Audio duration: {audio_duration:.2f} seconds")
+    except Exception as e:
+        logger.error(f"Transcription task failed: {e}", exc_info=True)
 
-        # 2. Whisper書き起こし
-        logger.info("Step 2/4: Whisper transcription")
-        self.update_state(
-            state="PROCESSING",
-            meta={
-                "transcription_id": transcription_id,
-                "status": "transcribing",
-                "progress": 50
-            }
-        )
+        # 音声ファイルとチェックポイントを残して再投入（次の実行は続きから再開）
+        if _can_retry(checkpoint):
+            on_stage("retrying", 0)
+            raise self.retry(exc=e, countdown=settings.TRANSCRIPTION_RETRY_DELAY, max_retries=None)
 
-        segments, full_text = whisper_service.transcribe(
-            preprocessed_path,
-            language="ja",
-            task="transcribe"
-        )
+        # クリーンアップ（再試行しない場合のみ）
+        _remove_file(audio_path)
+        checkpoint_store.delete(transcription_id)
+        progress_stream.publish(transcription_id, "failed", error_message=str(e))
+        _finish_scheduled(transcription_id)
 
-        # 3. 出力生成
-        logger.info("Step 3/4: Generating outputs")
-        self.update_state(
-            state="PROCESSING",
-            meta={
-                "transcription_id": transcription_id,
-                "status": "formatting",
-                "progress": 75
-            }
-        )
+        # エラー情報を返す
+        return {
+            "transcription_id": transcription_id,
+            "status": "failed",
+            "error_message": str(e),
+            "processing_time": time.time() - start_time
+        }
 
-        mixed_output = output_formatter.generate_mixed_output(
-            segments,
-            session_log=session_log
-        )
 
-        # 4. クリーンアップ
-        logger.info("Step 4/4: Cleanup")
+def _complete_from_cache(
+    transcription_id: str,
+    audio_path: str,
+    session_log: Optional[str],
+    cached: Dict[str, Any],
+    start_time: float,
+    cache_key: str
+) -> Dict[str, Any]:
+    """
+    キャッシュ済みの書き起こし結果でジョブを完了
+
+    セッションログはアップロードごとに異なりうるため、このジョブの結果として保存し直す。
+    """
+    segments = [TranscriptSegment(**segment) for segment in cached["segments"]]
+    stored = transcription_result_store.put(transcription_id, segments, session_log=session_log)
+    result_cache.link(transcription_id, cache_key)
+    _remove_file(audio_path)
+
+    processing_time = time.time() - start_time
+    logger.info(
+        f"Transcription completed from result cache: {transcription_id} "
+        f"in {processing_time:.2f} seconds ({cached['audio_duration']:.1f}s of audio)"
+    )
+    progress_stream.publish(
+        transcription_id,
+        "completed",
+        progress=100,
+        segment_count=len(segments),
+        processing_time=processing_time,
+        cached=True
+    )
+    _finish_scheduled(transcription_id)
+    return {
+        "transcription_id": transcription_id,
+        "status": "completed",
+        "result": stored,
+        "audio_duration": cached["audio_duration"],
+        "processing_time": processing_time,
+        "processing_ratio": processing_time / cached["audio_duration"] if cached["audio_duration"] > 0 else 0.0,
+        "target_processing_ratio": settings.TARGET_PROCESSING_RATIO,
+        "cache": {
+            "hit": True,
+            "decoding_profile": cached.get("decoding_profile"),
+            "cached_at": cached.get("cached_at"),
+            "original_processing_time": cached.get("processing_time"),
+        },
+        "completed_at": datetime.utcnow().isoformat()
+    }
+
+
+def dispatch_transcription(
+    transcription_id: str,
+    audio_path: str,
+    session_log: Optional[str] = None,
+    plan: PlanType = PlanType.FREE,
+    audio_duration: Optional[float] = None
+) -> AsyncResult:
+    """
+    書き起こしを投入
+
+    JOB_SCHEDULER_ENABLED の場合はジョブスケジューラに登録し、実行枠が空いたときに
+    プラン・音声長・待ち時間で決まる優先順に投入する（release_scheduled_jobs）。
+    タスクIDは登録時に決めておくため、戻り値の AsyncResult は投入前から結果の取得に使える。
+
+    Args:
+        transcription_id: 書き起こしID
+        audio_path: 音声ファイルパス（RAMディスク内）
+        session_log: セッションログ
+        plan: ユーザーのプラン
+        audio_duration: 音声長（秒、省略時は ffprobe で推定）
+
+    Returns:
+        最後のタスク（書き起こし）の AsyncResult
+    """
+    task_id = str(uuid.uuid4())
+    if not settings.JOB_SCHEDULER_ENABLED:
+        progress_stream.publish(transcription_id, "stage", status="queued", progress=0)
+        _start_transcription(transcription_id, audio_path, session_log, task_id)
+        return AsyncResult(task_id, app=celery_app)
+
+    if audio_duration is None:
+        from ..services.audio_decoder import ffmpeg_decoder
+
+        audio_duration = ffmpeg_decoder.probe_duration(audio_path) or 0.0
+    _schedule_job(transcription_id, plan, audio_duration, {
+        "transcription_id": transcription_id,
+        "audio_path": audio_path,
+        "session_log": session_log,
+        "task_id": task_id,
+    })
+    return AsyncResult(task_id, app=celery_app)
+
+
+def _schedule_job(
+    transcription_id: str,
+    plan: PlanType,
+    audio_duration: float,
+    payload: Dict[str, Any]
+) -> None:
+    """
+    ジョブスケジューラに登録して空いた実行枠への投入を依頼
+
+    Args:
+        payload: 投入時に _start_job() へ渡す引数
+    """
+    job_scheduler.submit(ScheduledJob(
+        job_id=transcription_id,
+        plan=PlanType(plan).value,
+        audio_duration=audio_duration,
+        enqueued_at=time.time(),
+        payload=payload
+    ))
+    # 投入時の予測を記録し（完了時に実績と比較する）、待ち順位と予測時刻を通知する
+    estimate = eta_estimator.record_prediction(transcription_id)
+    eta = estimate.to_dict() if estimate is not None else {}
+    progress_stream.publish(
+        transcription_id,
+        "stage",
+        status="queued",
+        progress=0,
+        queue_position=eta.get("position"),
+        estimated_start_at=eta.get("estimated_start_at"),
+        estimated_finish_at=eta.get("estimated_finish_at")
+    )
+    release_scheduled_jobs.delay()
+
+
+def _start_job(payload: Dict[str, Any]) -> None:
+    """ジョブスケジューラから取り出したジョブを Celery のキューへ投入"""
+    if "tracks" in payload:
+        _start_multitrack_transcription(**payload)
+    else:
+        _start_transcription(**payload)
+
+
+def _start_transcription(
+    transcription_id: str,
+    audio_path: str,
+    session_log: Optional[str],
+    task_id: str
+) -> None:
+    """
+    書き起こしタスクを Celery のキューへ投入
+
+    TRANSCRIPTION_PIPELINE_ENABLED の場合は前処理（CPU キュー）と書き起こし（GPU キュー）を
+    別タスクに分けて連結する。GPU ワーカーがジョブ N を書き起こしている間に、
+    CPU ワーカーがジョブ N+1 の前処理を進める。
+
+    Args:
+        task_id: 最後のタスク（書き起こし）に付けるタスクID
+    """
+    if not settings.TRANSCRIPTION_PIPELINE_ENABLED:
+        process_transcription.apply_async((transcription_id, audio_path, session_log), task_id=task_id)
+        return
+    workflow = chain(
+        preprocess_transcription.s(transcription_id, audio_path, session_log),
+        transcribe_prepared.s().set(task_id=task_id)
+    )
+    workflow.apply_async()
+
+
+def _queue_depth() -> int:
+    """
+    待ちジョブ数（デコード設定の予算を縮める負荷の目安）
+
+    JOB_SCHEDULER_ENABLED の場合、待ちジョブは Celery のキューではなくジョブスケジューラにあるため、
+    スケジューラの待ちジョブ数を返す。
+    """
+    if not settings.JOB_SCHEDULER_ENABLED:
+        return decoding_scheduler.queue_depth(settings.CELERY_TRANSCRIBE_QUEUE)
+    try:
+        return job_scheduler.pending_count()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read scheduled job count: {e}")
+        return 0
+
+
+def _finish_scheduled(transcription_id: str) -> None:
+    """ジョブスケジューラの実行中ジョブから外し、空いた枠に待ちジョブを投入"""
+    if not settings.JOB_SCHEDULER_ENABLED:
+        return
+    job_scheduler.finish(transcription_id)
+    release_scheduled_jobs.delay()
+
+
+@celery_app.task(name="release_scheduled_jobs")
+def release_scheduled_jobs():
+    """
+    実行枠が空いていれば、待ちジョブを優先度の高い順に投入
+
+    ジョブの登録時・完了時に呼ぶほか、取りこぼし対策として Beat から定期的に実行する。
+    投入に失敗したジョブは実行枠を返し、ブローカーに接続できない場合は待ちジョブに戻して
+    次回の実行で投入し直す。それ以外の失敗は書き起こしの失敗として通知する。
+
+    Returns:
+        投入したジョブの書き起こしID
+    """
+    released = []
+    for job in job_scheduler.claim():
+        logger.info(
+            f"Releasing job {job.job_id} (plan {job.plan}, {job.audio_duration:.0f}s of audio, "
+            f"waited {job.wait_seconds():.1f}s)"
+        )
+        eta_estimator.record_start(job.job_id)
         try:
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            if os.path.exists(preprocessed_path) and preprocessed_path != audio_path:
-                os.remove(preprocessed_path)
-            logger.info("Temporary files cleaned up")
+            _start_job(job.payload)
+        except OperationalError as e:
+            logger.warning(f"Failed to enqueue job {job.job_id}, returning it to the scheduler: {e}")
+            job_scheduler.finish(job.job_id)
+            job_scheduler.submit(job)
+            continue
         except Exception as e:
-            logger.warning(f"Failed to cleanup temporary files: {e}")
+            logger.error(f"Failed to enqueue job {job.job_id}: {e}", exc_info=True)
+            job_scheduler.finish(job.job_id)
+            progress_stream.publish(job.job_id, "failed", error_message=str(e))
+            continue
+        released.append(job.job_id)
+    return released
 
-        # GPU メモリクリーンアップ
-        whisper_service.cleanup()
 
-        processing_time = time.time() - start_time
-        logger.info(
-            f"Transcription completed: {transcription_id} "
-            f"in {processing_time:.2f} seconds"
+def _plan_chunks(prepared: "PreparedAudio") -> Optional[List[Dict[str, Any]]]:
+    """
+    分散書き起こしのチャンクを決める
+
+    Returns:
+        チャンクのリスト（TranscriptionChunk.to_dict()）。分散しない場合は None
+    """
+    if not settings.TRANSCRIPTION_DISTRIBUTED_ENABLED:
+        return None
+    duration = len(prepared.audio) / prepared.sample_rate
+    if duration < settings.TRANSCRIPTION_DISTRIBUTED_MIN_DURATION:
+        return None
+
+    from ..services.distributed_transcription import plan_chunks
+    from ..services.whisper_service import detect_speech
+
+    chunks = plan_chunks(
+        detect_speech(prepared.audio, settings.TRANSCRIPTION_CHUNK_SECONDS),
+        duration,
+        settings.TRANSCRIPTION_CHUNK_SECONDS,
+        settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+    )
+    if len(chunks) < 2:
+        return None
+    logger.info(f"Split {duration:.1f}s of audio into {len(chunks)} chunks for distributed transcription")
+    return [chunk.to_dict() for chunk in chunks]
+
+
+@celery_app.task(bind=True, name="preprocess_transcription", acks_late=True, reject_on_worker_lost=True)
+def preprocess_transcription(
+    self,
+    transcription_id: str,
+    audio_path: str,
+    session_log: Optional[str] = None
+):
+    """
+    前処理タスク（CPU キュー）
+
+    結果キャッシュを確認し、ヒットしなければ前処理・無音除去した音声を RAM ディスクに保存する。
+
+    TRANSCRIPTION_DISTRIBUTED_ENABLED で長時間の録音の場合は、書き起こしを分散するチャンクも決める。
+
+    Returns:
+        transcribe_prepared に渡すジョブ情報（status: prepared）。
+        キャッシュヒット・失敗時は最終的な処理結果辞書（transcribe_prepared はそのまま返す）
+    """
+    from ..services.prepared_audio import prepared_audio_store
+
+    logger.info(f"Starting preprocessing task: {transcription_id}")
+    start_time = time.time()
+    on_stage = _stage_callback(self, transcription_id)
+
+    try:
+        on_stage("processing", 0)
+
+        cache_key = _result_cache_key(audio_path)
+        cached = result_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            return _complete_from_cache(transcription_id, audio_path, session_log, cached, start_time, cache_key)
+
+        prepared = _prepare_audio(audio_path, on_stage)
+        prepared_audio_store.save(transcription_id, prepared)
+        chunks = _plan_chunks(prepared)
+        del prepared
+        preprocess_time = time.time() - start_time
+        logger.info(f"Preprocessing completed: {transcription_id} in {preprocess_time:.2f} seconds")
+        on_stage("queued", 45)
+
+        return {
+            "transcription_id": transcription_id,
+            "status": "prepared",
+            "audio_path": audio_path,
+            "session_log": session_log,
+            "cache_key": cache_key,
+            "started_at": start_time,
+            "preprocess_time": preprocess_time,
+            "chunks": chunks,
+        }
+
+    except Exception as e:
+        logger.error(f"Preprocessing task failed: {e}", exc_info=True)
+        _remove_file(audio_path)
+        prepared_audio_store.delete(transcription_id)
+        progress_stream.publish(transcription_id, "failed", error_message=str(e))
+        _finish_scheduled(transcription_id)
+        return {
+            "transcription_id": transcription_id,
+            "status": "failed",
+            "error_message": str(e),
+            "processing_time": time.time() - start_time
+        }
+
+
+@celery_app.task(bind=True, name="transcribe_prepared", acks_late=True, reject_on_worker_lost=True)
+def transcribe_prepared(self, job: Dict[str, Any]):
+    """
+    前処理済み音声の書き起こしタスク（GPU キュー）
+
+    チャンクが決まっている場合は transcribe_chunk / merge_chunk_transcriptions に置き換える。
+
+    Args:
+        job: preprocess_transcription の戻り値
+
+    Returns:
+        処理結果辞書（process_transcription と同じ形式）
+    """
+    if job.get("status") != "prepared":
+        # キャッシュヒット・前処理の失敗（処理結果をそのまま返す）
+        return job
+
+    if job.get("chunks"):
+        # チャンクごとのサブタスクに分けて複数の書き起こしワーカーで並列に処理し、統合タスクで結果をまとめる
+        # （置き換え後のタスクはこのタスクのIDを引き継ぐため、dispatch_transcription の AsyncResult で結果を取得できる）
+        logger.info(f"Distributing transcription {job['transcription_id']} over {len(job['chunks'])} chunks")
+        header = group(transcribe_chunk.s(job, chunk) for chunk in job["chunks"])
+        return self.replace(chord(header, merge_chunk_transcriptions.s(job)))
+
+    from ..services.prepared_audio import prepared_audio_store
+
+    transcription_id = job["transcription_id"]
+    audio_path = job["audio_path"]
+    start_time = job["started_at"]
+    logger.info(
+        f"Starting transcription of prepared audio: {transcription_id} "
+        f"(waited {time.time() - start_time - job['preprocess_time']:.1f}s after preprocessing)"
+    )
+    on_stage = _stage_callback(self, transcription_id)
+
+    checkpoint = None
+    try:
+        prepared = prepared_audio_store.load(transcription_id)
+        if prepared is None:
+            raise RuntimeError(f"Prepared audio not found for {transcription_id}")
+
+        checkpoint = _begin_checkpoint(transcription_id, audio_path)
+        result = _transcribe_audio(
+            audio_path,
+            transcription_id,
+            on_stage,
+            checkpoint=checkpoint,
+            started_at=start_time,
+            prepared=prepared
         )
+        del prepared
+        completed = _complete_transcription(
+            transcription_id, audio_path, job["session_log"], result, start_time, job["cache_key"], on_stage,
+            worker=self.request.hostname
+        )
+        prepared_audio_store.delete(transcription_id)
+        completed["preprocess_time"] = job["preprocess_time"]
+        return completed
 
-        # 結果を返す
+    except Exception as e:
+        logger.error(f"Transcription task failed: {e}", exc_info=True)
+
+        # 前処理済み音声・チェックポイントを残して再投入（次の実行は続きから再開）
+        if _can_retry(checkpoint):
+            on_stage("retrying", 0)
+            raise self.retry(exc=e, countdown=settings.TRANSCRIPTION_RETRY_DELAY, max_retries=None)
+
+        _remove_file(audio_path)
+        prepared_audio_store.delete(transcription_id)
+        checkpoint_store.delete(transcription_id)
+        progress_stream.publish(transcription_id, "failed", error_message=str(e))
+        _finish_scheduled(transcription_id)
         return {
             "transcription_id": transcription_id,
+            "status": "failed",
+            "error_message": str(e),
+            "processing_time": time.time() - start_time
+        }
+
+
+@celery_app.task(bind=True, name="transcribe_chunk", acks_late=True, reject_on_worker_lost=True)
+def transcribe_chunk(self, job: Dict[str, Any], chunk: Dict[str, Any]):
+    """
+    分散書き起こしのチャンク1つの書き起こしサブジョブ（GPU キュー）
+
+    前処理済み音声をメモリマップで開き、チャンクの区間だけを書き起こす。チャンクの順序は
+    ワーカーごとにばらばらになるため、セグメントは進捗ストリームへ流さず統合タスクでまとめる。
+    失敗した場合はチャンク単位で TRANSCRIPTION_MAX_ATTEMPTS 回まで実行し直す。
+
+    Args:
+        job: preprocess_transcription の戻り値
+        chunk: 書き起こすチャンク（TranscriptionChunk.to_dict()）
+
+    Returns:
+        チャンクの処理結果辞書（再試行を使い切った失敗時も統合タスクへ渡すため例外は送出しない）
+    """
+    from ..services.distributed_transcription import TranscriptionChunk
+    from ..services.prepared_audio import prepared_audio_store
+    from ..services.whisper_service import get_whisper_service
+
+    transcription_id = job["transcription_id"]
+    chunk = TranscriptionChunk(**chunk)
+    started_at = time.time()
+    logger.info(
+        f"Starting chunk transcription: {transcription_id} chunk {chunk.index} "
+        f"({chunk.start:.1f}s-{chunk.end:.1f}s)"
+    )
+
+    try:
+        prepared = prepared_audio_store.load(transcription_id, mmap=True)
+        if prepared is None:
+            raise RuntimeError(f"Prepared audio not found for {transcription_id}")
+
+        loop_stats = LoopStats()
+        segments, _ = get_whisper_service().transcribe(
+            prepared.audio,
+            language="ja",
+            task="transcribe",
+            timeline=prepared.timeline,
+            start_offset=chunk.start,
+            end_offset=chunk.end,
+            loop_stats=loop_stats
+        )
+        del prepared
+        finished_at = time.time()
+        progress_stream.publish(
+            transcription_id,
+            "stage",
+            status="transcribing",
+            chunk_index=chunk.index,
+            chunks=len(job["chunks"])
+        )
+
+        return {
+            "index": chunk.index,
             "status": "completed",
-            "segments": [
+            "result": transcription_result_store.put(f"{transcription_id}-chunk{chunk.index}", segments),
+            "audio_seconds": chunk.duration,
+            "decode_seconds": finished_at - started_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "worker": self.request.hostname,
+            "attempts": self.request.retries + 1,
+            "loops": loop_stats.to_dict(),
+        }
+
+    except Exception as e:
+        logger.error(f"Chunk transcription failed: {e}", exc_info=True)
+        if self.request.retries + 1 < settings.TRANSCRIPTION_MAX_ATTEMPTS:
+            raise self.retry(exc=e, countdown=settings.TRANSCRIPTION_RETRY_DELAY, max_retries=None)
+        return {
+            "index": chunk.index,
+            "status": "failed",
+            "error_message": str(e),
+            "attempts": self.request.retries + 1,
+        }
+
+
+@celery_app.task(bind=True, name="merge_chunk_transcriptions")
+def merge_chunk_transcriptions(self, chunk_results: List[Dict[str, Any]], job: Dict[str, Any]):
+    """
+    分散書き起こしのチャンクの結果を統合してジョブを完了
+
+    チャンクが重なる区間のセグメントは担当するチャンクのものだけを残す。
+    1つでも失敗したチャンクがある場合はジョブを失敗とする。
+
+    Args:
+        chunk_results: transcribe_chunk の結果リスト
+        job: preprocess_transcription の戻り値
+
+    Returns:
+        処理結果辞書（process_transcription と同じ形式 + distributed）
+    """
+    from ..services.distributed_transcription import TranscriptionChunk, merge_chunk_segments
+    from ..services.prepared_audio import prepared_audio_store
+
+    transcription_id = job["transcription_id"]
+    audio_path = job["audio_path"]
+    start_time = job["started_at"]
+    on_stage = _stage_callback(self, transcription_id)
+    chunk_results = sorted(chunk_results, key=lambda r: r["index"])
+    partial_keys = [r["result"]["key"] for r in chunk_results if "result" in r]
+
+    try:
+        failed = [r for r in chunk_results if r["status"] != "completed"]
+        if failed:
+            raise RuntimeError("; ".join(f"chunk {r['index']}: {r['error_message']}" for r in failed))
+
+        prepared = prepared_audio_store.load(transcription_id, mmap=True)
+        if prepared is None:
+            raise RuntimeError(f"Prepared audio not found for {transcription_id}")
+        audio_duration = prepared.audio_duration
+        timeline = prepared.timeline
+        preprocessing_report = prepared.preprocessing
+        del prepared
+
+        chunks = {chunk["index"]: TranscriptionChunk(**chunk) for chunk in job["chunks"]}
+        segments, dropped = merge_chunk_segments(
+            [(chunks[r["index"]], _load_partial_segments(r["result"]["key"])) for r in chunk_results],
+            timeline
+        )
+
+        # GPU 時間はチャンクの合計、書き起こしの所要時間は最初のチャンクの開始から最後のチャンクの終了まで
+        decode_seconds = sum(r["decode_seconds"] for r in chunk_results)
+        wall_seconds = max(r["finished_at"] for r in chunk_results) - min(r["started_at"] for r in chunk_results)
+        silence_removed_seconds = timeline.removed_seconds if timeline else 0.0
+        transcribed_seconds = audio_duration - silence_removed_seconds
+        loops = [r["loops"] for r in chunk_results]
+        result = {
+            "segments": segments,
+            "full_text": " ".join(segment.text for segment in segments),
+            "audio_duration": audio_duration,
+            "transcribed_seconds": transcribed_seconds,
+            "transcribe_time": decode_seconds,
+            "silence_removed_seconds": silence_removed_seconds,
+            "silence_removed_ratio": timeline.removed_ratio if timeline else 0.0,
+            "gpu_seconds_saved": (
+                silence_removed_seconds * decode_seconds / transcribed_seconds
+                if transcribed_seconds > 0 else 0.0
+            ),
+            "resumed_from": 0.0,
+            "attempts": max(r["attempts"] for r in chunk_results),
+            "decoding": None,
+            "refinement": None,
+            "loops": {
+                "loops_detected": sum(stats["loops_detected"] for stats in loops),
+                "skipped_seconds": sum(stats["skipped_seconds"] for stats in loops),
+                "dropped_segments": sum(stats["dropped_segments"] for stats in loops),
+                "loops": [loop for stats in loops for loop in stats["loops"]],
+            },
+            "draft": None,
+            "preprocessing": preprocessing_report,
+        }
+        workers = sorted({r["worker"] for r in chunk_results if r.get("worker")})
+        logger.info(
+            f"Merged {len(chunk_results)} chunks from {len(workers)} workers into {len(segments)} segments "
+            f"({dropped} overlapping segments dropped): {wall_seconds:.1f}s wall, {decode_seconds:.1f}s decode"
+        )
+
+        # チャンクは2段階デコードをしないため、2段階デコードの設定のキーでは保存しない
+        cache_key = job["cache_key"] if not settings.WHISPER_TWO_PASS_ENABLED else None
+        completed = _complete_transcription(
+            transcription_id, audio_path, job["session_log"], result, start_time, cache_key, on_stage
+        )
+        prepared_audio_store.delete(transcription_id)
+        for key in partial_keys:
+            transcription_result_store.delete(key)
+        completed["preprocess_time"] = job["preprocess_time"]
+        completed["distributed"] = {
+            "chunks": [
                 {
-                    "start": seg.start,
-                    "end": seg.end,
-                    "text": seg.text,
-                    "confidence": seg.confidence
+                    key: r.get(key)
+                    for key in ("index", "worker", "audio_seconds", "decode_seconds", "attempts")
                 }
-                for seg in segments
+                for r in chunk_results
             ],
-            "full_text": full_text,
-            "mixed_output": mixed_output,
-            "audio_duration": audio_duration,
-            "processing_time": processing_time,
-            "completed_at": datetime.utcnow().isoformat()
+            "workers": workers,
+            "dropped_segments": dropped,
+            "wall_seconds": wall_seconds,
+            "decode_seconds": decode_seconds,
+            "speedup": decode_seconds / wall_seconds if wall_seconds > 0 else 1.0,
         }
+        return completed
 
     except Exception as e:
-        logger.error(f"Transcription task failed: {e}", exc_info=True)
+        logger.error(f"Distributed transcription failed: {e}", exc_info=True)
+        _remove_file(audio_path)
+        prepared_audio_store.delete(transcription_id)
+        for key in partial_keys:
+            transcription_result_store.delete(key)
+        progress_stream.publish(transcription_id, "failed", error_message=str(e))
+        _finish_scheduled(transcription_id)
+        return {
+            "transcription_id": transcription_id,
+            "status": "failed",
+            "error_message": str(e),
+            "processing_time": time.time() - start_time
+        }
 
-        # クリーンアップ（エラー時も実行）
-        try:
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-        except:
-            pass
 
-        # エラー情報を返す
+def dispatch_multitrack_transcription(
+    transcription_id: str,
+    tracks: List[Dict[str, str]],
+    session_log: Optional[str] = None,
+    plan: PlanType = PlanType.FREE
+) -> AsyncResult:
+    """
+    話者別トラックの書き起こしを投入
+
+    トラックごとに独立したサブジョブ（transcribe_track）を並列に実行し、
+    全トラック完了後に merge_track_transcriptions で1つの書き起こしに統合する。
+    JOB_SCHEDULER_ENABLED の場合は dispatch_transcription と同じくジョブスケジューラに登録する
+    （音声長は最も長いトラックの長さ）。
+
+    Args:
+        transcription_id: 書き起こしID
+        tracks: [{"path": 音声ファイルパス, "speaker": 話者ラベル}, ...]
+        session_log: セッションログ
+        plan: ユーザーのプラン
+
+    Returns:
+        統合タスクの AsyncResult
+    """
+    task_id = str(uuid.uuid4())
+    if not settings.JOB_SCHEDULER_ENABLED:
+        progress_stream.publish(transcription_id, "stage", status="queued", progress=0)
+        _start_multitrack_transcription(transcription_id, tracks, session_log, task_id)
+        return AsyncResult(task_id, app=celery_app)
+
+    from ..services.audio_decoder import ffmpeg_decoder
+
+    audio_duration = max((ffmpeg_decoder.probe_duration(track["path"]) or 0.0 for track in tracks), default=0.0)
+    _schedule_job(transcription_id, plan, audio_duration, {
+        "transcription_id": transcription_id,
+        "tracks": tracks,
+        "session_log": session_log,
+        "task_id": task_id,
+    })
+    return AsyncResult(task_id, app=celery_app)
+
+
+def _start_multitrack_transcription(
+    transcription_id: str,
+    tracks: List[Dict[str, str]],
+    session_log: Optional[str],
+    task_id: str
+) -> None:
+    """
+    話者別トラックのサブジョブと統合タスクを Celery のキューへ投入
+
+    Args:
+        task_id: 統合タスクに付けるタスクID
+    """
+    header = group(
+        transcribe_track.s(transcription_id, track["path"], track["speaker"], index)
+        for index, track in enumerate(tracks)
+    )
+    chord(header)(merge_track_transcriptions.s(transcription_id, session_log).set(task_id=task_id))
+
+
+@celery_app.task(bind=True, name="transcribe_track", acks_late=True, reject_on_worker_lost=True)
+def transcribe_track(
+    self,
+    transcription_id: str,
+    audio_path: str,
+    speaker: str,
+    track_index: int
+):
+    """
+    話者別トラック1本の書き起こしサブジョブ
+
+    トラックごとに無音区間を検出して除去するため、ほとんどが無音の
+    話者別トラックは発話部分だけが Whisper に渡される。
+
+    Args:
+        transcription_id: 書き起こしID
+        audio_path: トラックの音声ファイルパス（RAMディスク内）
+        speaker: 話者ラベル
+        track_index: トラック番号
+
+    Returns:
+        トラックの処理結果辞書（再試行を使い切った失敗時も統合タスクへ渡すため例外は送出しない）
+    """
+    logger.info(f"Starting track transcription: {transcription_id} track {track_index} ({speaker})")
+    start_time = time.time()
+    # トラックごとの進捗は track_index で区別する（完了イベントは統合タスクが追記）
+    stream_fields = {"track_index": track_index, "speaker": speaker}
+
+    def on_stage(status: str, progress: int, publish: bool = True) -> None:
+        self.update_state(
+            state="PROCESSING",
+            meta={
+                "transcription_id": transcription_id,
+                "track_index": track_index,
+                "speaker": speaker,
+                "status": status,
+                "progress": progress
+            }
+        )
+        if publish:
+            progress_stream.publish(transcription_id, "stage", status=status, progress=progress, **stream_fields)
+
+    checkpoint_key = f"{transcription_id}-track{track_index}"
+    checkpoint = None
+    try:
+        checkpoint = _begin_checkpoint(checkpoint_key, audio_path)
+        result = _transcribe_audio(
+            audio_path,
+            transcription_id,
+            on_stage,
+            speaker=speaker,
+            stream_fields=stream_fields,
+            checkpoint=checkpoint,
+            started_at=start_time
+        )
+        _remove_file(audio_path)
+        checkpoint_store.delete(checkpoint_key)
+
         return {
-            "transcription_id": transcription_id,
+            "track_index": track_index,
+            "speaker": speaker,
+            "status": "completed",
+            "result": transcription_result_store.put(checkpoint_key, result["segments"]),
+            "audio_duration": result["audio_duration"],
+            "transcribed_seconds": result["transcribed_seconds"],
+            "transcribe_time": result["transcribe_time"],
+            "silence_removed_seconds": result["silence_removed_seconds"],
+            "gpu_seconds_saved": result["gpu_seconds_saved"],
+            "resumed_from": result["resumed_from"],
+            "attempts": result["attempts"],
+            "decoding": result["decoding"],
+            "refinement": result["refinement"],
+            "loops": result["loops"],
+            "draft": result["draft"],
+            "preprocessing": result["preprocessing"],
+            "model": _model_stats(),
+            "processing_time": time.time() - start_time
+        }
+
+    except Exception as e:
+        logger.error(f"Track transcription failed: {e}", exc_info=True)
+        if _can_retry(checkpoint):
+            on_stage("retrying", 0)
+            raise self.retry(exc=e, countdown=settings.TRANSCRIPTION_RETRY_DELAY, max_retries=None)
+
+        _remove_file(audio_path)
+        checkpoint_store.delete(checkpoint_key)
+        on_stage("failed", 100)
+        return {
+            "track_index": track_index,
+            "speaker": speaker,
             "status": "failed",
             "error_message": str(e),
             "processing_time": time.time() - start_time
         }
+
+
+@celery_app.task(bind=True, name="merge_track_transcriptions")
+def merge_track_transcriptions(
+    self,
+    track_results: List[Dict[str, Any]],
+    transcription_id: str,
+    session_log: str = None
+):
+    """
+    話者別トラックの書き起こし結果を統合
+
+    全トラックのセグメントを開始時刻順に並べ、話者ラベル付きの1つの書き起こしにする。
+    一部のトラックが失敗した場合は残りのトラックで統合し、失敗したトラックを結果に記録する。
+
+    Args:
+        track_results: transcribe_track の結果リスト
+        transcription_id: 書き起こしID
+        session_log: セッションログ
+
+    Returns:
+        処理結果辞書（process_transcription と同じ形式 + speakers / tracks）
+    """
+    track_results = sorted(track_results, key=lambda r: r["track_index"])
+    completed = [r for r in track_results if r["status"] == "completed"]
+    failed = [r for r in track_results if r["status"] != "completed"]
+
+    if not completed:
+        error_message = "; ".join(f"{r['speaker']}: {r.get('error_message')}" for r in failed)
+        progress_stream.publish(transcription_id, "failed", error_message=error_message)
+        _finish_scheduled(transcription_id)
+        return {
+            "transcription_id": transcription_id,
+            "status": "failed",
+            "error_message": error_message,
+            "processing_time": max((r["processing_time"] for r in failed), default=0.0)
+        }
+
+    # 開始時刻順に統合（同時刻はトラック順）
+    segments = sorted(
+        (
+            segment
+            for result in completed
+            for segment in _load_partial_segments(result["result"]["key"])
+        ),
+        key=lambda seg: (seg.start, seg.end)
+    )
+    stored = transcription_result_store.put(transcription_id, segments, session_log=session_log)
+    for result in completed:
+        transcription_result_store.delete(result["result"]["key"])
+
+    # ミックスダウンした音声を書き起こした場合との比較
+    audio_duration = max(r["audio_duration"] for r in completed)
+    processing_time = max(r["processing_time"] for r in track_results)
+    transcribed_seconds = sum(r["transcribed_seconds"] for r in completed)
+    logger.info(
+        f"Merged {len(completed)} tracks into {len(segments)} segments: "
+        f"transcribed {transcribed_seconds:.1f}s of speech for {audio_duration:.1f}s session"
+    )
+    progress_stream.publish(
+        transcription_id,
+        "completed",
+        progress=100,
+        segment_count=len(segments),
+        failed_tracks=[r["speaker"] for r in failed]
+    )
+    # トラックは複数のワーカーで分担するため、処理速度は学習せず予測の精度だけを記録する
+    eta_estimator.record_completion(transcription_id, audio_duration, processing_time)
+    _finish_scheduled(transcription_id)
+
+    return {
+        "transcription_id": transcription_id,
+        "status": "completed",
+        "result": stored,
+        "speakers": [r["speaker"] for r in completed],
+        "audio_duration": audio_duration,
+        "processing_time": processing_time,
+        "processing_ratio": processing_time / audio_duration if audio_duration > 0 else 0.0,
+        "target_processing_ratio": settings.TARGET_PROCESSING_RATIO,
+        "transcribed_seconds": transcribed_seconds,
+        "silence_removed_seconds": sum(r["silence_removed_seconds"] for r in completed),
+        "gpu_seconds_saved": sum(r["gpu_seconds_saved"] for r in completed),
+        "loops_detected": sum(r["loops"]["loops_detected"] for r in completed),
+        "loop_skipped_seconds": sum(r["loops"]["skipped_seconds"] for r in completed),
+        "tracks": [
+            {
+                key: result.get(key)
+                for key in (
+                    "track_index", "speaker", "status", "error_message", "audio_duration",
+                    "transcribed_seconds", "transcribe_time", "processing_time", "resumed_from", "attempts",
+                    "decoding", "refinement", "loops", "draft", "preprocessing"
+                )
+            }
+            for result in track_results
+        ],
+        "failed_tracks": [r["speaker"] for r in failed],
+        "completed_at": datetime.utcnow().isoformat()
+    }
@@ -0,0 +1,5 @@
+"""
+性能ベンチマークパッケージ
+
+backend ディレクトリから `python -m benchmarks.<name>` で実行
+"""
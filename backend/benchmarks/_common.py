@@ -0,0 +1,77 @@
+"""
+ベンチマーク共通ユーティリティ
+
+合成音声の生成とメモリ・時間計測を提供
+backend ディレクトリから `python -m benchmarks.<name>` で実行する
+"""
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+# 設定読み込みに必須の環境変数（ベンチマークでは実際には使わない）
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import numpy as np  # noqa: E402
+import soundfile as sf  # noqa: E402
+
+
+def generate_session_audio(
+    path: str,
+    seconds: float,
+    sample_rate: int = 48000,
+    channels: int = 2,
+    block_seconds: float = 60.0,
+    seed: int = 0
+) -> str:
+    """
+    TRPG セッション風の合成音声を生成してファイルに書き出す
+
+    発話（変調したトーン）と無音区間が交互に現れる信号に弱いノイズを加える。
+    長時間でもメモリを消費しないようブロック単位で書き込む。
+    """
+    rng = np.random.default_rng(seed)
+    block = int(block_seconds * sample_rate)
+    total = int(seconds * sample_rate)
+    subtype = "FLOAT" if path.endswith(".wav") else None
+
+    with sf.SoundFile(path, mode="w", samplerate=sample_rate, channels=channels, subtype=subtype) as f:
+        written = 0
+        while written < total:
+            n = min(block, total - written)
+            t = (written + np.arange(n)) / sample_rate
+            # 8秒周期で 5秒発話 / 3秒無音
+            speaking = (t % 8.0) < 5.0
+            voice = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+            signal = np.where(speaking, voice, 0.0) + 0.01 * rng.standard_normal(n)
+            frames = np.repeat(signal[:, None], channels, axis=1).astype(np.float32)
+            f.write(frames)
+            written += n
+
+    return path
+
+
+def measure(fn: Callable[[], Any]) -> Tuple[Any, float, int]:
+    """
+    関数を実行し (戻り値, 経過秒, Python/numpy ヒープのピークバイト数) を返す
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def format_bytes(n: float) -> str:
+    """バイト数を読みやすい形式に変換"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}TB"
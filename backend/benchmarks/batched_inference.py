@@ -0,0 +1,88 @@
+"""
+長時間音声のバッチ推論ベンチマーク
+
+同じ音声を逐次デコードとバッチ推論（バッチサイズ別）で書き起こし、
+リアルタイム係数（処理時間 / 音声長）を TARGET_PROCESSING_RATIO と比較する。
+GPU がなくても CPU と小さいモデルで改善幅を確認できる。
+
+    python -m benchmarks.batched_inference --model small --audio session.mp3 --minutes 10
+
+--audio を省略すると合成音声を使う（トーン信号は VAD で発話と判定されにくいため、
+実際の録音を指定するのが望ましい）。録音が --minutes より短い場合は繰り返して延長する。
+"""
+import argparse
+import time
+
+import numpy as np
+
+from . import _common  # noqa: F401  （設定読み込みに必要な環境変数を用意する）
+from .model_residency import make_job_audio
+from app.core.config import settings
+
+SAMPLE_RATE = 16000
+
+
+def load_audio(path: str, seconds: float) -> np.ndarray:
+    from faster_whisper.audio import decode_audio
+
+    audio = decode_audio(path, sampling_rate=SAMPLE_RATE)
+    total = int(seconds * SAMPLE_RATE)
+    if len(audio) < total:
+        audio = np.tile(audio, total // len(audio) + 1)
+    return audio[:total]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--audio", help="書き起こす録音（省略時は合成音声）")
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--beam-size", type=int, default=1)
+    args = parser.parse_args()
+
+    settings.WHISPER_MODEL = args.model
+    settings.WHISPER_DEVICE = args.device
+    settings.WHISPER_COMPUTE_TYPE = args.compute_type
+    settings.WHISPER_BEAM_SIZE = args.beam_size
+
+    from app.services.whisper_service import WhisperService
+
+    seconds = args.minutes * 60
+    audio = load_audio(args.audio, seconds) if args.audio else make_job_audio(seconds, seed=0)
+    duration = len(audio) / SAMPLE_RATE
+
+    service = WhisperService()
+    service.load_model()
+
+    print(
+        f"model: {args.model} on {args.device}/{args.compute_type}, "
+        f"audio: {duration / 60:.1f} min, target ratio: {settings.TARGET_PROCESSING_RATIO:.3f}"
+    )
+    print(f"{'mode':>12} {'wall':>8} {'RTF':>7} {'speedup':>8} {'segments':>9}  target")
+
+    runs = [("sequential", None)] + [(f"batch={size}", size) for size in args.batch_sizes]
+    baseline = None
+    for name, batch_size in runs:
+        if batch_size is not None:
+            settings.WHISPER_BATCH_SIZE = batch_size
+        start = time.perf_counter()
+        segments, _ = service.transcribe(audio, language="ja", batched=batch_size is not None)
+        wall = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = wall
+        rtf = wall / duration
+        verdict = "ok" if rtf <= settings.TARGET_PROCESSING_RATIO else "miss"
+        print(
+            f"{name:>12} {wall:>7.1f}s {rtf:>7.3f} {baseline / wall:>7.2f}x "
+            f"{len(segments):>9}  {verdict}"
+        )
+
+    service.model_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+デコード方式比較ベンチマーク
+
+形式ごと（wav/flac/mp3/m4a）に、soundfile による全体読み込み＋Python 側の
+モノラル化・リサンプリング（従来）と、ffmpeg パイプによる 16kHz モノラル直接
+デコードのデコード時間とピーク RSS を比較する
+各計測は独立したサブプロセスで実行し、RSS が互いに干渉しないようにする
+
+    python -m benchmarks.decoder --minutes 30
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from ._common import generate_session_audio, format_bytes
+
+FORMATS = ["wav", "flac", "mp3", "m4a"]
+
+
+def _run_worker(method: str, path: str) -> dict:
+    """サブプロセス内で1回分のデコードを実行して計測値を返す"""
+    import numpy as np
+    import soundfile as sf
+    from app.services.audio_decoder import ffmpeg_decoder
+    from app.services.resampler import resample
+
+    start = time.perf_counter()
+    if method == "soundfile":
+        audio, sr = sf.read(path)
+        if audio.ndim > 1:
+            audio = np.mean(audio, axis=1)
+        audio = resample(audio, sr, 16000)
+    else:
+        audio = ffmpeg_decoder.decode(path, sample_rate=16000)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss は Linux では KB 単位
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    return {
+        "samples": int(len(audio)),
+        "time": elapsed,
+        "rss": self_rss,
+        "child_rss": child_rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--worker", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_worker(*args.worker)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = generate_session_audio(os.path.join(tmp, "source.wav"), seconds=args.minutes * 60)
+
+        print(f"{'format':>6} {'method':>10} {'time':>8} {'peak RSS':>10} {'ffmpeg RSS':>11}")
+        for fmt in FORMATS:
+            path = os.path.join(tmp, f"session.{fmt}")
+            if fmt == "wav":
+                # 一般的な 16bit PCM の録音を想定
+                subprocess.run(["ffmpeg", "-loglevel", "error", "-i", source, "-c:a", "pcm_s16le", path], check=True)
+            else:
+                subprocess.run(["ffmpeg", "-loglevel", "error", "-i", source, path], check=True)
+
+            for method in ("soundfile", "ffmpeg"):
+                result = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.decoder", "--worker", method, path],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                if result.returncode != 0:
+                    reason = result.stderr.decode().strip().splitlines()[-1]
+                    print(f"{fmt:>6} {method:>10} {'failed':>8}  ({reason})")
+                    continue
+                stats = json.loads(result.stdout.decode().strip().splitlines()[-1])
+                print(
+                    f"{fmt:>6} {method:>10} {stats['time']:>7.2f}s "
+                    f"{format_bytes(stats['rss']):>10} {format_bytes(stats['child_rss']):>11}"
+                )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
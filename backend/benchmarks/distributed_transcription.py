@@ -0,0 +1,156 @@
+"""
+分散書き起こしのローカル複数ワーカーハーネス
+
+1つの録音を前処理して発話区間の切れ目でチャンクに分け、「1ワーカーで全体を書き起こす」場合と
+「--workers 個のワーカープロセスでチャンクを並列に書き起こして統合する
+（transcribe_chunk → merge_chunk_transcriptions と同じ処理）」場合の所要時間を比較し、
+統合結果が1ワーカーの結果と一致するかを確認する。Celery は使わず、ワーカーをプロセスプールで再現する
+
+--model を省略した場合、書き起こしは「音声長 × --cpu-ratio 秒」の待機と、無音除去後の時刻で
+4秒ごとに並ぶ模擬セグメントで代用する（チャンクの境界と重なりの処理を厳密に確認できる）
+
+    python -m benchmarks.distributed_transcription --minutes 20 --workers 4 --chunk-minutes 3
+    python -m benchmarks.distributed_transcription --audio session.mp3 --minutes 30 --workers 2 --model tiny
+"""
+import argparse
+import difflib
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ._common import generate_session_audio
+from app.core.config import settings
+
+# ワーカープロセスごとの書き起こし関数（プールの initializer で用意する）
+_transcribe = None
+
+
+def _init_worker(model, cpu_ratio: float):
+    global _transcribe
+    _transcribe = make_transcriber(model, cpu_ratio)
+
+
+def make_transcriber(model, cpu_ratio: float):
+    """前処理済み音声の区間を書き起こす関数（model 省略時は処理時間とセグメントの模擬）"""
+    if model is None:
+        from app.models.transcription import TranscriptSegment
+
+        def transcribe(prepared, start, end):
+            time.sleep((end - start) * cpu_ratio)
+            return [
+                TranscriptSegment(
+                    start=prepared.timeline.to_original(4 * i) if prepared.timeline else 4 * i,
+                    end=prepared.timeline.to_original(4 * i + 3, is_end=True) if prepared.timeline else 4 * i + 3,
+                    text=f"segment {i}"
+                )
+                for i in range(math.ceil(start / 4), math.floor((end - 3) / 4) + 1)
+            ]
+        return transcribe
+
+    settings.WHISPER_MODEL = model
+    settings.WHISPER_DEVICE = "cpu"
+    settings.WHISPER_COMPUTE_TYPE = "int8"
+
+    from app.services.whisper_service import get_whisper_service
+
+    service = get_whisper_service()
+    service.load_model()
+
+    def transcribe(prepared, start, end):
+        segments, _ = service.transcribe(
+            prepared.audio,
+            language="ja",
+            timeline=prepared.timeline,
+            start_offset=start,
+            end_offset=end
+        )
+        return segments
+    return transcribe
+
+
+def transcribe_range(store_dir: str, key: str, start: float, end: float):
+    """ワーカープロセスで前処理済み音声をメモリマップで開き、区間を書き起こす"""
+    from app.services.prepared_audio import PreparedAudioStore
+
+    prepared = PreparedAudioStore(store_dir).load(key, mmap=True)
+    started = time.perf_counter()
+    segments = _transcribe(prepared, start, end)
+    return segments, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--audio", help="書き起こす録音（省略時は合成音声）")
+    parser.add_argument("--minutes", type=float, default=20, help="合成音声の長さ（分）")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-minutes", type=float, default=3)
+    parser.add_argument("--overlap", type=float, default=settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS)
+    parser.add_argument("--model", help="CPU で実行する Whisper モデル（省略時は書き起こしを模擬）")
+    parser.add_argument("--cpu-ratio", type=float, default=0.02, help="模擬する書き起こし時間 / 音声長")
+    args = parser.parse_args()
+
+    from app.services.distributed_transcription import TranscriptionChunk, merge_chunk_segments
+    from app.services.prepared_audio import PreparedAudioStore
+    from app.tasks.transcription_tasks import _plan_chunks, _prepare_audio
+
+    settings.NOISE_REDUCTION_BACKEND = "spectral_gate"
+    settings.TRANSCRIPTION_DISTRIBUTED_ENABLED = True
+    settings.TRANSCRIPTION_DISTRIBUTED_MIN_DURATION = 0.0
+    settings.TRANSCRIPTION_CHUNK_SECONDS = args.chunk_minutes * 60
+    settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS = args.overlap
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.audio or generate_session_audio(os.path.join(tmp, "session.wav"), args.minutes * 60)
+        store = PreparedAudioStore(os.path.join(tmp, "prepared"))
+        prepared = _prepare_audio(path, lambda *a, **k: None)
+        store.save("session", prepared)
+        compact_duration = len(prepared.audio) / prepared.sample_rate
+        chunks = [TranscriptionChunk(**chunk) for chunk in _plan_chunks(prepared) or []]
+        del prepared
+        if not chunks:
+            chunks = [TranscriptionChunk(0, 0.0, compact_duration, 0.0, compact_duration)]
+        print(
+            f"{compact_duration:.0f}s of audio after silence compaction, {len(chunks)} chunks, "
+            f"{args.workers} workers, cpu count: {os.cpu_count()}, "
+            f"transcriber: {args.model or f'simulated (ratio {args.cpu_ratio})'}"
+        )
+
+        with ProcessPoolExecutor(1, initializer=_init_worker, initargs=(args.model, args.cpu_ratio)) as pool:
+            start = time.perf_counter()
+            single, _ = pool.submit(transcribe_range, store.directory, "session", 0.0, compact_duration).result()
+            single_wall = time.perf_counter() - start
+
+        with ProcessPoolExecutor(
+            args.workers, initializer=_init_worker, initargs=(args.model, args.cpu_ratio)
+        ) as pool:
+            # モデルのロードを計測に含めないよう、全ワーカーを起動してから計測する
+            list(pool.map(time.sleep, [0.1] * args.workers))
+            start = time.perf_counter()
+            futures = [
+                pool.submit(transcribe_range, store.directory, "session", chunk.start, chunk.end)
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+            merged, dropped = merge_chunk_segments(
+                [(chunk, segments) for chunk, (segments, _) in zip(chunks, results)],
+                store.load("session", mmap=True).timeline
+            )
+            distributed_wall = time.perf_counter() - start
+        decode_seconds = sum(seconds for _, seconds in results)
+
+        print(f"{'mode':>12} {'wall':>8} {'decode':>8} {'segments':>9}")
+        print(f"{'single':>12} {single_wall:>7.1f}s {single_wall:>7.1f}s {len(single):>9}")
+        print(f"{'distributed':>12} {distributed_wall:>7.1f}s {decode_seconds:>7.1f}s {len(merged):>9}")
+        print(f"speedup: {single_wall / distributed_wall:.2f}x, overlapping segments dropped: {dropped}")
+
+        single_text = " ".join(seg.text for seg in single)
+        merged_text = " ".join(seg.text for seg in merged)
+        ordered = all(a.start <= b.start for a, b in zip(merged, merged[1:]))
+        similarity = difflib.SequenceMatcher(None, single_text, merged_text).ratio()
+        print(f"merged output: in order: {ordered}, text similarity to single worker: {similarity:.3f}")
+
+
+if __name__ == "__main__":
+    main()
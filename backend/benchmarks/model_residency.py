@@ -0,0 +1,75 @@
+"""
+Whisper モデル常駐の効果を測るベンチマーク
+
+短いジョブを連続で実行し、ジョブごとの所要時間（モデルロード込み）を
+「常駐あり（ModelLifecycleManager）」と「ジョブごとに解放（従来の cleanup）」で比較する
+
+    python -m benchmarks.model_residency --model tiny --device cpu --jobs 5 --seconds 20
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from . import _common  # noqa: F401  （設定読み込みに必要な環境変数を用意する）
+from app.core.config import settings
+
+SAMPLE_RATE = 16000
+
+
+def make_job_audio(seconds: float, seed: int) -> np.ndarray:
+    """発話風のトーンと無音が交互に現れる短い音声"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voice = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    audio = np.where((t % 4.0) < 2.5, voice, 0.0) + 0.005 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def run_jobs(service, jobs, unload_per_job: bool):
+    latencies = []
+    for audio in jobs:
+        start = time.perf_counter()
+        service.transcribe(audio, language="ja")
+        if unload_per_job:
+            service.cleanup()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+
+    settings.WHISPER_MODEL = args.model
+    settings.WHISPER_DEVICE = args.device
+    settings.WHISPER_COMPUTE_TYPE = args.compute_type
+    settings.WHISPER_BEAM_SIZE = 1
+    settings.WHISPER_VAD_FILTER = False
+
+    from app.services.whisper_service import WhisperService
+
+    jobs = [make_job_audio(args.seconds, seed) for seed in range(args.jobs)]
+
+    print(f"model: {args.model} on {args.device}/{args.compute_type}, {args.jobs} jobs x {args.seconds:.0f}s")
+    print(f"{'mode':>18} {'first':>8} {'mean':>8} {'median':>8} {'total':>8}  counters")
+    for name, unload in (("unload-per-job", True), ("resident", False)):
+        service = WhisperService()
+        latencies = run_jobs(service, jobs, unload_per_job=unload)
+        stats = service.model_stats()
+        print(
+            f"{name:>18} {latencies[0]:>7.2f}s {statistics.mean(latencies):>7.2f}s "
+            f"{statistics.median(latencies):>7.2f}s {sum(latencies):>7.2f}s  "
+            f"loads={stats['loads']} hits={stats['hits']} evictions={stats['evictions']}"
+        )
+        service.model_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+チャンク並列前処理のスケーリングベンチマーク
+
+ワーカー数 1（逐次のインメモリ処理）/ 2 / 4 / 8 で同じ音声を前処理し、
+経過時間・逐次比の高速化率・逐次処理との最大誤差を比較する
+
+    python -m benchmarks.parallel_preprocess --minutes 10 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ._common import generate_session_audio
+from app.core.config import settings
+from app.services.audio_preprocessing import AudioPreprocessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backend", choices=["noisereduce", "spectral_gate"], default="spectral_gate")
+    parser.add_argument("--no-denoise", action="store_true", help="リサンプリングのみ計測する")
+    args = parser.parse_args()
+
+    settings.NOISE_REDUCTION_BACKEND = args.backend
+    print(f"cpu count: {os.cpu_count()}, backend: {args.backend}, denoise: {not args.no_denoise}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_session_audio(os.path.join(tmp, "session.wav"), args.minutes * 60)
+
+        reference = None
+        baseline = None
+        print(f"{'workers':>8} {'wall':>8} {'speedup':>8} {'x realtime':>11} {'max diff':>10}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = AudioPreprocessor().preprocess_to_buffer(
+                path,
+                apply_noise_reduction=not args.no_denoise,
+                normalize_audio=True,
+                streaming=False,
+                workers=workers
+            )
+            wall = time.perf_counter() - start
+
+            if reference is None:
+                reference, baseline = result.audio, wall
+            diff = float(np.max(np.abs(result.audio - reference)))
+            print(
+                f"{workers:>8} {wall:>7.2f}s {baseline / wall:>7.2f}x "
+                f"{args.minutes * 60 / wall:>10.1f}x {diff:>10.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+前処理と書き起こしのパイプライン化のスループットベンチマーク
+
+同じジョブ列を「1タスクで前処理 → 書き起こしを直列に実行（従来の process_transcription）」と
+「前処理ワーカー（CPU）と書き起こしワーカー（GPU、1並列）に分けて並行させる
+（preprocess_transcription → transcribe_prepared）」で処理し、1時間あたりのジョブ数と
+書き起こし側の遊休率を比較する。Celery は使わず、キューをスレッドと queue.Queue で再現する
+
+--model を省略した場合、書き起こしは「音声長 × --gpu-ratio 秒」の待機で代用する
+（CPU 上の Whisper は前処理と CPU を取り合い、GPU での実行を再現できないため）
+
+    python -m benchmarks.pipeline_throughput --jobs 6 --minutes 5 --gpu-ratio 0.05
+    python -m benchmarks.pipeline_throughput --jobs 4 --minutes 2 --model tiny
+"""
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from ._common import generate_session_audio
+from app.core.config import settings
+
+
+def make_transcriber(model, gpu_ratio: float):
+    """前処理済み音声を書き起こす関数（model 省略時は処理時間の模擬）"""
+    if model is None:
+        def transcribe(prepared):
+            time.sleep(len(prepared.audio) / prepared.sample_rate * gpu_ratio)
+        return transcribe
+
+    from app.services.whisper_service import WhisperService
+
+    service = WhisperService(model_name=model, device="cpu", compute_type="int8")
+    service.load_model()
+
+    def transcribe(prepared):
+        service.transcribe(prepared.audio, language="ja", timeline=prepared.timeline)
+    return transcribe
+
+
+def run_fused(paths, transcribe):
+    """1つのワーカーが前処理と書き起こしを直列に行う"""
+    from app.tasks.transcription_tasks import _prepare_audio
+
+    busy = 0.0
+    start = time.perf_counter()
+    for path in paths:
+        prepared = _prepare_audio(path, lambda *args, **kwargs: None)
+        transcribe_start = time.perf_counter()
+        transcribe(prepared)
+        busy += time.perf_counter() - transcribe_start
+    return time.perf_counter() - start, busy
+
+
+def run_pipelined(paths, transcribe, preprocess_workers: int, store_dir: str):
+    """前処理ワーカーが RAM ディスク経由で前処理済み音声を渡し、書き起こしワーカーが順に処理する"""
+    from app.services.prepared_audio import PreparedAudioStore
+    from app.tasks.transcription_tasks import _prepare_audio
+
+    store = PreparedAudioStore(store_dir)
+    pending = queue.Queue()
+    jobs = queue.Queue()
+    for i, path in enumerate(paths):
+        jobs.put((f"job{i}", path))
+
+    def preprocess_worker():
+        while True:
+            try:
+                key, path = jobs.get_nowait()
+            except queue.Empty:
+                return
+            store.save(key, _prepare_audio(path, lambda *args, **kwargs: None))
+            pending.put(key)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=preprocess_worker) for _ in range(preprocess_workers)]
+    for worker in workers:
+        worker.start()
+
+    busy = 0.0
+    for _ in paths:
+        key = pending.get()
+        transcribe_start = time.perf_counter()
+        prepared = store.load(key)
+        transcribe(prepared)
+        store.delete(key)
+        busy += time.perf_counter() - transcribe_start
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, busy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=6)
+    parser.add_argument("--minutes", type=float, default=5, help="1ジョブの音声長（分）")
+    parser.add_argument("--model", help="CPU で実行する Whisper モデル（省略時は書き起こし時間を模擬）")
+    parser.add_argument("--gpu-ratio", type=float, default=0.05, help="模擬する書き起こし時間 / 音声長")
+    parser.add_argument("--preprocess-workers", type=int, default=2)
+    parser.add_argument("--backend", choices=["noisereduce", "spectral_gate"], default="spectral_gate")
+    args = parser.parse_args()
+
+    settings.NOISE_REDUCTION_BACKEND = args.backend
+    settings.ADAPTIVE_PREPROCESSING_ENABLED = False  # 全ジョブでノイズ除去・正規化を行う
+    settings.AUDIO_PREPROCESS_WORKERS = 1
+
+    transcribe = make_transcriber(args.model, args.gpu_ratio)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [
+            generate_session_audio(os.path.join(tmp, f"session{i}.wav"), args.minutes * 60, seed=i)
+            for i in range(args.jobs)
+        ]
+        print(
+            f"{args.jobs} jobs x {args.minutes:.0f} min, cpu count: {os.cpu_count()}, "
+            f"transcriber: {args.model or f'simulated (ratio {args.gpu_ratio})'}"
+        )
+
+        print(f"{'mode':>10} {'wall':>8} {'jobs/hour':>10} {'transcriber idle':>17}")
+        results = {}
+        for mode in ("fused", "pipelined"):
+            if mode == "fused":
+                wall, busy = run_fused(paths, transcribe)
+            else:
+                wall, busy = run_pipelined(paths, transcribe, args.preprocess_workers, os.path.join(tmp, "prepared"))
+            results[mode] = wall
+            print(f"{mode:>10} {wall:>7.1f}s {args.jobs / wall * 3600:>10.1f} {1 - busy / wall:>16.1%}")
+
+        print(f"throughput gain: {results['fused'] / results['pipelined']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
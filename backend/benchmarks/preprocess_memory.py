@@ -0,0 +1,59 @@
+"""
+前処理のピークメモリ比較ベンチマーク
+
+一括読み込み（従来）とブロック単位ストリーミングの前処理について、
+WAV 出力とメモリ上のバッファ出力それぞれのピークメモリと処理時間を計測する
+
+    python -m benchmarks.preprocess_memory --minutes 10 30 60
+"""
+import argparse
+import os
+import tempfile
+
+from ._common import generate_session_audio, measure, format_bytes
+from app.services.audio_preprocessing import AudioPreprocessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 15, 30])
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--no-denoise", action="store_true", help="ノイズ除去を無効化")
+    args = parser.parse_args()
+
+    preprocessor = AudioPreprocessor()
+
+    print(f"{'minutes':>8} {'mode':>17} {'peak':>10} {'time':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            src = generate_session_audio(
+                os.path.join(tmp, f"session_{minutes}.wav"),
+                seconds=minutes * 60,
+                sample_rate=args.sample_rate
+            )
+            out = os.path.join(tmp, "out.wav")
+            for streaming in (False, True):
+                for to_buffer in (False, True):
+                    if to_buffer:
+                        run = lambda: preprocessor.preprocess_to_buffer(
+                            src,
+                            apply_noise_reduction=not args.no_denoise,
+                            normalize_audio=True,
+                            streaming=streaming
+                        )
+                    else:
+                        run = lambda: preprocessor.preprocess(
+                            src,
+                            output_path=out,
+                            apply_noise_reduction=not args.no_denoise,
+                            normalize_audio=True,
+                            streaming=streaming
+                        )
+                    _, elapsed, peak = measure(run)
+                    mode = ("streaming" if streaming else "in-memory") + ("/buffer" if to_buffer else "/wav")
+                    print(f"{minutes:>8.0f} {mode:>17} {format_bytes(peak):>10} {elapsed:>7.1f}s")
+            os.remove(src)
+
+
+if __name__ == "__main__":
+    main()
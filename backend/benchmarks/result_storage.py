@@ -0,0 +1,166 @@
+"""
+書き起こし結果の保存サイズ・シリアライズ時間のベンチマーク
+
+セッション長ごとに合成した書き起こし結果を
+「Celery の結果バックエンドに segments / full_text / mixed_output をそのまま返す（従来）」と
+「transcription_result_store に圧縮して保存し、タスク結果には参照だけを返す」で保存し、
+1ジョブあたりの Redis 上のサイズとシリアライズ・読み出し時間を比較する
+
+--redis-url を指定すると実際に Redis へ書き込み、MEMORY USAGE でキーごとの使用量も表示する
+（書き込んだキーは計測後に削除する）
+
+    python -m benchmarks.result_storage --hours 1 3 4
+    python -m benchmarks.result_storage --hours 4 --redis-url redis://localhost:6379/15
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+from kombu.serialization import dumps
+
+from ._common import format_bytes
+from app.core.config import settings
+
+# 合成セグメントの文字（ひらがな・カタカナ・よく使う漢字）
+CHARACTERS = (
+    "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをんがぎぐげござじずぜぞだでどばびぶべぼ"
+    "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモラリルレロダイスロール"
+    "探索者扉開目星聞耳正気度戦闘回避成功失敗判定技能魔術神話生物部屋本棚机手紙事件警察病院図書館"
+)
+
+
+def make_vocabulary(rng, size: int = 3000):
+    """2〜5文字の単語（出現頻度は Zipf 分布に従わせる）"""
+    chars = list(CHARACTERS)
+    words = ["".join(rng.choice(chars, size=int(rng.integers(2, 6)))) for _ in range(size)]
+    weights = 1.0 / np.arange(1, size + 1)
+    return words, weights / weights.sum()
+
+
+def make_segments(hours: float, seed: int = 0):
+    """1セグメント平均 3.5秒・5〜15語の合成セグメント"""
+    from app.models.transcription import TranscriptSegment
+
+    rng = np.random.default_rng(seed)
+    words, weights = make_vocabulary(rng)
+    segments = []
+    t = 0.0
+    while t < hours * 3600:
+        length = float(rng.uniform(1.5, 6.0))
+        segments.append(TranscriptSegment(
+            start=t,
+            end=t + length,
+            text="".join(rng.choice(words, size=int(rng.integers(5, 16)), p=weights)),
+            confidence=float(rng.uniform(-0.8, -0.05))
+        ))
+        t += length + float(rng.uniform(0.0, 1.5))
+    return segments
+
+
+def celery_meta(task_id: str, result: dict) -> bytes:
+    """Celery の結果バックエンドに保存される形（JSON シリアライザ）"""
+    meta = {
+        "status": "SUCCESS",
+        "result": result,
+        "traceback": None,
+        "children": [],
+        "date_done": datetime.utcnow().isoformat(),
+        "task_id": task_id,
+    }
+    _, _, payload = dumps(meta, serializer="json")
+    return payload.encode("utf-8") if isinstance(payload, str) else payload
+
+
+def legacy_result(segments, session_log: str) -> dict:
+    """従来の process_transcription の戻り値（セグメント・全文・ミックス出力）"""
+    from app.services.output_formatter import output_formatter
+    from app.tasks.transcription_tasks import _serialize_segment
+
+    return {
+        "transcription_id": "benchmark",
+        "status": "completed",
+        "segments": [_serialize_segment(seg) for seg in segments],
+        "full_text": " ".join(seg.text for seg in segments),
+        "mixed_output": output_formatter.generate_mixed_output(segments, session_log=session_log),
+        "audio_duration": segments[-1].end,
+    }
+
+
+def timed(fn, repeat: int):
+    """(最後の戻り値, 中央値の秒数)"""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        seconds.append(time.perf_counter() - start)
+    return value, float(np.median(seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3, 4])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--redis-url", help="実際に書き込んで MEMORY USAGE を計測する Redis")
+    args = parser.parse_args()
+
+    from app.services.result_store import StoredResult, decode_result, encode_result
+
+    client = None
+    if args.redis_url:
+        import redis
+
+        client = redis.Redis.from_url(args.redis_url)
+
+    session_log = "卓: 狂気山脈\nKP: A\nPL: B, C, D"
+    print(
+        f"{'hours':>5} {'segments':>8} | {'legacy size':>11} {'encode':>8} {'decode':>8} | "
+        f"{'compact size':>12} {'encode':>8} {'decode':>8} | {'size ratio':>10}"
+    )
+    for hours in args.hours:
+        segments = make_segments(hours)
+
+        # 従来: 結果全体を Celery の結果バックエンドへ
+        legacy, legacy_encode = timed(
+            lambda: celery_meta("legacy", legacy_result(segments, session_log)), args.repeat
+        )
+        _, legacy_decode = timed(lambda: json.loads(legacy), args.repeat)
+
+        # 圧縮して保存し、Celery には参照だけを返す
+        def compact_encode():
+            data = encode_result(StoredResult(segments, session_log, datetime.utcnow().isoformat()))
+            reference = {"key": "benchmark", "segment_count": len(segments), "bytes": len(data)}
+            return data, celery_meta("compact", {"status": "completed", "result": reference})
+
+        (stored, meta), compact_encode_seconds = timed(compact_encode, args.repeat)
+        _, compact_decode = timed(lambda: (json.loads(meta), decode_result(stored)), args.repeat)
+        legacy_size = len(legacy)
+        compact_size = len(stored) + len(meta)
+
+        print(
+            f"{hours:>5g} {len(segments):>8} | {format_bytes(legacy_size):>11} "
+            f"{legacy_encode * 1000:>6.1f}ms {legacy_decode * 1000:>6.1f}ms | "
+            f"{format_bytes(compact_size):>12} {compact_encode_seconds * 1000:>6.1f}ms "
+            f"{compact_decode * 1000:>6.1f}ms | {compact_size / legacy_size:>9.1%}"
+        )
+
+        if client is not None:
+            keys = {
+                "legacy": [("benchmark:legacy", legacy)],
+                "compact": [("benchmark:compact", stored), ("benchmark:compact-meta", meta)],
+            }
+            usage = {}
+            for mode, entries in keys.items():
+                for key, value in entries:
+                    client.set(key, value, ex=settings.TRANSCRIPTION_RESULT_TTL)
+                usage[mode] = sum(client.memory_usage(key) or 0 for key, _ in entries)
+                client.delete(*[key for key, _ in entries])
+            print(
+                f"{'':>5} redis MEMORY USAGE: legacy {format_bytes(usage['legacy'])}, "
+                f"compact {format_bytes(usage['compact'])}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+プロセス起動時のインポート時間のベンチマーク
+
+API・Celery Beat・ワーカーの各エントリポイントが起動時に読み込むモジュールを新しい
+Python プロセスで読み込み、所要時間と重い依存（faster_whisper・noisereduce・numpy など）が
+読み込まれたかを表示する。「worker (first job)」は初回の書き起こしで遅延インポートされる分を含む
+
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from . import _common  # noqa: F401  （設定読み込みに必要な環境変数を用意する）
+
+HEAVY_MODULES = ["faster_whisper", "ctranslate2", "noisereduce", "scipy", "numpy", "soundfile"]
+
+# エントリポイントごとの起動処理（celery の worker / beat は -A で celery_app を読み込み、include のタスクを読み込む）
+ENTRY_POINTS = {
+    "api": "import app.main",
+    "beat": (
+        "from app.tasks.celery_app import celery_app\n"
+        "celery_app.loader.import_default_modules()"
+    ),
+    "worker": (
+        "from app.tasks.celery_app import celery_app\n"
+        "celery_app.loader.import_default_modules()"
+    ),
+    "worker (first job)": (
+        "from app.tasks.celery_app import celery_app\n"
+        "celery_app.loader.import_default_modules()\n"
+        "from app.services.audio_preprocessing import audio_preprocessor\n"
+        "from app.services.audio_quality import signal_quality_analyzer\n"
+        "from app.services.whisper_service import get_whisper_service\n"
+        "get_whisper_service()"
+    ),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_entry_point(code: str) -> dict:
+    """新しいプロセスでエントリポイントの起動処理を実行し、所要時間と読み込まれた重い依存を返す"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY_MODULES)],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+        return {"error": error}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entry point':>20} {'median':>8} {'min':>8}  heavy modules loaded")
+    for name, code in ENTRY_POINTS.items():
+        runs = [measure_entry_point(code) for _ in range(args.repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            print(f"{name:>20} failed: {errors[0]}")
+            continue
+        seconds = [run["seconds"] for run in runs]
+        loaded = ", ".join(runs[-1]["loaded"]) or "-"
+        print(f"{name:>20} {statistics.median(seconds):>7.2f}s {min(seconds):>7.2f}s  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
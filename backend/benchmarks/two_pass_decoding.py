@@ -0,0 +1,66 @@
+"""
+2段階デコード（貪欲法 + 低信頼度区間のみ再デコード）のベンチマーク
+
+同じ音声を「全体を WHISPER_BEAM_SIZE でデコード」と「貪欲法で全体をデコードし、
+低信頼度の区間だけを再デコード」で書き起こし、処理時間と再デコードした割合を比較する
+
+    python -m benchmarks.two_pass_decoding --model small --audio session.mp3 --minutes 10
+"""
+import argparse
+import time
+
+from . import _common  # noqa: F401  （設定読み込みに必要な環境変数を用意する）
+from .batched_inference import SAMPLE_RATE, load_audio
+from .model_residency import make_job_audio
+from app.core.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--audio", help="書き起こす録音（省略時は合成音声）")
+    parser.add_argument("--minutes", type=float, default=10)
+    args = parser.parse_args()
+
+    settings.WHISPER_MODEL = args.model
+    settings.WHISPER_DEVICE = args.device
+    settings.WHISPER_COMPUTE_TYPE = args.compute_type
+
+    from app.services.decoding_scheduler import DecodingProfile
+    from app.services.whisper_service import WhisperService
+
+    seconds = args.minutes * 60
+    audio = load_audio(args.audio, seconds) if args.audio else make_job_audio(seconds, seed=0)
+    duration = len(audio) / SAMPLE_RATE
+
+    service = WhisperService()
+    service.load_model()
+    print(f"model: {args.model} on {args.device}/{args.compute_type}, audio: {duration / 60:.1f} min")
+
+    start = time.perf_counter()
+    baseline, _ = service.transcribe(audio, language="ja", batched=False)
+    baseline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first_pass, _ = service.transcribe(audio, language="ja", batched=False, profile=DecodingProfile.greedy())
+    first_pass_time = time.perf_counter() - start
+    refined, report = service.refine_low_confidence(audio, first_pass, language="ja")
+    two_pass_time = time.perf_counter() - start
+
+    print(f"{'mode':>10} {'wall':>8} {'RTF':>7} {'segments':>9}")
+    print(f"{'beam ' + str(settings.WHISPER_BEAM_SIZE):>10} {baseline_time:>7.1f}s {baseline_time / duration:>7.3f} {len(baseline):>9}")
+    print(f"{'greedy':>10} {first_pass_time:>7.1f}s {first_pass_time / duration:>7.3f} {len(first_pass):>9}")
+    print(f"{'two-pass':>10} {two_pass_time:>7.1f}s {two_pass_time / duration:>7.3f} {len(refined):>9}")
+    print(
+        f"re-decoded {report.refined_ratio:.1%} of audio in {report.decode_seconds:.1f}s "
+        f"({report.flagged_segments} flagged segments, {report.accepted_spans} spans accepted), "
+        f"speedup vs beam {settings.WHISPER_BEAM_SIZE}: {baseline_time / two_pass_time:.2f}x"
+    )
+
+    service.model_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()